@@ -1 +1,9 @@
-# Register your models here.
+from django.contrib import admin
+
+from candidate.models import AutoTransitionRule
+
+
+@admin.register(AutoTransitionRule)
+class AutoTransitionRuleAdmin(admin.ModelAdmin):
+    list_display = ["name", "from_status", "to_status", "department", "after_days", "is_active"]
+    list_filter = ["is_active", "from_status", "department"]
@@ -0,0 +1,98 @@
+"""
+Incremental changes feed for clients keeping a local copy of candidates in sync.
+
+The cursor is an opaque token holding the (updated_at, id) of the last candidate and the
+(created_at, id) of the last status history entry returned, so each poll is two keyset range
+scans that return nothing when nothing changed. Timestamps are set before a transaction commits,
+so rows are only returned once they are CHANGES_FEED_SETTLE_SECONDS old; a row committed late
+cannot fall behind a cursor that already moved past its timestamp.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from candidate.models import Candidate, StatusHistory
+
+
+class InvalidCursor(ValueError):
+    """Raised when a changes cursor cannot be decoded."""
+
+
+def encode_cursor(position: dict) -> str:
+    payload = {key: [value[0].isoformat(), str(value[1])] for key, value in position.items() if value is not None}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        position = {key: (datetime.fromisoformat(moment), uuid.UUID(pk)) for key, (moment, pk) in payload.items()}
+    except (AttributeError, TypeError, ValueError) as e:
+        raise InvalidCursor(f"Invalid changes cursor: {str(e)}")
+    if set(position) - {"c", "h"} or any(timezone.is_naive(moment) for moment, _ in position.values()):
+        raise InvalidCursor("Invalid changes cursor")
+    return position
+
+
+def _after(queryset, field: str, position):
+    if position is None:
+        return queryset
+    moment, pk = position
+    return queryset.filter(Q(**{f"{field}__gt": moment}) | Q(**{field: moment, "pk__gt": pk}))
+
+
+def _latest(queryset, field: str, settled: datetime):
+    moment = queryset.filter(**{f"{field}__lte": settled}).aggregate(latest=Max(field))["latest"]
+    if moment is None:
+        return None
+    pk = queryset.filter(**{field: moment}).order_by("-pk").values_list("pk", flat=True).first()
+    return moment, pk
+
+
+def current_cursor() -> str:
+    """Cursor positioned after every settled change, for clients that just loaded a full copy."""
+    settled = timezone.now() - timedelta(seconds=settings.CHANGES_FEED_SETTLE_SECONDS)
+    return encode_cursor(
+        {
+            "c": _latest(Candidate.objects.all(), "updated_at", settled),
+            "h": _latest(StatusHistory.objects.all(), "created_at", settled),
+        }
+    )
+
+
+def changes_since(cursor: str, limit: int) -> dict:
+    """
+    Candidates and status history entries changed after `cursor`, at most `limit` of each.
+
+    Returns:
+        dict: `candidates` and `history` (oldest first), the next `cursor` and `has_more`, set
+            when either list was cut at `limit`
+    """
+    position = decode_cursor(cursor)
+    settled = timezone.now() - timedelta(seconds=settings.CHANGES_FEED_SETTLE_SECONDS)
+
+    candidates = list(
+        _after(Candidate.objects.filter(updated_at__lte=settled), "updated_at", position.get("c")).order_by(
+            "updated_at", "pk"
+        )[: limit + 1]
+    )
+    history = list(
+        _after(StatusHistory.objects.filter(created_at__lte=settled), "created_at", position.get("h")).order_by(
+            "created_at", "pk"
+        )[: limit + 1]
+    )
+    has_more = len(candidates) > limit or len(history) > limit
+    candidates, history = candidates[:limit], history[:limit]
+
+    if candidates:
+        position["c"] = (candidates[-1].updated_at, candidates[-1].pk)
+    if history:
+        position["h"] = (history[-1].created_at, history[-1].pk)
+
+    return {"candidates": candidates, "history": history, "cursor": encode_cursor(position), "has_more": has_more}
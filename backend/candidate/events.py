@@ -0,0 +1,223 @@
+"""
+Status event log queries.
+
+StatusHistory is the append-only log of status events and `Candidate.current_status` is its
+projection: both are written by the same statement (or transaction) in candidate.transitions.
+StatusSnapshot rows store the status of every candidate at a point in time, so the state at any
+moment is the latest snapshot before it plus the events since, instead of a replay of the whole
+history.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, OuterRef, Q, Subquery
+from django.utils import timezone
+
+from candidate.models import ApplicationStatus, Candidate, StatusHistory, StatusSnapshot
+from candidate.transitions import LAST_STATUS_CHANGE_FIELDS, last_status_change
+
+logger = logging.getLogger(__name__)
+
+
+def _log_as_of(when: datetime, department: str = None):
+    """The latest snapshot at or before `when` (None without one) and the events after it up to `when`."""
+    snapshot = None
+    events = StatusHistory.objects.filter(created_at__lte=when)
+    if department:
+        events = events.filter(candidate__department=department)
+
+    taken_at = StatusSnapshot.objects.filter(taken_at__lte=when).aggregate(latest=Max("taken_at"))["latest"]
+    if taken_at is not None:
+        snapshot = StatusSnapshot.objects.filter(taken_at=taken_at)
+        if department:
+            snapshot = snapshot.filter(candidate__department=department)
+        events = events.filter(created_at__gt=taken_at)
+    return snapshot, events
+
+
+def status_as_of(when: datetime, department: str = None) -> dict:
+    """
+    Status of every candidate at `when`, keyed by candidate id.
+
+    Candidates registered after `when` are absent. Without a snapshot at or before `when`, the
+    history up to `when` is replayed in full.
+    """
+    return _replay(*_log_as_of(when, department))
+
+
+def _replay(snapshot, events) -> dict:
+    statuses = {} if snapshot is None else dict(snapshot.values_list("candidate_id", "status"))
+
+    # Later events overwrite earlier ones, leaving the last status of every candidate.
+    statuses.update(events.order_by("created_at").values_list("candidate_id", "new_status"))
+    return statuses
+
+
+def pipeline_as_of(when: datetime, department: str = None) -> dict[str, int]:
+    """
+    Number of candidates in each status at `when`.
+
+    Counted in the database without loading candidates: the snapshot rows grouped by status, minus
+    the snapshot status and plus the last status of every candidate with events since.
+    """
+    snapshot, events = _log_as_of(when, department)
+    last = events.filter(candidate=OuterRef("candidate")).order_by("-created_at", "-pk").values("pk")[:1]
+    last_events = events.filter(pk=Subquery(last))
+
+    counts = dict.fromkeys(ApplicationStatus.values, 0)
+    if snapshot is not None:
+        for status, count in snapshot.values_list("status").annotate(count=Count("id")).order_by():
+            counts[status] += count
+        moved = snapshot.filter(candidate__in=last_events.values("candidate"))
+        for status, count in moved.values_list("status").annotate(count=Count("id")).order_by():
+            counts[status] -= count
+    for status, count in last_events.values_list("new_status").annotate(count=Count("id")).order_by():
+        counts[status] += count
+    return counts
+
+
+def take_status_snapshot(taken_at: datetime = None, batch_size: int = 1000) -> int:
+    """
+    Store the status of every candidate at `taken_at` and drop snapshots past their retention.
+
+    Defaults to STATUS_SNAPSHOT_LAG seconds ago rather than now, so that status changes still in
+    flight, whose history rows are timestamped before they commit, are not missed by the snapshot.
+
+    Returns:
+        int: Number of candidates in the snapshot
+    """
+    now = timezone.now()
+    taken_at = taken_at or now - timedelta(seconds=settings.STATUS_SNAPSHOT_LAG)
+    if StatusSnapshot.objects.filter(taken_at=taken_at).exists():
+        return 0
+
+    # Replayed a page of candidates at a time, so memory stays flat however many candidates there are.
+    snapshot, events = _log_as_of(taken_at)
+    candidate_ids = Candidate.objects.order_by("pk").values_list("pk", flat=True)
+    taken = 0
+    last_pk = None
+    with transaction.atomic():
+        while True:
+            page = candidate_ids if last_pk is None else candidate_ids.filter(pk__gt=last_pk)
+            ids = list(page[:batch_size])
+            if not ids:
+                break
+            last_pk = ids[-1]
+
+            statuses = _replay(
+                None if snapshot is None else snapshot.filter(candidate_id__in=ids),
+                events.filter(candidate_id__in=ids),
+            )
+            StatusSnapshot.objects.bulk_create(
+                [
+                    StatusSnapshot(candidate_id=candidate_id, status=status, taken_at=taken_at)
+                    for candidate_id, status in statuses.items()
+                ]
+            )
+            taken += len(statuses)
+
+        expired, _ = StatusSnapshot.objects.filter(
+            taken_at__lt=now - timedelta(days=settings.STATUS_SNAPSHOT_RETENTION_DAYS)
+        ).delete()
+
+    logger.info(f"Status snapshot at {taken_at.isoformat()}: {taken} candidates, {expired} expired removed")
+    return taken
+
+
+def rebuild_status_projection(dry_run: bool = False, batch_size: int = 1000) -> dict[str, list]:
+    """
+    Reset the projection of the event log on candidates where it drifted.
+
+    `current_status` and the denormalized last status change fields are compared, a batch of
+    candidates at a time, with the last entry and the number of entries in their history. Each
+    batch is one transaction holding row locks on its candidates.
+
+    Returns:
+        dict: Ids of the repaired candidates, grouped by their status in the event log
+    """
+    fields = ["current_status", *LAST_STATUS_CHANGE_FIELDS]
+    candidates = Candidate.objects.only("id", *fields).order_by("pk")
+    drifted = defaultdict(list)
+    last_pk = None
+    while True:
+        # The batch stays locked until its repair is written, so a status change committed in the
+        # meantime cannot be reverted by values read before it.
+        with transaction.atomic():
+            page = candidates if last_pk is None else candidates.filter(pk__gt=last_pk)
+            batch = list(page.select_for_update()[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            history = StatusHistory.objects.filter(candidate_id__in=[candidate.pk for candidate in batch])
+            counts = dict(history.values_list("candidate_id").annotate(count=Count("id")).order_by())
+            latest = {}
+            for candidate_id, new_status, *change in history.order_by("candidate_id", "-created_at").values_list(
+                "candidate_id", "new_status", "created_at", "feedback", "actor__email"
+            ):
+                latest.setdefault(candidate_id, (new_status, change))
+
+            repaired = []
+            for candidate in batch:
+                if candidate.pk not in latest:
+                    continue
+                status, change = latest[candidate.pk]
+                projection = {
+                    "current_status": status,
+                    **last_status_change(*change),
+                    "history_count": counts[candidate.pk],
+                }
+                if all(getattr(candidate, field) == value for field, value in projection.items()):
+                    continue
+                for field, value in projection.items():
+                    setattr(candidate, field, value)
+                candidate.updated_at = timezone.now()
+                repaired.append(candidate)
+                drifted[status].append(candidate.pk)
+
+            if repaired and not dry_run:
+                Candidate.objects.bulk_update(repaired, [*fields, "updated_at"])
+
+    return dict(drifted)
+
+
+def admin_activity(history) -> list[dict]:
+    """
+    Status changes per admin in the `history` queryset, most active first.
+
+    One grouped aggregate over the rows, which the (actor, created_at) index narrows down when the
+    queryset is filtered on an admin and a period.
+
+    Returns:
+        list: `admin_email`, `admin_name`, number of `changes` and distinct `candidates`, the
+            `first_change_at` and `last_change_at`, and the number of changes to each status
+    """
+    rows = (
+        history.order_by()
+        .values(admin_email=F("actor__email"))
+        .annotate(
+            name=Max("actor__name"),
+            changes=Count("id"),
+            candidates=Count("candidate", distinct=True),
+            first_change_at=Min("created_at"),
+            last_change_at=Max("created_at"),
+            **{f"to_{status}": Count("id", filter=Q(new_status=status)) for status in ApplicationStatus.values},
+        )
+        .order_by("-changes", "admin_email")
+    )
+    return [
+        {
+            "admin_email": row["admin_email"] or None,
+            "admin_name": row["name"],
+            "changes": row["changes"],
+            "candidates": row["candidates"],
+            "first_change_at": row["first_change_at"],
+            "last_change_at": row["last_change_at"],
+            "statuses": {status: row[f"to_{status}"] for status in ApplicationStatus.values},
+        }
+        for row in rows
+    ]
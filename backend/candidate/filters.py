@@ -1,4 +1,16 @@
+from datetime import timedelta
+
 import django_filters
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+from rest_framework.filters import OrderingFilter
+
+from core.db import is_postgresql
+from core.documents import DOCX_CONTENT_TYPE, PDF_CONTENT_TYPE
+from core.fields import CodedChoiceField
 
 from .models import ApplicationStatus, Candidate, Department, StatusHistory
 
@@ -10,6 +22,37 @@ class CandidateFilter(django_filters.FilterSet):
     status = django_filters.ChoiceFilter(
         field_name="current_status", choices=ApplicationStatus.choices, help_text="Filter by current application status"
     )
+    resume_text = django_filters.CharFilter(
+        method="filter_resume_text", help_text="Full-text search over extracted resume content"
+    )
+    resume_content_type = django_filters.ChoiceFilter(
+        choices=[(PDF_CONTENT_TYPE, "PDF"), (DOCX_CONTENT_TYPE, "DOCX")], help_text="Filter by detected resume type"
+    )
+    resume_size_min = django_filters.NumberFilter(
+        field_name="resume_size", lookup_expr="gte", help_text="Minimum resume size in bytes"
+    )
+    resume_size_max = django_filters.NumberFilter(
+        field_name="resume_size", lookup_expr="lte", help_text="Maximum resume size in bytes"
+    )
+    resume_pages_min = django_filters.NumberFilter(
+        field_name="resume_page_count", lookup_expr="gte", help_text="Minimum resume page count"
+    )
+    resume_pages_max = django_filters.NumberFilter(
+        field_name="resume_page_count", lookup_expr="lte", help_text="Maximum resume page count"
+    )
+    status_changed_after = django_filters.DateTimeFilter(
+        field_name="status_changed_at", lookup_expr="gte", help_text="Current status entered after this date"
+    )
+    status_changed_before = django_filters.DateTimeFilter(
+        field_name="status_changed_at", lookup_expr="lte", help_text="Current status entered before this date"
+    )
+    stale_days = django_filters.NumberFilter(
+        method="filter_stale_days",
+        min_value=0,
+        max_value=36500,
+        decimal_places=0,
+        help_text="In the current status for at least this many days",
+    )
 
     class Meta:
         model = Candidate
@@ -20,6 +63,21 @@ class CandidateFilter(django_filters.FilterSet):
             "current_status": ["exact"],
         }
 
+    def filter_stale_days(self, queryset, name, value):
+        """Candidates whose status has not changed for `value` days, an index range scan on status_changed_at."""
+        if value is None:
+            return queryset
+        return queryset.filter(status_changed_at__lte=timezone.now() - timedelta(days=int(value)))
+
+    def filter_resume_text(self, queryset, name, value):
+        """Match resumes through the GIN-indexed search vector, falling back to a substring scan off PostgreSQL."""
+        if not value:
+            return queryset
+        if is_postgresql():
+            query = SearchQuery(value, config=settings.RESUME_TEXT_SEARCH_CONFIG, search_type="websearch")
+            return queryset.filter(resume_text__search_vector=query)
+        return queryset.filter(resume_text__content__icontains=value)
+
 
 class StatusHistoryFilter(django_filters.FilterSet):
     """Filter for status history records."""
@@ -30,7 +88,12 @@ class StatusHistoryFilter(django_filters.FilterSet):
         field_name="new_status", choices=ApplicationStatus.choices, help_text="Filter by status"
     )
 
-    admin_name = django_filters.CharFilter(lookup_expr="icontains", help_text="Filter by admin name")
+    # Served by the trigram index on UPPER(actors.name) on PostgreSQL.
+    admin_name = django_filters.CharFilter(
+        field_name="actor__name", lookup_expr="icontains", help_text="Filter by admin name"
+    )
+
+    admin_email = django_filters.CharFilter(field_name="actor__email", help_text="Filter by admin email (exact)")
 
     created_after = django_filters.DateTimeFilter(
         field_name="created_at", lookup_expr="gte", help_text="Status changes after this date"
@@ -42,4 +105,35 @@ class StatusHistoryFilter(django_filters.FilterSet):
 
     class Meta:
         model = StatusHistory
-        fields = ["candidate", "new_status", "admin_name", "created_at"]
+        fields = ["candidate", "new_status", "admin_name", "admin_email", "created_at"]
+
+
+class CodedChoiceOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that sorts coded choice fields by their values, not by their stored codes.
+
+    Keeps the alphabetical order clients had before departments and statuses became smallint
+    codes; the CASE expression maps every code to the rank of its value.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*(self.order_expression(queryset.model, term) for term in ordering))
+
+    @staticmethod
+    def order_expression(model, term: str):
+        name = term.lstrip("-")
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return term
+        if not isinstance(field, CodedChoiceField):
+            return term
+
+        rank = Case(
+            *(When(**{name: value}, then=Value(position)) for position, value in enumerate(sorted(field.codes))),
+            output_field=IntegerField(),
+        )
+        return rank.desc() if term.startswith("-") else rank.asc()
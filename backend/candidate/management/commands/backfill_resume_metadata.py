@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from candidate.models import Candidate
+from candidate.utils import get_resume_metadata
+
+# Page counts need the document parsed and are recorded with the resume text (see backfill_resume_text).
+METADATA_FIELDS = ["resume_size", "resume_sha256", "resume_content_type"]
+
+
+class Command(BaseCommand):
+    help = "Populate precomputed resume metadata (size, hash, type) for existing candidates."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Candidates updated per batch")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent storage reads")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Candidate.objects.filter(resume_sha256="").exclude(resume="").only("id", "resume").order_by("pk")
+
+        updated = failed = 0
+        last_pk = None
+        # Storage reads are I/O bound, so threads are enough to keep remote backends busy.
+        with ThreadPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+                batch = list(page[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+
+                changed = []
+                for candidate, metadata in zip(batch, pool.map(self._read_metadata, batch)):
+                    if metadata is None:
+                        failed += 1
+                        continue
+                    for field, value in metadata.items():
+                        setattr(candidate, field, value)
+                    changed.append(candidate)
+
+                Candidate.objects.bulk_update(changed, METADATA_FIELDS)
+                updated += len(changed)
+                self.stdout.write(f"Processed {updated + failed} resumes...")
+
+        self.stdout.write(self.style.SUCCESS(f"Resume metadata backfill complete: {updated} updated, {failed} failed"))
+
+    def _read_metadata(self, candidate):
+        try:
+            with candidate.resume.open("rb") as resume:
+                return get_resume_metadata(resume)
+        except Exception as e:
+            self.stderr.write(f"Could not read resume for candidate {candidate.pk}: {str(e)}")
+            return None
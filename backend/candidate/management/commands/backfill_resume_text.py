@@ -0,0 +1,73 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from candidate.models import Candidate
+from candidate.utils import save_resume_text
+from core.documents import count_pages, extract_text
+
+
+def extract_resume(data: bytes, timeout: int) -> tuple[str, int | None]:
+    """Text and page count of one resume; runs in a pool process, where the time limit applies."""
+    return extract_text(data, timeout), count_pages(data, timeout)
+
+
+class Command(BaseCommand):
+    help = "Extract and index resume text and page count for existing candidates using a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Candidates loaded per batch")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Extraction processes")
+        parser.add_argument(
+            "--timeout",
+            type=int,
+            default=settings.RESUME_TEXT_EXTRACTION_TIMEOUT,
+            help="Maximum seconds spent on a single resume",
+        )
+        parser.add_argument("--all", action="store_true", help="Re-extract resumes that already have text")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        timeout = options["timeout"]
+
+        queryset = Candidate.objects.exclude(resume="").only("id", "resume").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(resume_text__isnull=True)
+
+        extracted = failed = 0
+        last_pk = None
+        with ProcessPoolExecutor(max_workers=options["workers"]) as pool:
+            while True:
+                page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+                batch = list(page[:batch_size])
+                if not batch:
+                    break
+                last_pk = batch[-1].pk
+
+                # Storage reads stay in this process; workers only receive bytes.
+                futures = {}
+                for candidate in batch:
+                    try:
+                        with candidate.resume.open("rb") as resume:
+                            futures[pool.submit(extract_resume, resume.read(), timeout)] = candidate.pk
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"Could not read resume for candidate {candidate.pk}: {str(e)}")
+
+                for future in as_completed(futures):
+                    candidate_id = futures[future]
+                    try:
+                        content, page_count = future.result()
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"Could not extract resume for candidate {candidate_id}: {str(e)}")
+                        continue
+                    save_resume_text(candidate_id, content)
+                    Candidate.objects.filter(pk=candidate_id).update(resume_page_count=page_count)
+                    extracted += 1
+
+                self.stdout.write(f"Processed {extracted + failed} resumes...")
+
+        self.stdout.write(self.style.SUCCESS(f"Resume text backfill complete: {extracted} extracted, {failed} failed"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from candidate.models import Candidate, StatusHistory
+from candidate.transitions import LAST_STATUS_CHANGE_FIELDS, last_status_change
+
+
+class Command(BaseCommand):
+    help = "Populate the denormalized last status change fields of candidates from their status history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Candidates updated per batch")
+        parser.add_argument("--all", action="store_true", help="Recompute every candidate, not only missing ones")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = Candidate.objects.only("id").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(status_changed_at__isnull=True)
+
+        updated = 0
+        last_pk = None
+        while True:
+            page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(page[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            history = StatusHistory.objects.filter(candidate_id__in=[candidate.pk for candidate in batch])
+            counts = dict(history.values_list("candidate_id").annotate(count=Count("id")).order_by())
+            latest = {}
+            for candidate_id, created_at, feedback, admin_email in history.order_by(
+                "candidate_id", "-created_at"
+            ).values_list("candidate_id", "created_at", "feedback", "actor__email"):
+                latest.setdefault(candidate_id, (created_at, feedback, admin_email))
+
+            changed = []
+            for candidate in batch:
+                if candidate.pk not in latest:
+                    continue
+                for field, value in last_status_change(*latest[candidate.pk]).items():
+                    setattr(candidate, field, value)
+                candidate.history_count = counts[candidate.pk]
+                changed.append(candidate)
+
+            Candidate.objects.bulk_update(changed, LAST_STATUS_CHANGE_FIELDS)
+            updated += len(changed)
+            self.stdout.write(f"Processed {updated} candidates...")
+
+        self.stdout.write(self.style.SUCCESS(f"Status fields backfill complete: {updated} candidates updated"))
@@ -0,0 +1,170 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from core.db import is_postgresql
+
+TABLES = ["candidates", "status_history", "status_snapshots"]
+
+# Synthetic history is inserted into copies of these tables in SCRATCH_SCHEMA, never into the real
+# status history, which candidate statuses are projected from.
+SCRATCH_SCHEMA = "storage_measurement"
+SCRATCH_TABLES = [*TABLES, "actors"]
+
+# Read-only queries in the shape of the pipeline, digest and candidate detail reads. They only
+# compare the status columns with themselves, so they run before and after migration 0010.
+WORKLOAD = [
+    "SELECT new_status, count(*) FROM status_history WHERE created_at >= now() - interval '90 days' GROUP BY 1",
+    "SELECT department, current_status, count(*) FROM candidates GROUP BY 1, 2",
+    """
+    SELECT h.* FROM status_history h
+    JOIN (SELECT id FROM candidates ORDER BY random() LIMIT 100) c ON c.id = h.candidate_id
+    ORDER BY h.created_at DESC
+    """,
+    """
+    SELECT count(*) FROM candidates c
+    WHERE c.current_status = (SELECT current_status FROM candidates ORDER BY random() LIMIT 1)
+    AND c.created_at >= now() - interval '30 days'
+    """,
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the size, row width and buffer cache hit ratio of the candidate tables and their indexes "
+        "(PostgreSQL only). Run before and after a storage migration to compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed-history",
+            type=int,
+            default=0,
+            help=(
+                "Measure copies of the tables in a scratch schema with this many synthetic status history rows "
+                "added; the copies are dropped afterwards"
+            ),
+        )
+        parser.add_argument(
+            "--workload",
+            type=int,
+            default=0,
+            help="Reset the statistics of the measured tables and run the sample queries this many times",
+        )
+
+    def handle(self, *args, **options):
+        if not is_postgresql():
+            raise CommandError("Storage can only be measured on PostgreSQL.")
+
+        search_path = None
+        try:
+            with connection.cursor() as cursor:
+                if options["seed_history"]:
+                    search_path = self.create_scratch_copy(cursor)
+                    self.seed_history(cursor, options["seed_history"])
+                    cursor.execute(f"VACUUM ANALYZE {', '.join(TABLES)}")
+                if options["workload"]:
+                    self.reset_statistics(cursor)
+                    for _ in range(options["workload"]):
+                        for query in WORKLOAD:
+                            cursor.execute(query)
+                            cursor.fetchall()
+            # A session reports its statistics when it ends, so the workload shows up on a new connection.
+            connection.close()
+
+            with connection.cursor() as cursor:
+                if search_path:
+                    cursor.execute(f"SET search_path TO {search_path}")
+                self.report_tables(cursor)
+                self.report_indexes(cursor)
+                self.report_cache(cursor)
+        finally:
+            if search_path:
+                with connection.cursor() as cursor:
+                    cursor.execute(f"DROP SCHEMA IF EXISTS {connection.ops.quote_name(SCRATCH_SCHEMA)} CASCADE")
+                    cursor.execute("SET search_path TO DEFAULT")
+
+    def create_scratch_copy(self, cursor) -> str:
+        """Copy the tables with their indexes into SCRATCH_SCHEMA, make it the current schema and return the path."""
+        schema = connection.ops.quote_name(SCRATCH_SCHEMA)
+        cursor.execute("SELECT current_schema()")
+        source = connection.ops.quote_name(cursor.fetchone()[0])
+        cursor.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {schema}")
+        for table in SCRATCH_TABLES:
+            table = connection.ops.quote_name(table)
+            cursor.execute(f"CREATE TABLE {schema}.{table} (LIKE {source}.{table} INCLUDING ALL)")
+            cursor.execute(f"INSERT INTO {schema}.{table} SELECT * FROM {source}.{table}")
+        # Extensions such as pg_trgm stay reachable through the source schema.
+        search_path = f"{schema}, {source}"
+        cursor.execute(f"SET search_path TO {search_path}")
+        self.stdout.write(f"Measuring copies of {', '.join(SCRATCH_TABLES)} in schema {SCRATCH_SCHEMA}")
+        return search_path
+
+    def seed_history(self, cursor, rows: int) -> None:
+        cursor.execute(
+            "SELECT data_type FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'status_history' AND column_name = 'new_status'"
+        )
+        # Before migration 0010 the status columns still hold the string values.
+        if cursor.fetchone()[0] == "smallint":
+            statuses = "ARRAY[1, 2, 3, 4, 5]"
+        else:
+            statuses = "ARRAY['submitted', 'under_review', 'interview_scheduled', 'rejected', 'accepted']"
+
+        cursor.execute(
+            f"""
+            WITH ids AS (SELECT array_agg(id) AS ids FROM candidates),
+            actor AS (SELECT min(id) AS id FROM actors)
+            INSERT INTO status_history
+                (id, candidate_id, previous_status, new_status, feedback, actor_id, created_at)
+            SELECT gen_random_uuid(), ids[1 + g % array_length(ids, 1)], ({statuses})[1 + g % 5],
+                ({statuses})[1 + (g + 1) % 5], '', actor.id, now() - g * interval '1 second'
+            FROM ids, actor, generate_series(1, %s) AS g
+            """,
+            [rows],
+        )
+        self.stdout.write(f"Inserted {rows} status history rows")
+
+    def reset_statistics(self, cursor) -> None:
+        """Reset the counters of the measured tables and their indexes only, not of the whole database."""
+        cursor.execute(
+            "SELECT pg_stat_reset_single_table_counters(relid) FROM ("
+            "SELECT to_regclass(name)::oid AS relid FROM unnest(%s::text[]) AS name "
+            "UNION SELECT indexrelid FROM pg_index WHERE indrelid = ANY(SELECT to_regclass(unnest(%s::text[])))"
+            ") AS relations",
+            [TABLES, TABLES],
+        )
+
+    def report_tables(self, cursor) -> None:
+        self.stdout.write("Tables (rows, table size, index size, average row bytes):")
+        for table in TABLES:
+            cursor.execute(
+                f"SELECT count(*), pg_size_pretty(pg_table_size(%s)), pg_size_pretty(pg_indexes_size(%s)), "
+                f"coalesce(round(avg(pg_column_size(t.*))), 0) FROM {connection.ops.quote_name(table)} t",
+                [table, table],
+            )
+            rows, table_size, index_size, row_bytes = cursor.fetchone()
+            self.stdout.write(f"  {table}: {rows} rows, {table_size}, indexes {index_size}, {row_bytes} bytes/row")
+
+    def report_indexes(self, cursor) -> None:
+        self.stdout.write("Indexes:")
+        cursor.execute(
+            "SELECT relname, indexrelname, pg_size_pretty(pg_relation_size(indexrelid)) "
+            "FROM pg_stat_user_indexes WHERE schemaname = current_schema() AND relname = ANY(%s) "
+            "ORDER BY relname, pg_relation_size(indexrelid) DESC",
+            [TABLES],
+        )
+        for table, index, size in cursor.fetchall():
+            self.stdout.write(f"  {table}.{index}: {size}")
+
+    def report_cache(self, cursor) -> None:
+        self.stdout.write("Buffer cache hit ratio since the last statistics reset (table, indexes):")
+        cursor.execute(
+            "SELECT relname, "
+            "round(100.0 * heap_blks_hit / nullif(heap_blks_hit + heap_blks_read, 0), 2), "
+            "round(100.0 * idx_blks_hit / nullif(idx_blks_hit + idx_blks_read, 0), 2) "
+            "FROM pg_statio_user_tables WHERE schemaname = current_schema() AND relname = ANY(%s) ORDER BY relname",
+            [TABLES],
+        )
+        for table, heap_ratio, index_ratio in cursor.fetchall():
+            self.stdout.write(f"  {table}: {heap_ratio or '-'}%, {index_ratio or '-'}%")
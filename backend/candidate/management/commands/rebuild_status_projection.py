@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from candidate.events import rebuild_status_projection
+
+
+class Command(BaseCommand):
+    help = (
+        "Reset candidate statuses and last status change fields that drifted from the last entry "
+        "recorded in their status history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted candidates without changing them")
+
+    def handle(self, *args, **options):
+        drifted = rebuild_status_projection(dry_run=options["dry_run"])
+
+        for status, candidate_ids in sorted(drifted.items()):
+            self.stdout.write(f"{status}: {', '.join(str(candidate_id) for candidate_id in candidate_ids)}")
+
+        total = sum(len(candidate_ids) for candidate_ids in drifted.values())
+        action = "would be reset" if options["dry_run"] else "reset"
+        self.stdout.write(self.style.SUCCESS(f"Status projection rebuilt: {total} candidates {action}"))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:31
+
+import django.contrib.postgres.search
+import core.db
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('candidate', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='resume_text', serialize=False, to='candidate.candidate')),
+                ('content', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'resume_texts',
+            },
+        ),
+        core.db.RunPostgreSQL(
+            sql="CREATE INDEX resume_texts_search_gin ON resume_texts USING gin (search_vector);",
+            reverse_sql="DROP INDEX IF EXISTS resume_texts_search_gin;",
+        ),
+    ]
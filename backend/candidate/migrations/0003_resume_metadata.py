@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0002_resume_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_content_type',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_page_count',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_size',
+            field=models.PositiveIntegerField(blank=True, help_text='Resume size in bytes', null=True),
+        ),
+    ]
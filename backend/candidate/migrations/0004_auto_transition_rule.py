@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:00
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0003_resume_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AutoTransitionRule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('from_status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], max_length=20)),
+                ('to_status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], max_length=20)),
+                ('department', models.CharField(blank=True, choices=[('it', 'Information Technology'), ('hr', 'Human Resources'), ('finance', 'Finance')], max_length=10)),
+                ('after_days', models.PositiveIntegerField(help_text='Days since the application was submitted')),
+                ('feedback', models.TextField(blank=True, help_text='Feedback recorded in the status history and the email')),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'auto_transition_rules',
+                'ordering': ['from_status', 'after_days'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.4 on 2026-10-19 12:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0004_auto_transition_rule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatusSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], max_length=20)),
+                ('taken_at', models.DateTimeField()),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_snapshots', to='candidate.candidate')),
+            ],
+            options={
+                'db_table': 'status_snapshots',
+                'constraints': [models.UniqueConstraint(fields=('taken_at', 'candidate'), name='status_snapshot_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0005_status_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='history_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='last_admin_email',
+            field=models.EmailField(blank=True, max_length=254),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='last_feedback_excerpt',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['current_status', 'status_changed_at'], name='candidates_current_1903e4_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0006_candidate_last_status_change'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['updated_at', 'id'], name='candidates_updated_ea8284_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statushistory',
+            index=models.Index(fields=['created_at', 'id'], name='status_hist_created_c6291f_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:00
+
+import core.db
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0007_changes_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='statushistory',
+            index=models.Index(fields=['admin_email', 'created_at'], name='status_hist_admin_e_694705_idx'),
+        ),
+        core.db.RunPostgreSQL(
+            sql="CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        # Matches the UPPER(admin_name::text) LIKE UPPER(...) Django emits for icontains.
+        core.db.RunPostgreSQL(
+            sql=(
+                "CREATE INDEX status_history_admin_name_trgm ON status_history "
+                "USING gin (UPPER(admin_name::text) gin_trgm_ops);"
+            ),
+            reverse_sql="DROP INDEX IF EXISTS status_history_admin_name_trgm;",
+        ),
+    ]
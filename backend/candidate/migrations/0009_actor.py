@@ -0,0 +1,114 @@
+# Generated by Django 5.2.4 on 2026-10-19 14:45
+
+from collections import defaultdict
+
+import core.db
+import django.db.models.deletion
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 5000
+
+
+def copy_admins_to_actors(apps, schema_editor):
+    """Point existing status history at actors, one transaction per batch of rows."""
+    Actor = apps.get_model("candidate", "Actor")
+    StatusHistory = apps.get_model("candidate", "StatusHistory")
+
+    actors = {}
+    last_pk = None
+    while True:
+        page = StatusHistory.objects.order_by("pk")
+        if last_pk is not None:
+            page = page.filter(pk__gt=last_pk)
+        batch = list(page.values_list("pk", "admin_name", "admin_email")[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+
+        rows = defaultdict(list)
+        for pk, admin_name, admin_email in batch:
+            rows[(admin_name, admin_email)].append(pk)
+        with transaction.atomic():
+            for (admin_name, admin_email), pks in rows.items():
+                if (admin_name, admin_email) not in actors:
+                    actor, _ = Actor.objects.get_or_create(name=admin_name, email=admin_email)
+                    actors[(admin_name, admin_email)] = actor.pk
+                StatusHistory.objects.filter(pk__in=pks).update(actor_id=actors[(admin_name, admin_email)])
+
+
+def copy_actors_to_admins(apps, schema_editor):
+    Actor = apps.get_model("candidate", "Actor")
+    StatusHistory = apps.get_model("candidate", "StatusHistory")
+
+    for actor in Actor.objects.all():
+        StatusHistory.objects.filter(actor=actor).update(admin_name=actor.name, admin_email=actor.email)
+
+
+class Migration(migrations.Migration):
+
+    # Existing rows are moved in batches, each committed on its own.
+    atomic = False
+
+    dependencies = [
+        ('candidate', '0008_admin_audit_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Actor',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+            ],
+            options={
+                'db_table': 'actors',
+                'constraints': [models.UniqueConstraint(fields=('email', 'name'), name='actor_unique')],
+            },
+        ),
+        migrations.AddField(
+            model_name='statushistory',
+            name='actor',
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name='status_changes',
+                to='candidate.actor',
+            ),
+        ),
+        migrations.RunPython(copy_admins_to_actors, copy_actors_to_admins),
+        migrations.AlterField(
+            model_name='statushistory',
+            name='actor',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT, related_name='status_changes', to='candidate.actor'
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name='statushistory',
+            name='status_hist_admin_e_694705_idx',
+        ),
+        core.db.RunPostgreSQL(
+            sql="DROP INDEX IF EXISTS status_history_admin_name_trgm;",
+            reverse_sql=(
+                "CREATE INDEX status_history_admin_name_trgm ON status_history "
+                "USING gin (UPPER(admin_name::text) gin_trgm_ops);"
+            ),
+        ),
+        migrations.RemoveField(
+            model_name='statushistory',
+            name='admin_email',
+        ),
+        migrations.RemoveField(
+            model_name='statushistory',
+            name='admin_name',
+        ),
+        migrations.AddIndex(
+            model_name='statushistory',
+            index=models.Index(fields=['actor', 'created_at'], name='status_hist_actor_i_021820_idx'),
+        ),
+        core.db.RunPostgreSQL(
+            sql="CREATE INDEX actors_name_trgm ON actors USING gin (UPPER(name::text) gin_trgm_ops);",
+            reverse_sql="DROP INDEX IF EXISTS actors_name_trgm;",
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.4 on 2026-10-19 15:30
+
+from collections import defaultdict
+
+import candidate.models
+import core.fields
+from django.db import migrations, transaction
+
+BATCH_SIZE = 5000
+
+# The codes CodedChoiceField assigns at the time of this migration.
+DEPARTMENT_CODES = {"it": 1, "hr": 2, "finance": 3}
+STATUS_CODES = {"submitted": 1, "under_review": 2, "interview_scheduled": 3, "rejected": 4, "accepted": 5}
+
+CODED_FIELDS = [
+    ("Candidate", "department", DEPARTMENT_CODES),
+    ("Candidate", "current_status", STATUS_CODES),
+    ("StatusHistory", "previous_status", STATUS_CODES),
+    ("StatusHistory", "new_status", STATUS_CODES),
+    ("StatusSnapshot", "status", STATUS_CODES),
+]
+
+
+def recode(apps, mapping):
+    """Rewrite the coded columns of each model in one pass over its rows, one transaction per batch."""
+    fields = defaultdict(dict)
+    for model_name, field, codes in CODED_FIELDS:
+        fields[model_name][field] = dict(mapping(value, code) for value, code in codes.items())
+
+    for model_name, replacements in fields.items():
+        model = apps.get_model("candidate", model_name)
+        last_pk = None
+        while True:
+            page = model.objects.order_by("pk")
+            if last_pk is not None:
+                page = page.filter(pk__gt=last_pk)
+            batch = list(page.values("pk", *replacements)[:BATCH_SIZE])
+            if not batch:
+                break
+            last_pk = batch[-1]["pk"]
+
+            rows = defaultdict(list)
+            for row in batch:
+                for field, replacement in replacements.items():
+                    if row[field] in replacement:
+                        rows[(field, row[field])].append(row["pk"])
+            with transaction.atomic():
+                for (field, old), pks in rows.items():
+                    model.objects.filter(pk__in=pks).update(**{field: replacements[field][old]})
+
+
+def encode(apps, schema_editor):
+    """Replace the string values by their codes, still as text; the column type changes next."""
+    recode(apps, lambda value, code: (value, str(code)))
+
+
+def decode(apps, schema_editor):
+    recode(apps, lambda value, code: (str(code), value))
+
+
+class Migration(migrations.Migration):
+
+    # Existing rows are recoded in batches, each committed on its own.
+    atomic = False
+
+    dependencies = [
+        ('candidate', '0009_actor'),
+    ]
+
+    operations = [
+        migrations.RunPython(encode, decode),
+        migrations.AlterField(
+            model_name='candidate',
+            name='current_status',
+            field=core.fields.CodedChoiceField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], db_index=True, default='submitted', enum=candidate.models.ApplicationStatus),
+        ),
+        migrations.AlterField(
+            model_name='candidate',
+            name='department',
+            field=core.fields.CodedChoiceField(choices=[('it', 'Information Technology'), ('hr', 'Human Resources'), ('finance', 'Finance')], db_index=True, enum=candidate.models.Department),
+        ),
+        migrations.AlterField(
+            model_name='statushistory',
+            name='new_status',
+            field=core.fields.CodedChoiceField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], enum=candidate.models.ApplicationStatus),
+        ),
+        migrations.AlterField(
+            model_name='statushistory',
+            name='previous_status',
+            field=core.fields.CodedChoiceField(blank=True, choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], enum=candidate.models.ApplicationStatus, null=True),
+        ),
+        migrations.AlterField(
+            model_name='statussnapshot',
+            name='status',
+            field=core.fields.CodedChoiceField(choices=[('submitted', 'Submitted'), ('under_review', 'Under Review'), ('interview_scheduled', 'Interview Scheduled'), ('rejected', 'Rejected'), ('accepted', 'Accepted')], enum=candidate.models.ApplicationStatus),
+        ),
+    ]
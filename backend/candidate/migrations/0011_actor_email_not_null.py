@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-19 16:10
+
+from django.db import migrations, models
+from django.db.models import Min, Q
+
+
+def merge_actors_without_email(apps, schema_editor):
+    """Keep one actor per name among those without an email; NULLs never collided in actor_unique."""
+    Actor = apps.get_model("candidate", "Actor")
+    StatusHistory = apps.get_model("candidate", "StatusHistory")
+
+    without_email = Actor.objects.filter(Q(email__isnull=True) | Q(email=""))
+    for row in without_email.values("name").annotate(keep=Min("id")).order_by():
+        duplicates = without_email.filter(name=row["name"]).exclude(id=row["keep"])
+        StatusHistory.objects.filter(actor__in=duplicates).update(actor_id=row["keep"])
+        duplicates.delete()
+    Actor.objects.filter(email__isnull=True).update(email="")
+
+
+def restore_null_emails(apps, schema_editor):
+    Actor = apps.get_model("candidate", "Actor")
+    Actor.objects.filter(email="").update(email=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidate', '0010_coded_choices'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_actors_without_email, restore_null_emails),
+        migrations.AlterField(
+            model_name='actor',
+            name='email',
+            field=models.EmailField(blank=True, default='', max_length=254),
+        ),
+    ]
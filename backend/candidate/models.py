@@ -2,9 +2,12 @@ import uuid
 from datetime import datetime
 from pathlib import Path
 
+from django.contrib.postgres.search import SearchVectorField
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
+from core.fields import CodedChoiceField
 from core.validators import (
     age_validator,
     experience_validator,
@@ -48,15 +51,24 @@ class Candidate(models.Model):
     years_of_experience = models.PositiveIntegerField(
         validators=[experience_validator],
     )
-    department = models.CharField(max_length=10, choices=Department.choices, db_index=True)
+    department = CodedChoiceField(enum=Department, db_index=True)
     resume = models.FileField(
         upload_to=candidate_resume_path,
         max_length=500,
         validators=[file_size_validator, file_type_validator],
     )
-    current_status = models.CharField(
-        max_length=20, choices=ApplicationStatus.choices, default=ApplicationStatus.SUBMITTED, db_index=True
-    )
+    # Computed from the uploaded bytes so listings never have to ask the storage backend.
+    resume_size = models.PositiveIntegerField(null=True, blank=True, help_text="Resume size in bytes")
+    resume_sha256 = models.CharField(max_length=64, blank=True, db_index=True)
+    resume_content_type = models.CharField(max_length=100, blank=True)
+    resume_page_count = models.PositiveIntegerField(null=True, blank=True)
+    current_status = CodedChoiceField(enum=ApplicationStatus, default=ApplicationStatus.SUBMITTED, db_index=True)
+    # Copied from the latest status history entry by every status change, so list views, SLA
+    # queries and "stale" filters do not need a subquery per candidate on status_history.
+    status_changed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    last_feedback_excerpt = models.CharField(max_length=255, blank=True)
+    last_admin_email = models.EmailField(blank=True)
+    history_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -66,6 +78,9 @@ class Candidate(models.Model):
         indexes = [
             models.Index(fields=["department", "created_at"]),
             models.Index(fields=["current_status", "created_at"]),
+            models.Index(fields=["current_status", "status_changed_at"]),
+            # Keyset order of the changes feed.
+            models.Index(fields=["updated_at", "id"]),
         ]
 
     def __str__(self):
@@ -84,24 +99,136 @@ class Candidate(models.Model):
         )
 
 
+class Actor(models.Model):
+    """
+    An admin (or the system) as recorded on status changes.
+
+    Keyed by name and email together, as both are free text on each status update; status history
+    references actors by a 4-byte id instead of repeating the strings on every row. A missing
+    email is stored as "" rather than NULL, which the unique constraint would treat as distinct.
+    """
+
+    id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=255)
+    email = models.EmailField(blank=True, default="")
+
+    class Meta:
+        db_table = "actors"
+        constraints = [
+            models.UniqueConstraint(fields=["email", "name"], name="actor_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} <{self.email}>" if self.email else self.name
+
+
+class StatusHistoryManager(models.Manager):
+    def get_queryset(self):
+        # admin_name and admin_email are read through the actor wherever history is serialized.
+        return super().get_queryset().select_related("actor")
+
+
 class StatusHistory(models.Model):
     """Track all status changes with admin information."""
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name="status_history")
-    previous_status = models.CharField(max_length=20, choices=ApplicationStatus.choices, blank=True, null=True)
-    new_status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    previous_status = CodedChoiceField(enum=ApplicationStatus, blank=True, null=True)
+    new_status = CodedChoiceField(enum=ApplicationStatus)
     feedback = models.TextField(blank=True)
-    admin_name = models.CharField(max_length=255, default="System Admin")
-    admin_email = models.EmailField(null=True, blank=True)
+    actor = models.ForeignKey(Actor, on_delete=models.PROTECT, related_name="status_changes")
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
+    objects = StatusHistoryManager()
+
     class Meta:
         db_table = "status_history"
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["candidate", "created_at"]),
+            # Keyset order of the changes feed.
+            models.Index(fields=["created_at", "id"]),
+            # Admin audits: one admin's changes over a period.
+            models.Index(fields=["actor", "created_at"]),
         ]
 
     def __str__(self):
         return f"{self.candidate.full_name}: {self.previous_status} -> {self.new_status}"
+
+    @property
+    def admin_name(self) -> str:
+        return self.actor.name
+
+    @property
+    def admin_email(self) -> str | None:
+        return self.actor.email or None
+
+    def save(self, *args, **kwargs):
+        # History is the event log candidate statuses are projected from, so entries are never rewritten.
+        if not self._state.adding:
+            raise ValueError("Status history entries are append-only")
+        super().save(*args, **kwargs)
+
+
+class StatusSnapshot(models.Model):
+    """The status of every candidate at `taken_at`; point-in-time queries start from the latest one."""
+
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name="status_snapshots")
+    status = CodedChoiceField(enum=ApplicationStatus)
+    taken_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "status_snapshots"
+        constraints = [
+            models.UniqueConstraint(fields=["taken_at", "candidate"], name="status_snapshot_unique"),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id} at {self.taken_at}: {self.status}"
+
+
+class ResumeText(models.Model):
+    """Plain text extracted from a candidate resume, kept out of the candidates table."""
+
+    candidate = models.OneToOneField(
+        Candidate, on_delete=models.CASCADE, primary_key=True, related_name="resume_text"
+    )
+    content = models.TextField(blank=True)
+    # Populated on PostgreSQL only and backed by a GIN index created in migration 0002.
+    search_vector = SearchVectorField(null=True, editable=False)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "resume_texts"
+
+    def __str__(self):
+        return f"Resume text for {self.candidate_id}"
+
+
+class AutoTransitionRule(models.Model):
+    """Move candidates left in a status for too long, e.g. auto-reject `submitted` after 60 days in IT."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255)
+    from_status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    to_status = models.CharField(max_length=20, choices=ApplicationStatus.choices)
+    # Empty applies the rule to every department.
+    department = models.CharField(max_length=10, choices=Department.choices, blank=True)
+    after_days = models.PositiveIntegerField(help_text="Days since the application was submitted")
+    feedback = models.TextField(blank=True, help_text="Feedback recorded in the status history and the email")
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "auto_transition_rules"
+        ordering = ["from_status", "after_days"]
+
+    def __str__(self):
+        return f"{self.name}: {self.from_status} -> {self.to_status} after {self.after_days} days"
+
+    def clean(self):
+        from candidate.workflow import APPLICATION_WORKFLOW
+
+        if not APPLICATION_WORKFLOW.can_transition(self.from_status, self.to_status):
+            raise ValidationError({"to_status": APPLICATION_WORKFLOW.error_message(self.from_status, self.to_status)})
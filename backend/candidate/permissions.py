@@ -17,7 +17,7 @@ class CandidatePermission(permissions.BasePermission):
 class AdminOnlyPermission(permissions.BasePermission):
     """Allow only admin (X-ADMIN=1) for admin actions (list, retrieve, update, download, stats, update-status)."""
 
-    admin_actions = {"list", "retrieve", "partial_update", "download_resume"}
+    admin_actions = {"list", "retrieve", "partial_update", "download_resume", "pipeline", "changes", "activity"}
 
     def has_permission(self, request, view):
         if view.action in self.admin_actions:
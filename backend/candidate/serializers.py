@@ -1,8 +1,22 @@
 from typing import Any
 
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.urls import reverse
 from rest_framework import serializers
 
 from candidate.models import ApplicationStatus, Candidate, StatusHistory
+from candidate.transitions import (
+    LAST_STATUS_CHANGE_FIELDS,
+    SYSTEM_ADMIN_EMAIL,
+    SYSTEM_ADMIN_NAME,
+    get_actor,
+    last_status_change,
+    transition_status,
+)
+from candidate.workflow import APPLICATION_WORKFLOW
+from candidate.utils import get_resume_metadata
+from core.validators import phone_number_validator
 
 
 class CandidateRegistrationSerializer(serializers.ModelSerializer):
@@ -24,26 +38,74 @@ class CandidateRegistrationSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["id", "current_status", "created_at", "age"]
+        # Uniqueness is checked by validate() in a single query instead of one UniqueValidator query per field.
+        extra_kwargs = {
+            "email": {"validators": []},
+            "phone": {"validators": [phone_number_validator]},
+        }
 
     def get_age(self, obj) -> int:
         """Calculate and return candidate age."""
         return obj.age
 
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        """Reject duplicate email or phone numbers before the resume reaches storage."""
+        if errors := self._find_duplicates(attrs["email"], attrs["phone"]):
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def create(self, validated_data: dict[str, Any]) -> Candidate:
-        """Create candidate with initial status history."""
-        candidate = super().create(validated_data)
-
-        # Create initial status history
-        StatusHistory.objects.create(
-            candidate=candidate,
-            new_status=ApplicationStatus.SUBMITTED,
-            feedback="Application submitted successfully",
-            admin_name="System",
-            admin_email="admin@hr-system.me",
-        )
+        """
+        Create candidate with initial status history.
+
+        The row is inserted before the resume is written so that a registration losing a uniqueness
+        race fails inside its own savepoint, returns a 400 and leaves nothing behind in storage.
+        """
+        resume = validated_data.pop("resume")
+        validated_data.update(get_resume_metadata(resume))
+
+        with transaction.atomic():
+            try:
+                with transaction.atomic():
+                    candidate = Candidate.objects.create(**validated_data)
+            except IntegrityError:
+                errors = self._find_duplicates(validated_data["email"], validated_data["phone"])
+                raise serializers.ValidationError(errors or "Candidate could not be registered, please retry.")
+
+            candidate.resume.save(resume.name, resume, save=False)
+            try:
+                # Create initial status history
+                history = StatusHistory.objects.create(
+                    candidate=candidate,
+                    new_status=ApplicationStatus.SUBMITTED,
+                    feedback="Application submitted successfully",
+                    actor=get_actor(SYSTEM_ADMIN_NAME, SYSTEM_ADMIN_EMAIL),
+                )
+
+                change = last_status_change(history.created_at, history.feedback, history.admin_email)
+                for field, value in change.items():
+                    setattr(candidate, field, value)
+                candidate.history_count = 1
+                candidate.save(update_fields=["resume", *LAST_STATUS_CHANGE_FIELDS])
+            except Exception:
+                candidate.resume.delete(save=False)
+                raise
 
         return candidate
 
+    @staticmethod
+    def _find_duplicates(email: str, phone: str) -> dict[str, list[str]]:
+        """Look up both unique constraints with one indexed query."""
+        errors = {}
+        for existing_email, existing_phone in Candidate.objects.filter(Q(email=email) | Q(phone=phone)).values_list(
+            "email", "phone"
+        )[:2]:
+            if existing_email == email:
+                errors["email"] = ["candidate with this email already exists."]
+            if existing_phone == phone:
+                errors["phone"] = ["candidate with this phone already exists."]
+        return errors
+
 
 class CandidateListSerializer(serializers.ModelSerializer):
     """Serializer for candidate listing (admin view)."""
@@ -60,6 +122,12 @@ class CandidateListSerializer(serializers.ModelSerializer):
             "years_of_experience",
             "department",
             "current_status",
+            "status_changed_at",
+            "last_feedback_excerpt",
+            "history_count",
+            "resume_size",
+            "resume_content_type",
+            "resume_page_count",
             "created_at",
         ]
 
@@ -83,6 +151,13 @@ class StatusHistorySerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
+class StatusHistoryChangeSerializer(StatusHistorySerializer):
+    """Status history entry in the changes feed, with the candidate it belongs to."""
+
+    class Meta(StatusHistorySerializer.Meta):
+        fields = ["candidate", *StatusHistorySerializer.Meta.fields]
+
+
 class CandidateStatusSerializer(serializers.ModelSerializer):
     """Serializer for candidate status tracking."""
 
@@ -131,52 +206,30 @@ class StatusUpdateSerializer(serializers.Serializer):
     admin_name = serializers.CharField(max_length=255, required=True, help_text="Name of the admin making the change")
     admin_email = serializers.EmailField(required=True, help_text="Email of the admin making the change")
 
-    VALID_STATUS_TRANSITIONS = {
-        ApplicationStatus.SUBMITTED: [ApplicationStatus.UNDER_REVIEW, ApplicationStatus.REJECTED],
-        ApplicationStatus.UNDER_REVIEW: [ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.REJECTED],
-        ApplicationStatus.INTERVIEW_SCHEDULED: [
-            ApplicationStatus.ACCEPTED,
-            ApplicationStatus.REJECTED,
-            ApplicationStatus.UNDER_REVIEW,  # Allow going back for re-evaluation
-        ],
-        ApplicationStatus.REJECTED: [],  # Final state
-        ApplicationStatus.ACCEPTED: [],  # Final state
-    }
-
     def validate_new_status(self, value):
         """Validate status transition logic."""
         candidate = self.context.get("candidate")
         if not candidate:
             return value
 
-        current_status = candidate.current_status
-
-        if value not in self.VALID_STATUS_TRANSITIONS.get(current_status, []):
-            valid_transitions = self.VALID_STATUS_TRANSITIONS.get(current_status, [])
-            raise serializers.ValidationError(
-                f"Cannot transition from {current_status} to {value}. "
-                f"Valid transitions: {', '.join(valid_transitions) if valid_transitions else 'No valid transitions'}"
-            )
+        if not APPLICATION_WORKFLOW.can_transition(candidate.current_status, value):
+            raise serializers.ValidationError(APPLICATION_WORKFLOW.error_message(candidate.current_status, value))
 
         return value
 
     def update(self, instance, validated_data):
-        """Update candidate status and create history record."""
-        previous_status = instance.current_status
-        new_status = validated_data["new_status"]
-
-        # Update candidate status
-        instance.current_status = new_status
-        instance.save(update_fields=["current_status", "updated_at"])
-
-        # Create status history
-        StatusHistory.objects.create(
-            candidate=instance,
-            previous_status=previous_status,
-            new_status=new_status,
+        """
+        Update candidate status and create history record.
+
+        The change only applies if the candidate still has the status it was validated against;
+        otherwise TransitionConflict (409) is raised and nothing is written.
+        """
+        transition_status(
+            instance,
+            expected_status=instance.current_status,
+            new_status=validated_data["new_status"],
             feedback=validated_data["feedback"],
-            admin_name=validated_data["admin_name"],
-            admin_email=validated_data["admin_email"],
+            actor=get_actor(validated_data["admin_name"], validated_data["admin_email"]),
         )
 
         return instance
@@ -190,6 +243,7 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
     current_status = serializers.CharField(source="get_current_status_display", read_only=True)
     status_history = StatusHistorySerializer(many=True, read_only=True)
     resume_url = serializers.SerializerMethodField()
+    resume_download_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Candidate
@@ -204,6 +258,15 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
             "department",
             "current_status",
             "resume_url",
+            "resume_download_url",
+            "resume_size",
+            "resume_sha256",
+            "resume_content_type",
+            "resume_page_count",
+            "status_changed_at",
+            "last_feedback_excerpt",
+            "last_admin_email",
+            "history_count",
             "status_history",
             "created_at",
             "updated_at",
@@ -220,13 +283,19 @@ class CandidateDetailSerializer(serializers.ModelSerializer):
             return request.build_absolute_uri(obj.resume.url)
         return ""
 
+    def get_resume_download_url(self, obj) -> str:
+        """Link to the admin resume download endpoint, which needs no storage call to build."""
+        if (request := self.context.get("request")) and obj.resume:
+            return request.build_absolute_uri(reverse("candidate:candidate-download-resume", kwargs={"pk": obj.pk}))
+        return ""
+
 
 class ResumeDownloadSerializer(serializers.ModelSerializer):
     download_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Candidate
-        fields = ["id", "download_url"]
+        fields = ["id", "download_url", "resume_size", "resume_content_type"]
 
     def get_download_url(self, obj):
         if obj.resume:
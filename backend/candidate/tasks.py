@@ -0,0 +1,144 @@
+import logging
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from candidate.events import take_status_snapshot
+from candidate.models import AutoTransitionRule, Candidate
+from candidate.transitions import apply_auto_transition
+from candidate.utils import build_admin_digests, save_resume_text
+from candidate.workflow import APPLICATION_WORKFLOW
+from core.documents import DocumentExtractionError, count_pages, extract_text
+from core.models import EmailOutbox, TaskWatermark
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def extract_resume_text_task(self, candidate_id: str) -> bool:
+    """
+    Celery task to extract resume text and index it for full-text search.
+
+    Also records the resume page count: parsing is kept out of the upload request and runs here,
+    in a worker process where the time limit is enforced.
+
+    Args:
+        candidate_id: Candidate primary key
+
+    Returns:
+        bool: True if the resume text was stored
+    """
+    try:
+        candidate = Candidate.objects.only("id", "resume").get(pk=candidate_id)
+    except Candidate.DoesNotExist:
+        logger.warning(f"Resume text extraction skipped, candidate {candidate_id} does not exist")
+        return False
+
+    if not candidate.resume:
+        logger.warning(f"Resume text extraction skipped, candidate {candidate_id} has no resume")
+        return False
+
+    try:
+        with candidate.resume.open("rb") as resume:
+            data = resume.read()
+        page_count = count_pages(data, timeout=settings.RESUME_TEXT_EXTRACTION_TIMEOUT)
+        content = extract_text(data, timeout=settings.RESUME_TEXT_EXTRACTION_TIMEOUT)
+
+    except DocumentExtractionError as e:
+        # Corrupt, unsupported or pathological files will not get better on retry.
+        logger.error(f"Resume text extraction failed for candidate {candidate_id}: {str(e)}")
+        return False
+
+    except Exception as exc:
+        logger.error(f"Resume text extraction error for candidate {candidate_id}: {str(exc)}")
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc)
+        return False
+
+    save_resume_text(candidate.pk, content)
+    Candidate.objects.filter(pk=candidate.pk).update(resume_page_count=page_count)
+    logger.info(f"Resume text extracted for candidate {candidate_id} ({len(content)} characters)")
+    return True
+
+
+@shared_task
+def send_admin_digest_task() -> int:
+    """
+    Queue one activity digest email per admin covering everything since the previous digest.
+
+    The watermark is advanced in the same transaction that queues the emails, so a failed run
+    is covered by the next one and no period is reported twice.
+
+    Returns:
+        int: Number of digest emails queued
+    """
+    with transaction.atomic():
+        # Created first so that the lock also serializes the very first runs.
+        TaskWatermark.objects.get_or_create(name="admin-digest", defaults={"value": timezone.now() - timedelta(days=1)})
+        watermark = TaskWatermark.objects.select_for_update().get(name="admin-digest")
+        until = timezone.now()
+        since = watermark.value
+
+        messages = build_admin_digests(since, until)
+        EmailOutbox.objects.bulk_create(
+            [
+                EmailOutbox(
+                    template_name=message["template_name"],
+                    context=message["context"],
+                    subject=message["subject"],
+                    recipient_email=message["recipient_email"],
+                    recipient_name=message["recipient_name"],
+                    queue=EmailOutbox.Queue.BULK,
+                    priority=EmailOutbox.LOW_PRIORITY,
+                )
+                for message in messages
+            ]
+        )
+        watermark.value = until
+        watermark.save(update_fields=["value"])
+
+    logger.info(f"Queued {len(messages)} admin digest emails for {since.isoformat()} - {until.isoformat()}")
+    return len(messages)
+
+
+@shared_task
+def apply_auto_transitions_task() -> int:
+    """
+    Apply every active auto-transition rule, e.g. auto-reject stale applications.
+
+    Returns:
+        int: Number of candidates moved
+    """
+    now = timezone.now()
+    moved = 0
+    rules = list(AutoTransitionRule.objects.filter(is_active=True))
+    allowed = APPLICATION_WORKFLOW.validate_batch((rule.from_status, rule.to_status) for rule in rules)
+    for rule, is_allowed in zip(rules, allowed):
+        if not is_allowed:
+            logger.error(f"Auto-transition '{rule.name}' skipped: {rule.from_status} -> {rule.to_status} not allowed")
+            continue
+
+        try:
+            count = apply_auto_transition(rule, now=now)
+        except Exception as e:
+            logger.error(f"Auto-transition '{rule.name}' failed: {str(e)}")
+            continue
+
+        logger.info(f"Auto-transition '{rule.name}' moved {count} candidates to {rule.to_status}")
+        moved += count
+
+    return moved
+
+
+@shared_task
+def take_status_snapshot_task() -> int:
+    """
+    Snapshot the status of every candidate for point-in-time pipeline queries.
+
+    Returns:
+        int: Number of candidates in the snapshot
+    """
+    return take_status_snapshot()
@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from candidate.changes import InvalidCursor, changes_since, current_cursor, decode_cursor, encode_cursor
+from candidate.models import ApplicationStatus, Candidate, StatusHistory
+from candidate.tests.test_models import ActorFactory, CandidateFactory
+
+
+class TestChangesFeed(TestCase):
+    """Tests for the incremental candidate changes feed."""
+
+    def setUp(self):
+        self.client = APIClient()
+        # Reloaded so primary keys are UUIDs, as returned by the queries under test.
+        self.candidates = list(Candidate.objects.filter(pk__in=[CandidateFactory().pk for _ in range(3)]))
+        self.cursor = current_cursor()
+
+    def change_status(self, candidate, new_status=ApplicationStatus.UNDER_REVIEW):
+        Candidate.objects.filter(pk=candidate.pk).update(current_status=new_status, updated_at=timezone.now())
+        return StatusHistory.objects.create(
+            candidate=candidate,
+            previous_status=ApplicationStatus.SUBMITTED,
+            new_status=new_status,
+            actor=ActorFactory(),
+        )
+
+    def test_no_changes(self):
+        """Test polling without changes returns nothing and keeps the cursor usable."""
+        with self.assertNumQueries(2):
+            changes = changes_since(self.cursor, limit=10)
+
+        self.assertEqual(changes["candidates"], [])
+        self.assertEqual(changes["history"], [])
+        self.assertFalse(changes["has_more"])
+        self.assertEqual(decode_cursor(changes["cursor"]), decode_cursor(self.cursor))
+
+    def test_changes_after_cursor(self):
+        """Test only rows changed after the cursor are returned, and only once."""
+        entry = self.change_status(self.candidates[1])
+
+        changes = changes_since(self.cursor, limit=10)
+
+        self.assertEqual([candidate.pk for candidate in changes["candidates"]], [self.candidates[1].pk])
+        self.assertEqual([history.pk for history in changes["history"]], [entry.pk])
+        self.assertEqual(changes_since(changes["cursor"], limit=10)["candidates"], [])
+
+    def test_changes_are_paged(self):
+        """Test a burst of changes is returned in pages of at most `limit` rows."""
+        for candidate in self.candidates:
+            self.change_status(candidate)
+
+        first = changes_since(self.cursor, limit=2)
+        second = changes_since(first["cursor"], limit=2)
+
+        self.assertTrue(first["has_more"])
+        self.assertFalse(second["has_more"])
+        returned = [candidate.pk for candidate in first["candidates"] + second["candidates"]]
+        self.assertEqual(sorted(map(str, returned)), sorted(str(candidate.pk) for candidate in self.candidates))
+
+    @override_settings(CHANGES_FEED_SETTLE_SECONDS=60)
+    def test_recent_changes_wait_to_settle(self):
+        """Test changes younger than the settle window are held back."""
+        Candidate.objects.filter(pk=self.candidates[0].pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        cursor = current_cursor()
+        self.change_status(self.candidates[1])
+
+        self.assertEqual(changes_since(cursor, limit=10)["candidates"], [])
+
+    def test_invalid_cursor(self):
+        """Test a tampered cursor is rejected."""
+        with self.assertRaises(InvalidCursor):
+            decode_cursor("not-a-cursor")
+
+    def test_cursor_with_bad_id_or_naive_time_is_rejected(self):
+        """Test the id must be a UUID and the timestamp timezone-aware."""
+        moment = timezone.now()
+        for position in [
+            {"c": (moment, "not-a-uuid")},
+            {"h": (moment.replace(tzinfo=None), self.candidates[0].pk)},
+        ]:
+            with self.subTest(position=position), self.assertRaises(InvalidCursor):
+                decode_cursor(encode_cursor(position))
+
+        response = self.client.get(
+            "/api/v1/candidates/changes/", {"cursor": encode_cursor({"c": (moment, "1")})}, HTTP_X_ADMIN="1"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_changes_endpoint(self):
+        """Test the endpoint hands out a cursor and then the changes after it."""
+        response = self.client.get("/api/v1/candidates/changes/", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["candidates"], [])
+
+        self.change_status(self.candidates[2])
+        response = self.client.get(
+            "/api/v1/candidates/changes/", {"cursor": response.data["cursor"]}, HTTP_X_ADMIN="1"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.data["candidates"]], [str(self.candidates[2].pk)])
+        self.assertEqual(response.data["candidates"][0]["current_status"], ApplicationStatus.UNDER_REVIEW)
+        self.assertEqual(str(response.data["history"][0]["candidate"]), str(self.candidates[2].pk))
+
+    def test_changes_endpoint_errors(self):
+        """Test bad cursors and missing admin access are rejected."""
+        response = self.client.get("/api/v1/candidates/changes/", {"cursor": "bogus"}, HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get("/api/v1/candidates/changes/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
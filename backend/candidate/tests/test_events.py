@@ -0,0 +1,222 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from candidate.events import (
+    admin_activity,
+    pipeline_as_of,
+    rebuild_status_projection,
+    status_as_of,
+    take_status_snapshot,
+)
+from candidate.models import ApplicationStatus, Candidate, StatusHistory, StatusSnapshot
+from candidate.tests.test_models import ActorFactory, CandidateFactory
+
+
+class TestStatusEventLog(TestCase):
+    """Unit tests for point-in-time status queries over the status history."""
+
+    def setUp(self):
+        self.start = timezone.now() - timedelta(days=30)
+        # Reloaded so primary keys are UUIDs, as returned by the queries under test.
+        self.first = Candidate.objects.get(pk=CandidateFactory(department="it").pk)
+        self.second = Candidate.objects.get(pk=CandidateFactory(department="hr").pk)
+        self.record(self.first, None, ApplicationStatus.SUBMITTED, days=0)
+        self.record(self.second, None, ApplicationStatus.SUBMITTED, days=1)
+        self.record(self.first, ApplicationStatus.SUBMITTED, ApplicationStatus.UNDER_REVIEW, days=5)
+        self.record(self.second, ApplicationStatus.SUBMITTED, ApplicationStatus.REJECTED, days=10)
+        self.record(self.first, ApplicationStatus.UNDER_REVIEW, ApplicationStatus.INTERVIEW_SCHEDULED, days=20)
+
+    def record(self, candidate, previous_status, new_status, days):
+        changed_at = self.start + timedelta(days=days)
+        with patch("django.utils.timezone.now", return_value=changed_at):
+            StatusHistory.objects.create(
+                candidate=candidate,
+                previous_status=previous_status,
+                new_status=new_status,
+                actor=ActorFactory(name="System", email=""),
+            )
+        Candidate.objects.filter(pk=candidate.pk).update(
+            current_status=new_status,
+            status_changed_at=changed_at,
+            last_feedback_excerpt="",
+            last_admin_email="",
+            history_count=StatusHistory.objects.filter(candidate=candidate).count(),
+        )
+
+    def at(self, days):
+        return self.start + timedelta(days=days, hours=1)
+
+    def test_status_as_of_replays_history(self):
+        """Test the status at a point in time without any snapshot."""
+        self.assertEqual(status_as_of(self.at(-1)), {})
+        self.assertEqual(status_as_of(self.at(0)), {self.first.pk: ApplicationStatus.SUBMITTED})
+        self.assertEqual(
+            status_as_of(self.at(12)),
+            {self.first.pk: ApplicationStatus.UNDER_REVIEW, self.second.pk: ApplicationStatus.REJECTED},
+        )
+
+    def test_status_as_of_starts_from_snapshot(self):
+        """Test point-in-time queries read the latest snapshot plus the events after it."""
+        self.assertEqual(take_status_snapshot(taken_at=self.at(12)), 2)
+
+        with self.assertNumQueries(3):
+            statuses = status_as_of(self.at(25))
+
+        self.assertEqual(
+            statuses, {self.first.pk: ApplicationStatus.INTERVIEW_SCHEDULED, self.second.pk: ApplicationStatus.REJECTED}
+        )
+        # Earlier points in time still replay the history up to them.
+        self.assertEqual(status_as_of(self.at(6))[self.first.pk], ApplicationStatus.UNDER_REVIEW)
+
+    def test_snapshot_is_taken_in_pages(self):
+        """Test a snapshot built a page of candidates at a time matches the full replay, from history or a snapshot."""
+        expected = {days: status_as_of(self.at(days)) for days in (12, 25)}
+
+        self.assertEqual(take_status_snapshot(taken_at=self.at(12), batch_size=1), 2)
+        self.assertEqual(take_status_snapshot(taken_at=self.at(25), batch_size=1), 2)
+
+        for days, statuses in expected.items():
+            snapshot = StatusSnapshot.objects.filter(taken_at=self.at(days))
+            self.assertEqual(dict(snapshot.values_list("candidate_id", "status")), statuses)
+
+    def test_snapshot_is_authoritative_for_its_period(self):
+        """Test events before the snapshot are not read again."""
+        take_status_snapshot(taken_at=self.at(12))
+        StatusSnapshot.objects.filter(candidate=self.first).update(status=ApplicationStatus.ACCEPTED)
+
+        self.assertEqual(status_as_of(self.at(15))[self.first.pk], ApplicationStatus.ACCEPTED)
+
+    def test_pipeline_as_of(self):
+        """Test candidate counts per status, overall and per department."""
+        take_status_snapshot(taken_at=self.at(3))
+
+        with self.assertNumQueries(4):
+            pipeline = pipeline_as_of(self.at(12))
+        # Both candidates were submitted in the snapshot and moved on since.
+        self.assertEqual(pipeline[ApplicationStatus.SUBMITTED], 0)
+        self.assertEqual(pipeline[ApplicationStatus.UNDER_REVIEW], 1)
+        self.assertEqual(pipeline[ApplicationStatus.REJECTED], 1)
+        self.assertEqual(pipeline[ApplicationStatus.ACCEPTED], 0)
+        self.assertEqual(pipeline_as_of(self.at(12), department="hr")[ApplicationStatus.UNDER_REVIEW], 0)
+
+    def test_pipeline_as_of_matches_status_as_of(self):
+        """Test the counts agree with the per-candidate statuses with and without a snapshot."""
+        later = Candidate.objects.get(pk=CandidateFactory(department="it").pk)
+        self.record(later, None, ApplicationStatus.SUBMITTED, days=15)
+
+        for days in (-1, 0, 6, 12, 16, 25):
+            statuses = list(status_as_of(self.at(days)).values())
+            expected = {status: statuses.count(status) for status in ApplicationStatus.values}
+            self.assertEqual(pipeline_as_of(self.at(days)), expected, days)
+
+        take_status_snapshot(taken_at=self.at(7))
+        for days in (7, 12, 16, 25):
+            statuses = list(status_as_of(self.at(days), department="it").values())
+            expected = {status: statuses.count(status) for status in ApplicationStatus.values}
+            self.assertEqual(pipeline_as_of(self.at(days), department="it"), expected, days)
+
+    def test_take_status_snapshot_expires_old_snapshots(self):
+        """Test a new snapshot removes the ones past their retention and is not taken twice."""
+        take_status_snapshot(taken_at=timezone.now() - timedelta(days=400))
+
+        self.assertEqual(take_status_snapshot(), 2)
+        self.assertEqual(take_status_snapshot(taken_at=StatusSnapshot.objects.get(candidate=self.first).taken_at), 0)
+        self.assertEqual(StatusSnapshot.objects.count(), 2)
+
+    def test_history_is_append_only(self):
+        """Test recorded status events cannot be rewritten."""
+        event = StatusHistory.objects.filter(candidate=self.first).first()
+        event.feedback = "Changed"
+
+        with self.assertRaises(ValueError):
+            event.save()
+
+    def test_rebuild_status_projection(self):
+        """Test drifted candidate statuses are reset from the event log."""
+        Candidate.objects.filter(pk=self.first.pk).update(current_status=ApplicationStatus.ACCEPTED)
+
+        drifted = rebuild_status_projection(dry_run=True)
+
+        self.assertEqual(drifted, {ApplicationStatus.INTERVIEW_SCHEDULED: [self.first.pk]})
+        self.assertEqual(Candidate.objects.get(pk=self.first.pk).current_status, ApplicationStatus.ACCEPTED)
+
+        out = StringIO()
+        call_command("rebuild_status_projection", stdout=out)
+
+        self.assertIn("1 candidates reset", out.getvalue())
+        self.assertEqual(Candidate.objects.get(pk=self.first.pk).current_status, ApplicationStatus.INTERVIEW_SCHEDULED)
+        self.assertEqual(rebuild_status_projection(), {})
+
+    def test_rebuild_repairs_last_status_change_fields(self):
+        """Test the denormalized last status change fields are reset from the event log too."""
+        Candidate.objects.filter(pk=self.second.pk).update(
+            status_changed_at=timezone.now(), last_feedback_excerpt="Stale", last_admin_email="x@example.com"
+        )
+        Candidate.objects.filter(pk=self.first.pk).update(history_count=7)
+
+        self.assertEqual(
+            rebuild_status_projection(batch_size=1),
+            {ApplicationStatus.REJECTED: [self.second.pk], ApplicationStatus.INTERVIEW_SCHEDULED: [self.first.pk]},
+        )
+
+        second = Candidate.objects.get(pk=self.second.pk)
+        self.assertEqual(second.status_changed_at, self.start + timedelta(days=10))
+        self.assertEqual((second.last_feedback_excerpt, second.last_admin_email), ("", ""))
+        self.assertEqual(Candidate.objects.get(pk=self.first.pk).history_count, 3)
+        self.assertEqual(rebuild_status_projection(), {})
+
+    def test_rebuild_locks_each_batch(self):
+        """Test every batch is read with row locks, so it cannot revert a concurrent status change."""
+        from django.db.models import QuerySet
+
+        select_for_update = QuerySet.select_for_update
+        with patch.object(QuerySet, "select_for_update", autospec=True, side_effect=select_for_update) as mock_lock:
+            rebuild_status_projection(batch_size=1)
+
+        # Two batches of one candidate, then the empty page that ends the rebuild.
+        self.assertEqual(mock_lock.call_count, 3)
+        self.assertTrue(all(call.args[0].model is Candidate for call in mock_lock.call_args_list))
+
+
+class TestAdminActivity(TestCase):
+    """Unit tests for the per-admin status change summary."""
+
+    def setUp(self):
+        first, second = CandidateFactory(), CandidateFactory()
+        changes = [
+            (first, ApplicationStatus.UNDER_REVIEW, "Alice", "alice@example.com"),
+            (first, ApplicationStatus.INTERVIEW_SCHEDULED, "Alice", "alice@example.com"),
+            (second, ApplicationStatus.UNDER_REVIEW, "Alice", "alice@example.com"),
+            (second, ApplicationStatus.REJECTED, "Bob", "bob@example.com"),
+        ]
+        for candidate, new_status, admin_name, admin_email in changes:
+            StatusHistory.objects.create(
+                candidate=candidate, new_status=new_status, actor=ActorFactory(name=admin_name, email=admin_email)
+            )
+
+    def test_activity_per_admin(self):
+        """Test changes are counted per admin, most active first, in one query."""
+        with self.assertNumQueries(1):
+            activity = admin_activity(StatusHistory.objects.all())
+
+        self.assertEqual([row["admin_email"] for row in activity], ["alice@example.com", "bob@example.com"])
+        alice = activity[0]
+        self.assertEqual(alice["admin_name"], "Alice")
+        self.assertEqual(alice["changes"], 3)
+        self.assertEqual(alice["candidates"], 2)
+        self.assertEqual(alice["statuses"][ApplicationStatus.UNDER_REVIEW], 2)
+        self.assertEqual(alice["statuses"][ApplicationStatus.REJECTED], 0)
+        self.assertLessEqual(alice["first_change_at"], alice["last_change_at"])
+
+    def test_activity_of_filtered_history(self):
+        """Test ordering of the queryset does not split the groups and filters narrow them."""
+        activity = admin_activity(StatusHistory.objects.filter(actor__email="bob@example.com").order_by("-created_at"))
+
+        self.assertEqual(len(activity), 1)
+        self.assertEqual(activity[0]["changes"], 1)
+        self.assertEqual(activity[0]["statuses"][ApplicationStatus.REJECTED], 1)
@@ -1,13 +1,18 @@
 from datetime import date
+from importlib import import_module
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
 from factory import Faker as FactoryFaker
+from factory import SubFactory
 from factory.django import DjangoModelFactory
 from faker import Faker
 
-from candidate.models import ApplicationStatus, Candidate, Department, StatusHistory
+from candidate.models import Actor, ApplicationStatus, Candidate, Department, StatusHistory
 
 User = get_user_model()
 
@@ -49,6 +54,17 @@ class CandidateFactory(DjangoModelFactory):
         return super()._create(model_class, *args, **kwargs)
 
 
+class ActorFactory(DjangoModelFactory):
+    """Factory for creating test actors."""
+
+    class Meta:
+        model = Actor
+        django_get_or_create = ("name", "email")
+
+    name = FactoryFaker("name")
+    email = FactoryFaker("email")
+
+
 class StatusHistoryFactory(DjangoModelFactory):
     """Factory for creating test status history."""
 
@@ -60,8 +76,7 @@ class StatusHistoryFactory(DjangoModelFactory):
     previous_status = None
     new_status = ApplicationStatus.SUBMITTED
     feedback = FactoryFaker("text", max_nb_chars=200)
-    admin_name = FactoryFaker("name")
-    admin_email = FactoryFaker("email")
+    actor = SubFactory(ActorFactory)
 
 
 # Unit Tests
@@ -147,7 +162,7 @@ class TestCandidateModel(TestCase):
         # Check that indexes exist (actual names may vary)
         self.assertGreater(len(indexes), 0)
         # Check that we have the expected number of indexes
-        self.assertEqual(len(indexes), 2)
+        self.assertEqual(len(indexes), 4)
 
     def test_verbose_names(self):
         """Test model verbose names."""
@@ -171,13 +186,14 @@ class TestStatusHistoryModel(TestCase):
             candidate=self.candidate,
             new_status=ApplicationStatus.UNDER_REVIEW,
             feedback="Under review",
-            admin_name="Admin User",
-            admin_email="admin@example.com",
+            actor=ActorFactory(name="Admin User", email="admin@example.com"),
         )
 
         self.assertIsNotNone(status_history.id)
         self.assertEqual(status_history.candidate, self.candidate)
         self.assertEqual(status_history.new_status, ApplicationStatus.UNDER_REVIEW)
+        self.assertEqual(status_history.admin_name, "Admin User")
+        self.assertEqual(status_history.admin_email, "admin@example.com")
 
     def test_status_history_string_representation(self):
         """Test string representation."""
@@ -220,6 +236,77 @@ class TestStatusHistoryModel(TestCase):
         for expected in expected_indexes:
             self.assertIn(expected, indexes)
 
+    def test_admin_fields_are_read_from_actor(self):
+        """Test history rows share one actor per admin and expose its name and email."""
+        admin = {"actor__name": "Admin User", "actor__email": "admin@example.com"}
+        first = StatusHistoryFactory(candidate=self.candidate, **admin)
+        second = StatusHistoryFactory(candidate=self.candidate, **admin)
+
+        self.assertEqual(first.actor_id, second.actor_id)
+        self.assertEqual(Actor.objects.count(), 1)
+        with self.assertNumQueries(1):
+            history = StatusHistory.objects.get(pk=first.pk)
+            self.assertEqual((history.admin_name, history.admin_email), ("Admin User", "admin@example.com"))
+
+
+class MigrationTestCase(TransactionTestCase):
+    """Base for tests of data migrations: rows are created at `migrate_from` and checked at `migrate_to`."""
+
+    migrate_from = None
+    migrate_to = None
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate(MigrationExecutor(connection).loader.graph.leaf_nodes())
+
+    @staticmethod
+    def create_candidate(apps, number, **fields):
+        return apps.get_model("candidate", "Candidate").objects.create(
+            full_name=f"Candidate {number}",
+            email=f"candidate{number}@example.com",
+            phone=f"+120255501{number:02d}",
+            date_of_birth=date(1990, 1, 1),
+            years_of_experience=3,
+            resume="resumes/test.pdf",
+            **{"department": Department.IT, **fields},
+        )
+
+
+class TestActorMigration(MigrationTestCase):
+    """Test the migration moving admin names and emails from status history to actors."""
+
+    migrate_from = [("candidate", "0008_admin_audit_indexes")]
+    migrate_to = [("candidate", "0009_actor")]
+
+    def test_existing_rows_are_linked_to_actors(self):
+        """Test each distinct admin becomes one actor and every row points at it."""
+        apps = self.migrate(self.migrate_from)
+        OldStatusHistory = apps.get_model("candidate", "StatusHistory")
+        admins = [("Alice", "alice@example.com"), ("Alice", "alice@example.com"), ("Bob", None)]
+        for number, (admin_name, admin_email) in enumerate(admins):
+            candidate = self.create_candidate(apps, number)
+            OldStatusHistory.objects.create(
+                candidate=candidate,
+                new_status=ApplicationStatus.SUBMITTED,
+                admin_name=admin_name,
+                admin_email=admin_email,
+            )
+
+        with patch.object(import_module("candidate.migrations.0009_actor"), "BATCH_SIZE", 2):
+            apps = self.migrate(self.migrate_to)
+
+        NewStatusHistory = apps.get_model("candidate", "StatusHistory")
+        self.assertEqual(apps.get_model("candidate", "Actor").objects.count(), 2)
+        self.assertEqual(
+            sorted(NewStatusHistory.objects.values_list("actor__name", "actor__email"), key=str),
+            sorted(admins, key=str),
+        )
+
 
 class TestDepartmentChoices(TestCase):
     """Test Department choices."""
@@ -261,3 +348,94 @@ class TestApplicationStatusChoices(TestCase):
         self.assertEqual(ApplicationStatus.INTERVIEW_SCHEDULED, "interview_scheduled")
         self.assertEqual(ApplicationStatus.REJECTED, "rejected")
         self.assertEqual(ApplicationStatus.ACCEPTED, "accepted")
+
+
+class TestCodedChoicesMigration(MigrationTestCase):
+    """Test the migration storing departments and statuses as smallint codes."""
+
+    migrate_from = [("candidate", "0009_actor")]
+    migrate_to = [("candidate", "0010_coded_choices")]
+
+    def test_values_are_kept(self):
+        """Test every row reads back the department and statuses it had, stored as codes."""
+        apps = self.migrate(self.migrate_from)
+        candidate = self.create_candidate(
+            apps, 1, department=Department.FINANCE, current_status=ApplicationStatus.INTERVIEW_SCHEDULED
+        )
+        actor = apps.get_model("candidate", "Actor").objects.create(name="Admin")
+        apps.get_model("candidate", "StatusHistory").objects.create(
+            candidate=candidate,
+            previous_status=ApplicationStatus.UNDER_REVIEW,
+            new_status=ApplicationStatus.INTERVIEW_SCHEDULED,
+            actor=actor,
+        )
+
+        self.migrate(self.migrate_to)
+
+        migrated = Candidate.objects.get(pk=candidate.pk)
+        self.assertEqual(migrated.get_department_display(), "Finance")
+        self.assertEqual(migrated.current_status, ApplicationStatus.INTERVIEW_SCHEDULED)
+        history = StatusHistory.objects.get(candidate=migrated)
+        self.assertEqual(
+            (history.previous_status, history.new_status),
+            (ApplicationStatus.UNDER_REVIEW, ApplicationStatus.INTERVIEW_SCHEDULED),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT department, current_status FROM candidates")
+            self.assertEqual(cursor.fetchone(), (3, 3))
+
+    def test_rows_are_recoded_in_batches(self):
+        """Test rows spread over several batches are all recoded, and back when migrating backwards."""
+        apps = self.migrate(self.migrate_from)
+        rows = [
+            (Department.IT, ApplicationStatus.SUBMITTED),
+            (Department.HR, ApplicationStatus.REJECTED),
+            (Department.FINANCE, ApplicationStatus.ACCEPTED),
+        ]
+        candidates = [
+            self.create_candidate(apps, number, department=department, current_status=current_status)
+            for number, (department, current_status) in enumerate(rows)
+        ]
+        migration = import_module("candidate.migrations.0010_coded_choices")
+
+        with patch.object(migration, "BATCH_SIZE", 2):
+            self.migrate(self.migrate_to)
+        migrated = Candidate.objects.filter(pk__in=[candidate.pk for candidate in candidates])
+        self.assertEqual(sorted(migrated.values_list("department", "current_status")), sorted(rows))
+
+        with patch.object(migration, "BATCH_SIZE", 2):
+            apps = self.migrate(self.migrate_from)
+        OldCandidate = apps.get_model("candidate", "Candidate")
+        self.assertEqual(sorted(OldCandidate.objects.values_list("department", "current_status")), sorted(rows))
+
+
+class TestActorEmailMigration(MigrationTestCase):
+    """Test the migration storing missing actor emails as "" instead of NULL."""
+
+    migrate_from = [("candidate", "0010_coded_choices")]
+    migrate_to = [("candidate", "0011_actor_email_not_null")]
+
+    def test_actors_without_email_are_merged(self):
+        """Test actors of the same name without an email become one, keeping every history row."""
+        from candidate.transitions import get_actor
+
+        apps = self.migrate(self.migrate_from)
+        OldActor = apps.get_model("candidate", "Actor")
+        actors = [
+            OldActor.objects.create(name="Bob", email=None),
+            OldActor.objects.create(name="Bob", email=None),
+            OldActor.objects.create(name="Bob", email=""),
+            OldActor.objects.create(name="Bob", email="bob@example.com"),
+        ]
+        for number, actor in enumerate(actors):
+            apps.get_model("candidate", "StatusHistory").objects.create(
+                candidate=self.create_candidate(apps, number), new_status=ApplicationStatus.SUBMITTED, actor=actor
+            )
+
+        self.migrate(self.migrate_to)
+
+        self.assertEqual(sorted(Actor.objects.values_list("name", "email")), [("Bob", ""), ("Bob", "bob@example.com")])
+        self.assertEqual(StatusHistory.objects.filter(actor__email="").count(), 3)
+        self.assertEqual(get_actor("Bob", None), Actor.objects.get(name="Bob", email=""))
+        with self.assertRaises(IntegrityError):
+            Actor.objects.create(name="Bob", email="")
@@ -193,7 +193,7 @@ class TestAdminOnlyPermission(TestCase):
 
     def test_admin_actions_constant(self):
         """Test that admin_actions constant contains expected actions."""
-        expected_actions = {"list", "retrieve", "partial_update", "download_resume"}
+        expected_actions = {"list", "retrieve", "partial_update", "download_resume", "pipeline", "changes", "activity"}
         self.assertEqual(self.permission.admin_actions, expected_actions)
 
 
@@ -1,4 +1,5 @@
 from datetime import date
+from unittest.mock import patch
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
@@ -45,6 +46,95 @@ class TestCandidateSerializer(TestCase):
         # Check that status history was created
         self.assertTrue(StatusHistory.objects.filter(candidate=candidate).exists())
 
+    def test_candidate_registration_serializer_last_status_change(self):
+        """Test registration records the initial status change on the candidate row."""
+        resume_file = SimpleUploadedFile("test.pdf", b"test content", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(data={**self.candidate_data, "resume": resume_file})
+        self.assertTrue(serializer.is_valid())
+
+        candidate = serializer.save()
+        candidate.refresh_from_db()
+        history = StatusHistory.objects.get(candidate=candidate)
+        self.assertEqual(candidate.status_changed_at, history.created_at)
+        self.assertEqual(candidate.last_feedback_excerpt, "Application submitted successfully")
+        self.assertEqual(candidate.last_admin_email, "admin@hr-system.me")
+        self.assertEqual(candidate.history_count, 1)
+
+    def test_candidate_registration_serializer_resume_metadata(self):
+        """Test resume metadata is computed from the upload."""
+        resume_file = SimpleUploadedFile("test.pdf", b"%PDF-1.4 test content", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(data={**self.candidate_data, "resume": resume_file})
+        self.assertTrue(serializer.is_valid())
+
+        candidate = serializer.save()
+        self.assertEqual(candidate.resume_size, 21)
+        self.assertEqual(candidate.resume_content_type, "application/pdf")
+        self.assertEqual(len(candidate.resume_sha256), 64)
+        self.assertEqual(candidate.resume.read(), b"%PDF-1.4 test content")
+
+    def test_candidate_registration_serializer_does_not_parse_resume(self):
+        """Test the upload request leaves parsing the resume for its page count to the extraction task."""
+        resume_file = SimpleUploadedFile("test.pdf", b"%PDF-1.4 test content", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(data={**self.candidate_data, "resume": resume_file})
+        self.assertTrue(serializer.is_valid())
+
+        with patch("core.documents._count_pdf_pages") as mock_count_pages:
+            candidate = serializer.save()
+
+        mock_count_pages.assert_not_called()
+        self.assertIsNone(candidate.resume_page_count)
+
+    def test_candidate_registration_serializer_uninspectable_resume(self):
+        """Test a resume the inspector chokes on is accepted with empty metadata."""
+        resume_file = SimpleUploadedFile("test.pdf", b"%PDF-1.4 broken", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(data={**self.candidate_data, "resume": resume_file})
+        self.assertTrue(serializer.is_valid())
+
+        with patch("candidate.utils.inspect_document", side_effect=RecursionError("maximum recursion depth")):
+            candidate = serializer.save()
+
+        self.assertIsNone(candidate.resume_size)
+        self.assertEqual((candidate.resume_sha256, candidate.resume_content_type), ("", ""))
+        self.assertEqual(candidate.resume.read(), b"%PDF-1.4 broken")
+
+    def test_candidate_registration_serializer_duplicates_single_query(self):
+        """Test email and phone uniqueness is checked with one query."""
+        from candidate.tests.test_models import CandidateFactory
+
+        existing = CandidateFactory(phone="+1234567890")
+        resume_file = SimpleUploadedFile("test.pdf", b"test content", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(
+            data={**self.candidate_data, "email": existing.email, "resume": resume_file}
+        )
+
+        with self.assertNumQueries(1):
+            self.assertFalse(serializer.is_valid())
+        self.assertEqual(serializer.errors["email"], ["candidate with this email already exists."])
+        self.assertEqual(serializer.errors["phone"], ["candidate with this phone already exists."])
+
+    def test_candidate_registration_serializer_lost_race(self):
+        """Test a registration losing the uniqueness race fails cleanly without storing the resume."""
+        from rest_framework.exceptions import ValidationError
+
+        from candidate.models import Candidate
+        from candidate.tests.test_models import CandidateFactory
+
+        resume_file = SimpleUploadedFile("race.pdf", b"test content", content_type="application/pdf")
+        serializer = CandidateRegistrationSerializer(data={**self.candidate_data, "resume": resume_file})
+        self.assertTrue(serializer.is_valid())
+
+        # Another request registers the same email after validation passed
+        CandidateFactory(email=self.candidate_data["email"])
+
+        with patch("django.core.files.storage.FileSystemStorage.save") as mock_storage_save:
+            with self.assertRaises(ValidationError) as context:
+                serializer.save()
+
+        mock_storage_save.assert_not_called()
+        self.assertIn("email", context.exception.detail)
+        # The surrounding transaction is still usable
+        self.assertEqual(Candidate.objects.filter(email=self.candidate_data["email"]).count(), 1)
+
     def test_candidate_registration_serializer_invalid_email(self):
         """Test registration serializer with invalid email."""
         data = {**self.candidate_data, "email": "invalid-email"}
@@ -158,6 +248,51 @@ class TestCandidateSerializer(TestCase):
             StatusHistory.objects.filter(candidate=candidate, new_status=ApplicationStatus.UNDER_REVIEW).exists()
         )
 
+    def test_status_update_serializer_update_last_status_change(self):
+        """Test a status update refreshes the denormalized last change fields."""
+        from candidate.models import Candidate
+        from candidate.tests.test_models import CandidateFactory
+
+        candidate = CandidateFactory(current_status=ApplicationStatus.SUBMITTED, history_count=1)
+        validated_data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Strong profile. " * 30,
+            "admin_name": "Test Admin",
+            "admin_email": "admin@test.com",
+        }
+
+        StatusUpdateSerializer().update(candidate, validated_data)
+
+        stored = Candidate.objects.get(pk=candidate.pk)
+        self.assertEqual(stored.history_count, 2)
+        self.assertEqual(stored.last_admin_email, "admin@test.com")
+        self.assertEqual(len(stored.last_feedback_excerpt), 255)
+        self.assertTrue(stored.last_feedback_excerpt.startswith("Strong profile."))
+        self.assertEqual(stored.status_changed_at, candidate.status_changed_at)
+        self.assertEqual(candidate.history_count, 2)
+
+    def test_status_update_serializer_update_conflict(self):
+        """Test update refuses to apply a transition to a candidate whose status already moved."""
+        from candidate.models import Candidate
+        from candidate.tests.test_models import CandidateFactory
+        from candidate.transitions import TransitionConflict
+
+        candidate = CandidateFactory(current_status=ApplicationStatus.SUBMITTED)
+        Candidate.objects.filter(pk=candidate.pk).update(current_status=ApplicationStatus.REJECTED)
+        validated_data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Test feedback",
+            "admin_name": "Test Admin",
+            "admin_email": "admin@test.com",
+        }
+
+        with self.assertRaises(TransitionConflict):
+            StatusUpdateSerializer().update(candidate, validated_data)
+
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.current_status, ApplicationStatus.REJECTED)
+        self.assertFalse(StatusHistory.objects.filter(candidate=candidate).exists())
+
     def test_candidate_status_serializer_valid_email(self):
         """Test status serializer with valid email."""
         from candidate.tests.test_models import CandidateFactory
@@ -207,8 +342,10 @@ class TestCandidateSerializer(TestCase):
         request = RequestFactory().get("/")
         serializer = CandidateDetailSerializer(candidate, context={"request": request})
 
-        # Should return the resume URL since we have a real file
-        self.assertIn("resume_url", serializer.data)
+        self.assertEqual(serializer.data["resume_url"], f"http://testserver{candidate.resume.url}")
+        self.assertEqual(
+            serializer.data["resume_download_url"], f"http://testserver/api/v1/candidates/{candidate.pk}/resume/"
+        )
 
     def test_candidate_detail_serializer_get_resume_url_no_request(self):
         """Test get_resume_url method without request context."""
@@ -218,6 +355,7 @@ class TestCandidateSerializer(TestCase):
         serializer = CandidateDetailSerializer(candidate, context={})
 
         self.assertEqual(serializer.data["resume_url"], "")
+        self.assertEqual(serializer.data["resume_download_url"], "")
 
     def test_resume_download_serializer_get_download_url_with_resume(self):
         """Test get_download_url method with resume file."""
@@ -253,8 +391,8 @@ class TestStatusHistorySerializer(TestCase):
             previous_status=ApplicationStatus.SUBMITTED,
             new_status=ApplicationStatus.UNDER_REVIEW,
             feedback="Test feedback",
-            admin_name="Test Admin",
-            admin_email="admin@test.com",
+            actor__name="Test Admin",
+            actor__email="admin@test.com",
         )
 
     def test_status_history_serializer_valid_data(self):
@@ -0,0 +1,432 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+
+from candidate.models import ResumeText
+from candidate.tasks import extract_resume_text_task
+from candidate.tests.test_models import ActorFactory, CandidateFactory
+from core.documents import DOCX_CONTENT_TYPE
+from core.tests.test_documents import build_docx
+
+
+class TestExtractResumeTextTask(TestCase):
+    """Unit tests for the resume text extraction task."""
+
+    def setUp(self):
+        self.candidate = CandidateFactory()
+        self.candidate.resume.save(
+            "resume.docx", SimpleUploadedFile("resume.docx", build_docx("Kubernetes", "PostgreSQL tuning"))
+        )
+
+    def test_extract_resume_text_success(self):
+        """Test resume text is stored for the candidate."""
+        self.assertTrue(extract_resume_text_task(str(self.candidate.id)))
+
+        resume_text = ResumeText.objects.get(candidate=self.candidate)
+        self.assertEqual(resume_text.content, "Kubernetes\nPostgreSQL tuning")
+
+    def test_extract_resume_text_records_page_count(self):
+        """Test the page count, kept out of the upload request, is recorded by the extraction."""
+        from django.conf import settings
+
+        from candidate.models import Candidate
+
+        with patch("candidate.tasks.count_pages", return_value=2) as mock_count_pages:
+            extract_resume_text_task(str(self.candidate.id))
+
+        self.assertEqual(Candidate.objects.get(pk=self.candidate.pk).resume_page_count, 2)
+        self.assertEqual(mock_count_pages.call_args.kwargs["timeout"], settings.RESUME_TEXT_EXTRACTION_TIMEOUT)
+
+    def test_extract_resume_text_updates_existing(self):
+        """Test re-extraction replaces the stored text."""
+        ResumeText.objects.create(candidate=self.candidate, content="stale")
+
+        extract_resume_text_task(str(self.candidate.id))
+
+        self.assertEqual(ResumeText.objects.get(candidate=self.candidate).content, "Kubernetes\nPostgreSQL tuning")
+
+    def test_extract_resume_text_unsupported_file(self):
+        """Test unsupported files are not retried."""
+        candidate = CandidateFactory()
+
+        self.assertFalse(extract_resume_text_task(str(candidate.id)))
+        self.assertFalse(ResumeText.objects.filter(candidate=candidate).exists())
+
+    def test_extract_resume_text_missing_candidate(self):
+        """Test unknown candidates are skipped."""
+        self.assertFalse(extract_resume_text_task("00000000-0000-0000-0000-000000000000"))
+
+
+class TestBackfillResumeTextCommand(TestCase):
+    """Tests for the backfill_resume_text management command."""
+
+    def test_backfill_resume_text(self):
+        """Test resumes without text are extracted and failures are reported."""
+        candidate = CandidateFactory()
+        candidate.resume.save("resume.docx", SimpleUploadedFile("resume.docx", build_docx("Go developer")))
+        unsupported = CandidateFactory()
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("backfill_resume_text", workers=1, stdout=stdout, stderr=stderr)
+
+        self.assertEqual(ResumeText.objects.get(candidate=candidate).content, "Go developer")
+        self.assertFalse(ResumeText.objects.filter(candidate=unsupported).exists())
+        self.assertIn("1 extracted, 1 failed", stdout.getvalue())
+
+
+class TestResumeTextQueueing(TestCase):
+    """Tests for queuing extraction after registration."""
+
+    @patch("candidate.tasks.extract_resume_text_task.delay")
+    def test_registration_queues_extraction(self, mock_delay):
+        """Test a successful registration queues resume extraction."""
+        from candidate.utils import queue_resume_text_extraction
+
+        candidate = CandidateFactory()
+        queue_resume_text_extraction(candidate)
+
+        mock_delay.assert_called_once_with(str(candidate.id))
+
+
+class TestBackfillResumeMetadataCommand(TestCase):
+    """Tests for the backfill_resume_metadata management command."""
+
+    def test_backfill_resume_metadata(self):
+        """Test stored resumes get their size, hash and type populated."""
+        candidate = CandidateFactory()
+        candidate.resume.save("resume.docx", SimpleUploadedFile("resume.docx", build_docx("Go developer")))
+
+        call_command("backfill_resume_metadata", stdout=StringIO())
+
+        candidate.refresh_from_db()
+        self.assertEqual(candidate.resume_size, candidate.resume.size)
+        self.assertEqual(len(candidate.resume_sha256), 64)
+        self.assertEqual(candidate.resume_content_type, DOCX_CONTENT_TYPE)
+        self.assertIsNone(candidate.resume_page_count)
+
+
+class TestBackfillStatusFieldsCommand(TestCase):
+    """Tests for the backfill_status_fields management command."""
+
+    def test_backfill_status_fields(self):
+        """Test candidates get their last status change fields from the newest history entry."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from candidate.models import ApplicationStatus, Candidate, StatusHistory
+
+        candidates = [CandidateFactory() for _ in range(3)]
+        for candidate in candidates[:2]:
+            StatusHistory.objects.create(
+                candidate=candidate, new_status=ApplicationStatus.SUBMITTED, feedback="New", actor=ActorFactory()
+            )
+            with patch("django.utils.timezone.now", return_value=timezone.now() + timedelta(minutes=5)):
+                latest = StatusHistory.objects.create(
+                    candidate=candidate,
+                    previous_status=ApplicationStatus.SUBMITTED,
+                    new_status=ApplicationStatus.UNDER_REVIEW,
+                    feedback="Reviewing",
+                    actor=ActorFactory(name="Alice", email="alice@example.com"),
+                )
+
+        out = StringIO()
+        call_command("backfill_status_fields", batch_size=1, stdout=out)
+
+        self.assertIn("2 candidates updated", out.getvalue())
+        candidate = Candidate.objects.get(pk=candidates[1].pk)
+        self.assertEqual(candidate.status_changed_at, latest.created_at)
+        self.assertEqual(candidate.last_feedback_excerpt, "Reviewing")
+        self.assertEqual(candidate.last_admin_email, "alice@example.com")
+        self.assertEqual(candidate.history_count, 2)
+        self.assertIsNone(Candidate.objects.get(pk=candidates[2].pk).status_changed_at)
+
+
+class TestMeasureStatusStorageCommand(TestCase):
+    """Unit tests for the storage measurement command."""
+
+    def test_requires_postgresql(self):
+        """Test the command refuses to run without PostgreSQL statistics."""
+        from django.core.management.base import CommandError
+
+        with self.assertRaises(CommandError):
+            call_command("measure_status_storage", stdout=StringIO())
+
+
+class TestAdminDigestTask(TestCase):
+    """Unit tests for the admin digest task."""
+
+    def setUp(self):
+        from candidate.models import ApplicationStatus, StatusHistory
+
+        self.candidates = [CandidateFactory(department=department) for department in ("it", "it", "hr")]
+        for candidate in self.candidates:
+            StatusHistory.objects.create(
+                candidate=candidate,
+                new_status=ApplicationStatus.SUBMITTED,
+                actor=ActorFactory(name="System", email="system@example.com"),
+            )
+        for candidate, admin in zip(self.candidates, ["alice@example.com", "alice@example.com", "bob@example.com"]):
+            StatusHistory.objects.create(
+                candidate=candidate,
+                previous_status=ApplicationStatus.SUBMITTED,
+                new_status=ApplicationStatus.UNDER_REVIEW,
+                actor=ActorFactory(name=admin.split("@")[0].title(), email=admin),
+            )
+
+    def test_digest_per_admin(self):
+        """Test one digest is queued per active admin with shared and personal counts."""
+        from candidate.tasks import send_admin_digest_task
+        from core.models import EmailOutbox
+
+        self.assertEqual(send_admin_digest_task(), 2)
+
+        digests = {email.recipient_email: email for email in EmailOutbox.objects.filter(template_name="admin_digest")}
+        self.assertEqual(set(digests), {"alice@example.com", "bob@example.com"})
+        alice = digests["alice@example.com"]
+        self.assertEqual(alice.recipient_name, "Alice")
+        self.assertEqual(alice.queue, EmailOutbox.Queue.BULK)
+        self.assertEqual(alice.context["registrations_total"], 3)
+        self.assertEqual(
+            alice.context["registrations"],
+            [{"department": "Information Technology", "count": 2}, {"department": "Human Resources", "count": 1}],
+        )
+        self.assertEqual(alice.context["transitions"], [{"status": "Under Review", "count": 3}])
+        self.assertEqual(alice.context["own_transitions_total"], 2)
+        self.assertEqual(digests["bob@example.com"].context["own_transitions_total"], 1)
+
+    def test_digest_skips_system_actor(self):
+        """Test automatic transitions are counted but the system actor gets no digest."""
+        from candidate.models import ApplicationStatus, StatusHistory
+        from candidate.tasks import send_admin_digest_task
+        from core.models import EmailOutbox
+
+        StatusHistory.objects.create(
+            candidate=self.candidates[0],
+            previous_status=ApplicationStatus.UNDER_REVIEW,
+            new_status=ApplicationStatus.REJECTED,
+            actor=ActorFactory(name="System", email="admin@hr-system.me"),
+        )
+
+        self.assertEqual(send_admin_digest_task(), 2)
+        self.assertFalse(EmailOutbox.objects.filter(recipient_email="admin@hr-system.me").exists())
+        alice = EmailOutbox.objects.get(recipient_email="alice@example.com")
+        self.assertIn({"status": "Rejected", "count": 1}, alice.context["transitions"])
+
+    def test_digest_uses_aggregate_queries(self):
+        """Test the digest is built with a fixed number of queries."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from candidate.utils import build_admin_digests
+
+        now = timezone.now()
+        with self.assertNumQueries(3):
+            build_admin_digests(now - timedelta(days=1), now + timedelta(seconds=1))
+
+    def test_digest_watermark(self):
+        """Test activity is reported once and quiet periods send nothing."""
+        from candidate.tasks import send_admin_digest_task
+        from core.models import TaskWatermark
+
+        send_admin_digest_task()
+        watermark = TaskWatermark.objects.get(name="admin-digest").value
+
+        self.assertEqual(send_admin_digest_task(), 0)
+        self.assertGreater(TaskWatermark.objects.get(name="admin-digest").value, watermark)
+
+    def test_digest_renders(self):
+        """Test the digest renders through the notification templates."""
+        from candidate.tasks import send_admin_digest_task
+        from core.models import EmailOutbox
+        from core.notification_service import NotificationService
+
+        send_admin_digest_task()
+        email = EmailOutbox.objects.get(recipient_email="alice@example.com")
+
+        html_message, plain_message = NotificationService.render_email("admin_digest", email.context)
+        self.assertIn("• Information Technology: 2", plain_message)
+        self.assertIn("YOUR STATUS CHANGES: 2", plain_message)
+        self.assertIn("Under Review", html_message)
+
+
+class TestAutoTransitionsTask(TestCase):
+    """Unit tests for the scheduled auto-transition rules."""
+
+    def setUp(self):
+        from candidate.models import ApplicationStatus, AutoTransitionRule
+
+        self.rule = AutoTransitionRule.objects.create(
+            name="Reject stale IT applications",
+            from_status=ApplicationStatus.SUBMITTED,
+            to_status=ApplicationStatus.REJECTED,
+            department="it",
+            after_days=60,
+            feedback="We have moved forward with other candidates.",
+        )
+        self.stale = [self.create_candidate(days=90) for _ in range(3)]
+        self.recent = self.create_candidate(days=10)
+        self.other_department = self.create_candidate(days=90, department="hr")
+        self.other_status = self.create_candidate(days=90, current_status=ApplicationStatus.UNDER_REVIEW)
+
+    @staticmethod
+    def create_candidate(days, department="it", **kwargs):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from candidate.models import Candidate
+
+        candidate = CandidateFactory(department=department, **kwargs)
+        Candidate.objects.filter(pk=candidate.pk).update(created_at=timezone.now() - timedelta(days=days))
+        return candidate
+
+    def assert_statuses(self, candidates, status):
+        from candidate.models import Candidate
+
+        statuses = Candidate.objects.filter(pk__in=[candidate.pk for candidate in candidates]).values_list(
+            "current_status", flat=True
+        )
+        self.assertEqual(list(statuses), [status] * len(candidates))
+
+    def test_rule_moves_matching_candidates(self):
+        """Test only candidates matching status, department and age are moved, with history and email."""
+        from candidate.models import ApplicationStatus, Candidate, StatusHistory
+        from candidate.tasks import apply_auto_transitions_task
+        from core.models import EmailOutbox
+
+        self.assertEqual(apply_auto_transitions_task(), 3)
+
+        self.assert_statuses(self.stale, ApplicationStatus.REJECTED)
+        self.assert_statuses([self.recent, self.other_department], ApplicationStatus.SUBMITTED)
+        self.assert_statuses([self.other_status], ApplicationStatus.UNDER_REVIEW)
+
+        history = StatusHistory.objects.filter(new_status=ApplicationStatus.REJECTED)
+        self.assertEqual(history.count(), 3)
+        moved = Candidate.objects.filter(pk__in=[candidate.pk for candidate in self.stale])
+        self.assertEqual(set(moved.values_list("history_count", "last_admin_email")), {(1, "admin@hr-system.me")})
+        self.assertEqual(set(history.values_list("actor__name", flat=True)), {"System"})
+        self.assertEqual(set(history.values_list("feedback", flat=True)), {self.rule.feedback})
+
+        emails = EmailOutbox.objects.filter(template_name="status_update")
+        self.assertEqual(sorted(emails.values_list("recipient_email", flat=True)), sorted(c.email for c in self.stale))
+        self.assertEqual(set(emails.values_list("queue", flat=True)), {EmailOutbox.Queue.BULK})
+
+        # Nothing left to move on the next run.
+        self.assertEqual(apply_auto_transitions_task(), 0)
+
+    def test_rule_applies_in_batches(self):
+        """Test candidates are moved one batch per transaction until none match."""
+        from django.test import override_settings
+
+        from candidate.models import ApplicationStatus, StatusHistory
+        from candidate.tasks import apply_auto_transitions_task
+
+        bulk_create = StatusHistory.objects.bulk_create
+        with override_settings(AUTO_TRANSITION_BATCH_SIZE=2), patch.object(
+            StatusHistory.objects, "bulk_create", wraps=bulk_create
+        ) as mock_bulk_create:
+            self.assertEqual(apply_auto_transitions_task(), 3)
+
+        self.assertEqual([len(call.args[0]) for call in mock_bulk_create.call_args_list], [2, 1])
+        self.assert_statuses(self.stale, ApplicationStatus.REJECTED)
+
+    def test_emails_are_queued_once_per_batch(self):
+        """Test each batch queues its emails with one bulk insert and merges pending ones in bulk."""
+        from django.test import override_settings
+
+        from candidate.models import ApplicationStatus
+        from candidate.transitions import apply_auto_transition
+        from candidate.utils import send_status_update_email
+        from core.models import EmailOutbox
+
+        with override_settings(EMAIL_STATUS_COALESCE_WINDOW=300):
+            send_status_update_email(self.stale[0], ApplicationStatus.SUBMITTED, ApplicationStatus.SUBMITTED, {})
+            bulk_create = EmailOutbox.objects.bulk_create
+            with patch.object(EmailOutbox.objects, "bulk_create", wraps=bulk_create) as mock_bulk_create:
+                self.assertEqual(apply_auto_transition(self.rule, batch_size=2), 3)
+
+        self.assertEqual([len(call.args[0]) for call in mock_bulk_create.call_args_list], [1, 1])
+        emails = EmailOutbox.objects.filter(template_name="status_update")
+        self.assertEqual(emails.count(), 3)
+        merged = emails.get(recipient_email=self.stale[0].email)
+        self.assertEqual(merged.context["new_status"], ApplicationStatus.REJECTED)
+        self.assertEqual(len(merged.context["intermediate_updates"]), 1)
+
+    def test_batches_are_stamped_with_their_own_time(self):
+        """Test moved candidates carry the time of their batch, not the time the run started."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from candidate.models import Candidate, StatusHistory
+        from candidate.transitions import apply_auto_transition
+
+        started = timezone.now() - timedelta(minutes=30)
+        self.assertEqual(apply_auto_transition(self.rule, now=started, batch_size=2), 3)
+
+        moved = Candidate.objects.filter(pk__in=[candidate.pk for candidate in self.stale])
+        for updated_at, status_changed_at in moved.values_list("updated_at", "status_changed_at"):
+            self.assertEqual(updated_at, status_changed_at)
+            self.assertGreater(status_changed_at, started + timedelta(minutes=29))
+        self.assertFalse(StatusHistory.objects.filter(created_at__lt=started + timedelta(minutes=29)).exists())
+
+    def test_moves_are_published_on_commit(self):
+        """Test every auto-transitioned candidate is published to the status streams after its batch commits."""
+        from candidate.models import ApplicationStatus
+        from candidate.tasks import apply_auto_transitions_task
+
+        with patch("core.broadcast.InMemoryBroker.publish") as mock_publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                apply_auto_transitions_task()
+            mock_publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        events = [call.args[0] for call in mock_publish.call_args_list]
+        self.assertEqual(sorted(event["candidate_id"] for event in events), sorted(str(c.pk) for c in self.stale))
+        self.assertEqual(
+            {(event["previous_status"], event["new_status"]) for event in events},
+            {(ApplicationStatus.SUBMITTED, ApplicationStatus.REJECTED)},
+        )
+
+    def test_inactive_and_invalid_rules_are_skipped(self):
+        """Test inactive rules and rules the workflow does not allow do nothing."""
+        from candidate.models import ApplicationStatus, AutoTransitionRule
+        from candidate.tasks import apply_auto_transitions_task
+
+        self.rule.is_active = False
+        self.rule.save()
+        AutoTransitionRule.objects.create(
+            name="Invalid",
+            from_status=ApplicationStatus.SUBMITTED,
+            to_status=ApplicationStatus.ACCEPTED,
+            after_days=1,
+        )
+
+        self.assertEqual(apply_auto_transitions_task(), 0)
+        self.assert_statuses(self.stale, ApplicationStatus.SUBMITTED)
+
+    def test_rule_outside_workflow_moves_nothing(self):
+        """Test the workflow is applied in the bulk update even when a rule bypasses validation."""
+        from candidate.models import ApplicationStatus
+        from candidate.transitions import apply_auto_transition
+
+        self.rule.to_status = ApplicationStatus.ACCEPTED
+        self.rule.save()
+
+        self.assertEqual(apply_auto_transition(self.rule), 0)
+        self.assert_statuses(self.stale, ApplicationStatus.SUBMITTED)
+
+    def test_rule_validation(self):
+        """Test a rule with a transition the workflow does not allow fails validation."""
+        from django.core.exceptions import ValidationError
+
+        self.rule.to_status = "accepted"
+
+        with self.assertRaises(ValidationError):
+            self.rule.full_clean()
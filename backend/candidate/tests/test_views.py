@@ -42,6 +42,57 @@ class TestCandidateAPI(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+    def test_candidate_registration_idempotency_key_replay(self):
+        """Test a retried registration with the same Idempotency-Key is replayed."""
+        from unittest.mock import patch
+
+        from candidate.models import Candidate, Department
+
+        data = {
+            "full_name": self.faker.name(),
+            "email": self.faker.email(),
+            "phone": "+1234567890",
+            "date_of_birth": "1990-01-01",
+            "years_of_experience": 5,
+            "department": Department.IT,
+            "resume": SimpleUploadedFile("test.pdf", b"test content", content_type="application/pdf"),
+        }
+
+        first = self.client.post("/api/v1/candidates/", data, format="multipart", HTTP_IDEMPOTENCY_KEY="retry-1")
+        data["resume"].seek(0)
+        with patch("candidate.views.CandidateViewSet._register") as mock_register:
+            replay = self.client.post("/api/v1/candidates/", data, format="multipart", HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.json()["id"], first.json()["id"])
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        mock_register.assert_not_called()
+        self.assertEqual(Candidate.objects.filter(email=data["email"]).count(), 1)
+
+    def test_candidate_registration_idempotency_key_reused_for_other_body(self):
+        """Test an Idempotency-Key reused with a different body is rejected instead of replaying another response."""
+        from candidate.models import Candidate, Department
+
+        data = {
+            "full_name": self.faker.name(),
+            "email": self.faker.email(),
+            "phone": "+1234567890",
+            "date_of_birth": "1990-01-01",
+            "years_of_experience": 5,
+            "department": Department.IT,
+            "resume": SimpleUploadedFile("test.pdf", b"test content", content_type="application/pdf"),
+        }
+        self.client.post("/api/v1/candidates/", data, format="multipart", HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        data["email"] = self.faker.email()
+        data["resume"].seek(0)
+        response = self.client.post("/api/v1/candidates/", data, format="multipart", HTTP_IDEMPOTENCY_KEY="retry-1")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertNotIn("id", response.json())
+        self.assertFalse(Candidate.objects.filter(email=data["email"]).exists())
+
     def test_candidate_registration_invalid_data(self):
         """Test candidate registration with invalid data."""
         from candidate.models import Department
@@ -102,6 +153,115 @@ class TestCandidateAPI(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_candidate_status_update_queues_email_in_outbox(self):
+        """Test a status update writes its notification to the outbox instead of the broker."""
+        from unittest.mock import patch
+
+        from core.models import EmailOutbox
+
+        data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Moving to review phase",
+            "admin_name": "Admin User",
+            "admin_email": "admin@example.com",
+        }
+
+        with patch("core.tasks.send_email_task.delay") as mock_delay:
+            response = self.client.patch(
+                f"/api/v1/candidates/{self.candidate1.id}/", data, format="json", HTTP_X_ADMIN="1"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_delay.assert_not_called()
+        email = EmailOutbox.objects.get(recipient_email=self.candidate1.email)
+        self.assertEqual(email.template_name, "status_update")
+        self.assertEqual(email.context["new_status"], ApplicationStatus.UNDER_REVIEW)
+        self.assertEqual(email.queue, EmailOutbox.Queue.TRANSACTIONAL)
+        self.assertIsNone(email.dispatched_at)
+
+    def test_rapid_status_updates_are_coalesced(self):
+        """Test status changes inside the coalescing window produce one email with the latest status."""
+        from django.test import override_settings
+
+        from core.models import EmailOutbox
+
+        updates = [
+            (ApplicationStatus.UNDER_REVIEW, "Moving to review phase"),
+            (ApplicationStatus.INTERVIEW_SCHEDULED, "Interview on Monday"),
+        ]
+        with override_settings(EMAIL_STATUS_COALESCE_WINDOW=60):
+            for new_status, feedback in updates:
+                data = {
+                    "new_status": new_status,
+                    "feedback": feedback,
+                    "admin_name": "Admin User",
+                    "admin_email": "admin@example.com",
+                }
+                response = self.client.patch(
+                    f"/api/v1/candidates/{self.candidate1.id}/", data, format="json", HTTP_X_ADMIN="1"
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        email = EmailOutbox.objects.get(recipient_email=self.candidate1.email)
+        self.assertEqual(email.context["previous_status"], ApplicationStatus.SUBMITTED)
+        self.assertEqual(email.context["new_status"], ApplicationStatus.INTERVIEW_SCHEDULED)
+        self.assertEqual(email.context["feedback"], "Interview on Monday")
+        self.assertEqual(
+            [(update["new_status"], update["feedback"]) for update in email.context["intermediate_updates"]],
+            [(ApplicationStatus.UNDER_REVIEW, "Moving to review phase")],
+        )
+        self.assertIn("Interview Scheduled", email.subject)
+        self.assertGreater(email.available_at, email.created_at)
+
+    def test_candidate_status_update_rollback_discards_email(self):
+        """Test a failed status update does not leave an email behind."""
+        from unittest.mock import patch
+
+        from core.models import EmailOutbox
+
+        data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Moving to review phase",
+            "admin_name": "Admin User",
+            "admin_email": "admin@example.com",
+        }
+
+        with patch("candidate.views.send_status_update_email", side_effect=RuntimeError("outbox unavailable")):
+            with self.assertRaises(RuntimeError):
+                self.client.patch(f"/api/v1/candidates/{self.candidate1.id}/", data, format="json", HTTP_X_ADMIN="1")
+
+        self.candidate1.refresh_from_db()
+        self.assertEqual(self.candidate1.current_status, ApplicationStatus.SUBMITTED)
+        self.assertFalse(EmailOutbox.objects.exists())
+
+    def test_candidate_status_update_conflict(self):
+        """Test a status update validated against a status that changed meanwhile returns 409."""
+        from unittest.mock import patch
+
+        from candidate.models import Candidate
+        from candidate.views import CandidateViewSet
+        from core.models import EmailOutbox
+
+        data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Moving to review phase",
+            "admin_name": "Admin User",
+            "admin_email": "admin@example.com",
+        }
+        stale = Candidate.objects.get(pk=self.candidate1.pk)
+        Candidate.objects.filter(pk=self.candidate1.pk).update(current_status=ApplicationStatus.REJECTED)
+
+        with patch.object(CandidateViewSet, "get_object", return_value=stale):
+            response = self.client.patch(
+                f"/api/v1/candidates/{self.candidate1.id}/", data, format="json", HTTP_X_ADMIN="1"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["detail"].code, "status_conflict")
+        self.candidate1.refresh_from_db()
+        self.assertEqual(self.candidate1.current_status, ApplicationStatus.REJECTED)
+        self.assertFalse(EmailOutbox.objects.exists())
+
     def test_candidate_status_update_invalid_transition(self):
         """Test candidate status update with invalid transition."""
         data = {
@@ -115,12 +275,105 @@ class TestCandidateAPI(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_workflow_transitions_metadata(self):
+        """Test the workflow metadata is public and cacheable, and revalidates with its ETag."""
+        from candidate.workflow import APPLICATION_WORKFLOW
+
+        response = self.client.get("/api/v1/workflow/transitions/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["version"], APPLICATION_WORKFLOW.version)
+        self.assertEqual(response.data["transitions"][ApplicationStatus.SUBMITTED], ["under_review", "rejected"])
+        self.assertIn("max-age=3600", response["Cache-Control"])
+
+        revalidated = self.client.get("/api/v1/workflow/transitions/", HTTP_IF_NONE_MATCH=response["ETag"])
+
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated["ETag"], response["ETag"])
+
+    def test_candidate_pipeline_as_of(self):
+        """Test the pipeline endpoint counts candidates per status at a point in time."""
+        from candidate.tests.test_models import StatusHistoryFactory
+
+        for candidate in (self.candidate1, self.candidate2):
+            StatusHistoryFactory(candidate=candidate, new_status=ApplicationStatus.SUBMITTED)
+
+        response = self.client.get("/api/v1/candidates/pipeline/", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["statuses"][ApplicationStatus.SUBMITTED], 2)
+
+        response = self.client.get("/api/v1/candidates/pipeline/?as_of=2020-01-01", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sum(response.data["statuses"].values()), 0)
+
+        for as_of in ["yesterday", "2026-01-01T25:00", "2026-02-30"]:
+            with self.subTest(as_of=as_of):
+                response = self.client.get("/api/v1/candidates/pipeline/", {"as_of": as_of}, HTTP_X_ADMIN="1")
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get("/api/v1/candidates/pipeline/?department=marketing", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get("/api/v1/candidates/pipeline/")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_candidate_filtering_by_stale_days(self):
+        """Test the stale filter and ordering by the last status change."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from candidate.models import Candidate
+
+        Candidate.objects.filter(pk=self.candidate1.pk).update(status_changed_at=timezone.now() - timedelta(days=40))
+        Candidate.objects.filter(pk=self.candidate2.pk).update(status_changed_at=timezone.now() - timedelta(days=2))
+
+        response = self.client.get("/api/v1/candidates/?stale_days=30", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.data["results"]], [str(self.candidate1.id)])
+
+        for value in ["-1", "1e10", "99999999999999", "1.5"]:
+            response = self.client.get(f"/api/v1/candidates/?stale_days={value}", HTTP_X_ADMIN="1")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, value)
+
+        response = self.client.get("/api/v1/candidates/?ordering=-status_changed_at", HTTP_X_ADMIN="1")
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], [str(self.candidate2.id), str(self.candidate1.id)]
+        )
+
     def test_candidate_filtering_by_status(self):
         """Test candidate filtering by status."""
         response = self.client.get(f"/api/v1/candidates/?status={ApplicationStatus.SUBMITTED}", HTTP_X_ADMIN="1")
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_candidate_filtering_by_resume_text(self):
+        """Test candidate filtering by extracted resume content."""
+        from candidate.models import ResumeText
+
+        ResumeText.objects.create(candidate=self.candidate1, content="Django and PostgreSQL")
+        ResumeText.objects.create(candidate=self.candidate2, content="Spring Boot")
+
+        response = self.client.get("/api/v1/candidates/?resume_text=postgresql", HTTP_X_ADMIN="1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(self.candidate1.id)])
+
+    def test_candidate_filtering_by_resume_metadata(self):
+        """Test candidate filtering by precomputed resume metadata."""
+        from candidate.models import Candidate
+
+        Candidate.objects.filter(pk=self.candidate1.pk).update(resume_size=2048, resume_content_type="application/pdf")
+        Candidate.objects.filter(pk=self.candidate2.pk).update(resume_size=512, resume_content_type="application/pdf")
+
+        response = self.client.get(
+            "/api/v1/candidates/?resume_content_type=application/pdf&resume_size_min=1024", HTTP_X_ADMIN="1"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data["results"]], [str(self.candidate1.id)])
+        self.assertEqual(response.data["results"][0]["resume_size"], 2048)
+
     def test_candidate_filtering_by_department(self):
         """Test candidate filtering by department."""
         response = self.client.get(f"/api/v1/candidates/?department={self.candidate1.department}", HTTP_X_ADMIN="1")
@@ -395,6 +648,73 @@ class TestStatusHistoryAPI(APITestCase):
         # May get 200 or 429 due to rate limiting
         self.assertIn(response.status_code, [200, 429])
 
+    def test_status_history_ordering_by_status_is_alphabetical(self):
+        """Test statuses stored as codes still sort by their values."""
+        from candidate.tests.test_models import StatusHistoryFactory
+
+        for new_status in ApplicationStatus.values:
+            StatusHistoryFactory(candidate=self.candidate, new_status=new_status)
+
+        response = self.client.get("/api/v1/status-history/?ordering=new_status&page_size=100", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [row["new_status"] for row in response.data["results"]]
+        self.assertEqual(statuses, sorted(statuses))
+        self.assertEqual(set(statuses), set(ApplicationStatus.labels))
+
+        response = self.client.get("/api/v1/status-history/?ordering=-new_status&page_size=100", HTTP_X_ADMIN="1")
+        statuses = [row["new_status"] for row in response.data["results"]]
+        self.assertEqual(statuses, sorted(statuses, reverse=True))
+
+    def test_status_history_filtering_by_admin(self):
+        """Test status history filtering by exact admin email and by admin name."""
+        from candidate.tests.test_models import StatusHistoryFactory
+
+        StatusHistoryFactory(
+            candidate=self.candidate,
+            new_status=ApplicationStatus.UNDER_REVIEW,
+            actor__name="Jane Auditor",
+            actor__email="jane@example.com",
+        )
+
+        response = self.client.get("/api/v1/status-history/?admin_email=jane@example.com", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+        response = self.client.get("/api/v1/status-history/?admin_email=jane@example", HTTP_X_ADMIN="1")
+        self.assertEqual(response.data["count"], 0)
+
+        response = self.client.get("/api/v1/status-history/?admin_name=auditor", HTTP_X_ADMIN="1")
+        self.assertEqual(response.data["count"], 1)
+
+    def test_status_history_activity(self):
+        """Test the per-admin activity summary honours the list filters."""
+        from candidate.tests.test_models import StatusHistoryFactory
+
+        for admin_email in ["jane@example.com", "jane@example.com", "john@example.com"]:
+            StatusHistoryFactory(
+                candidate=self.candidate,
+                new_status=ApplicationStatus.UNDER_REVIEW,
+                actor__name="Admin",
+                actor__email=admin_email,
+            )
+
+        response = self.client.get("/api/v1/status-history/activity/", HTTP_X_ADMIN="1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["admin_email"], "jane@example.com")
+        self.assertEqual(response.data["results"][0]["changes"], 2)
+
+        response = self.client.get(
+            "/api/v1/status-history/activity/?admin_email=john@example.com&created_after=2000-01-01T00:00:00Z",
+            HTTP_X_ADMIN="1",
+        )
+        self.assertEqual([row["admin_email"] for row in response.data["results"]], ["john@example.com"])
+
+    def test_status_history_activity_unauthorized_access(self):
+        """Test the activity summary without admin access."""
+        response = self.client.get("/api/v1/status-history/activity/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
     def test_status_history_viewset_documentation(self):
         """Test StatusHistoryViewSet documentation."""
         from candidate.views import StatusHistoryViewSet
@@ -404,6 +724,160 @@ class TestStatusHistoryAPI(APITestCase):
         self.assertIn("admin only", doc)
 
 
+class TestStatusEventsAPI(APITestCase):
+    """Tests for the Server-Sent Events streams of status changes."""
+
+    def setUp(self):
+        from candidate.tests.test_models import CandidateFactory
+
+        self.client = APIClient()
+        self.candidate = CandidateFactory()
+
+    def read_stream(self, view, path, headers=None, publish=None):
+        """Call an SSE view and return its response and the chunks streamed before and after `publish`."""
+        import json
+
+        from asgiref.sync import async_to_sync
+        from django.test import AsyncRequestFactory
+
+        from core.broadcast import get_broker
+
+        async def run():
+            response = await view(AsyncRequestFactory().get(path, headers=headers))
+            if response.status_code != 200:
+                return response, json.loads(response.content)
+            stream = aiter(response.streaming_content)
+            try:
+                chunks = [await anext(stream)]
+                if publish:
+                    get_broker().publish(publish)
+                    chunks.append(await anext(stream))
+                return response, [chunk.decode() for chunk in chunks]
+            finally:
+                await stream.aclose()
+
+        return async_to_sync(run)()
+
+    def status_event(self, candidate_id):
+        return {
+            "history_id": "42",
+            "candidate_id": str(candidate_id),
+            "previous_status": ApplicationStatus.SUBMITTED,
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "changed_at": "2026-10-19T12:00:00+00:00",
+        }
+
+    def test_candidate_stream_receives_its_status_changes(self):
+        """Test the public stream pushes status changes of the candidate with the given email."""
+        from candidate.models import Candidate
+        from candidate.views import candidate_status_events
+
+        candidate_id = Candidate.objects.get(pk=self.candidate.pk).id
+        response, chunks = self.read_stream(
+            candidate_status_events,
+            f"/api/v1/candidates/status/events/?email={self.candidate.email}",
+            publish=self.status_event(candidate_id),
+        )
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertEqual(response["Cache-Control"], "no-cache")
+        self.assertEqual(chunks[0], "retry: 5000\n\n")
+        self.assertTrue(chunks[1].startswith("id: 42\nevent: status_change\ndata: "))
+        self.assertIn(ApplicationStatus.UNDER_REVIEW, chunks[1])
+
+    def test_candidate_stream_sends_heartbeat_when_idle(self):
+        """Test an idle stream sends a comment line instead of closing."""
+        from django.test import override_settings
+
+        from candidate.views import candidate_status_events
+
+        with override_settings(SSE_HEARTBEAT_INTERVAL=0.01):
+            _, chunks = self.read_stream(
+                candidate_status_events,
+                f"/api/v1/candidates/status/events/?email={self.candidate.email}",
+                publish=self.status_event("another-candidate"),
+            )
+
+        self.assertEqual(chunks[1], ": keepalive\n\n")
+
+    def test_candidate_stream_requires_known_email(self):
+        """Test the public stream rejects a missing or unknown email."""
+        from candidate.views import candidate_status_events
+
+        response, data = self.read_stream(candidate_status_events, "/api/v1/candidates/status/events/")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("email", data)
+
+        response, data = self.read_stream(
+            candidate_status_events, "/api/v1/candidates/status/events/?email=nobody@example.com"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_stream_receives_every_status_change(self):
+        """Test the admin stream pushes status changes of all candidates."""
+        from candidate.views import status_events
+
+        response, chunks = self.read_stream(
+            status_events,
+            "/api/v1/status-history/events/",
+            headers={"X-ADMIN": "1"},
+            publish=self.status_event("any-candidate"),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("any-candidate", chunks[1])
+
+    def test_admin_stream_unauthorized_access(self):
+        """Test the admin stream without admin access."""
+        from candidate.views import status_events
+
+        response, _ = self.read_stream(status_events, "/api/v1/status-history/events/")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_streams_are_refused_outside_asgi(self):
+        """Test the streams are not served by the WSGI app, where they would hold a worker forever."""
+        from asgiref.sync import async_to_sync
+        from django.test import RequestFactory
+
+        from candidate.views import candidate_status_events, status_events
+
+        for view, path in [
+            (candidate_status_events, f"/api/v1/candidates/status/events/?email={self.candidate.email}"),
+            (status_events, "/api/v1/status-history/events/"),
+        ]:
+            with self.subTest(path=path):
+                response = async_to_sync(view)(RequestFactory().get(path, headers={"X-ADMIN": "1"}))
+                self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    def test_status_update_publishes_event_on_commit(self):
+        """Test a status update is published to the streams once its transaction commits."""
+        from unittest.mock import patch
+
+        data = {
+            "new_status": ApplicationStatus.UNDER_REVIEW,
+            "feedback": "Moving to review phase",
+            "admin_name": "Admin User",
+            "admin_email": "admin@example.com",
+        }
+
+        with patch("core.broadcast.InMemoryBroker.publish") as mock_publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                response = self.client.patch(
+                    f"/api/v1/candidates/{self.candidate.id}/", data, format="json", HTTP_X_ADMIN="1"
+                )
+            mock_publish.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_publish.assert_called_once()
+        event = mock_publish.call_args.args[0]
+        self.assertEqual(event["candidate_id"], str(self.candidate.id))
+        self.assertEqual(event["previous_status"], ApplicationStatus.SUBMITTED)
+        self.assertEqual(event["new_status"], ApplicationStatus.UNDER_REVIEW)
+
+
 class TestViewPerformance(APITestCase):
     """Test view performance optimizations."""
 
@@ -0,0 +1,67 @@
+from django.test import TestCase
+
+from candidate.models import ApplicationStatus, Candidate
+from candidate.tests.test_models import CandidateFactory
+from candidate.workflow import APPLICATION_WORKFLOW, Workflow
+
+
+class TestWorkflow(TestCase):
+    """Unit tests for the compiled status workflow."""
+
+    def test_can_transition(self):
+        """Test single transitions are checked against the workflow definition."""
+        self.assertTrue(
+            APPLICATION_WORKFLOW.can_transition(ApplicationStatus.SUBMITTED, ApplicationStatus.UNDER_REVIEW)
+        )
+        self.assertFalse(APPLICATION_WORKFLOW.can_transition(ApplicationStatus.SUBMITTED, ApplicationStatus.ACCEPTED))
+        self.assertFalse(APPLICATION_WORKFLOW.can_transition(ApplicationStatus.ACCEPTED, ApplicationStatus.REJECTED))
+        self.assertFalse(APPLICATION_WORKFLOW.can_transition("unknown", ApplicationStatus.REJECTED))
+        self.assertFalse(APPLICATION_WORKFLOW.can_transition(ApplicationStatus.SUBMITTED, "unknown"))
+
+    def test_validate_batch_matches_single_checks(self):
+        """Test batch validation gives the same answer as checking every pair on its own."""
+        statuses = [*ApplicationStatus.values, "unknown"]
+        pairs = [(current, target) for current in statuses for target in statuses]
+
+        results = APPLICATION_WORKFLOW.validate_batch(pairs)
+
+        self.assertEqual(results, [APPLICATION_WORKFLOW.can_transition(current, target) for current, target in pairs])
+        self.assertEqual(sum(results), 7)
+
+    def test_sources_and_final_statuses(self):
+        """Test the reverse lookup and final statuses are derived from the transitions."""
+        self.assertEqual(
+            APPLICATION_WORKFLOW.sources(ApplicationStatus.UNDER_REVIEW),
+            (ApplicationStatus.SUBMITTED, ApplicationStatus.INTERVIEW_SCHEDULED),
+        )
+        self.assertEqual(APPLICATION_WORKFLOW.sources(ApplicationStatus.SUBMITTED), ())
+        self.assertEqual(APPLICATION_WORKFLOW.final_statuses, (ApplicationStatus.REJECTED, ApplicationStatus.ACCEPTED))
+        self.assertTrue(APPLICATION_WORKFLOW.is_final(ApplicationStatus.ACCEPTED))
+        self.assertFalse(APPLICATION_WORKFLOW.is_final(ApplicationStatus.SUBMITTED))
+
+    def test_transition_q_selects_movable_rows(self):
+        """Test the SQL predicate only matches candidates allowed to move to the target."""
+        submitted = CandidateFactory(current_status=ApplicationStatus.SUBMITTED)
+        interview = CandidateFactory(current_status=ApplicationStatus.INTERVIEW_SCHEDULED)
+        CandidateFactory(current_status=ApplicationStatus.ACCEPTED)
+
+        rejectable = Candidate.objects.filter(APPLICATION_WORKFLOW.transition_q(ApplicationStatus.REJECTED))
+        accept = Candidate.objects.filter(APPLICATION_WORKFLOW.transition_q(ApplicationStatus.ACCEPTED))
+
+        self.assertEqual({str(candidate.pk) for candidate in rejectable}, {str(submitted.pk), str(interview.pk)})
+        self.assertEqual([str(candidate.pk) for candidate in accept], [str(interview.pk)])
+        self.assertFalse(Candidate.objects.filter(APPLICATION_WORKFLOW.transition_q(ApplicationStatus.SUBMITTED)))
+
+    def test_unknown_status_rejected(self):
+        """Test a workflow referring to undefined statuses cannot be built."""
+        with self.assertRaises(ValueError):
+            Workflow(ApplicationStatus, {ApplicationStatus.SUBMITTED: ["hired"]})
+
+    def test_metadata(self):
+        """Test the client metadata lists every status and its transitions."""
+        metadata = APPLICATION_WORKFLOW.metadata()
+
+        self.assertEqual([status["value"] for status in metadata["statuses"]], ApplicationStatus.values)
+        self.assertEqual(metadata["statuses"][0], {"value": "submitted", "label": "Submitted", "final": False})
+        self.assertEqual(metadata["transitions"]["submitted"], ["under_review", "rejected"])
+        self.assertEqual(metadata["transitions"]["accepted"], [])
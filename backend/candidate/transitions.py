@@ -0,0 +1,232 @@
+import logging
+import uuid
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.text import Truncator
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from candidate.models import Actor, AutoTransitionRule, Candidate, StatusHistory
+from candidate.utils import queue_status_update_emails
+from candidate.workflow import APPLICATION_WORKFLOW
+from core.broadcast import get_broker
+from core.db import is_postgresql
+
+logger = logging.getLogger(__name__)
+
+# Status changes made by the system rather than an admin are recorded under this name.
+SYSTEM_ADMIN_NAME = "System"
+SYSTEM_ADMIN_EMAIL = "admin@hr-system.me"
+
+# Candidate fields copied from the latest status history entry.
+LAST_STATUS_CHANGE_FIELDS = ["status_changed_at", "last_feedback_excerpt", "last_admin_email", "history_count"]
+
+
+class TransitionConflict(APIException):
+    """Raised when the candidate status changed between validation and the update."""
+
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The candidate status was changed by another request. Reload the candidate and try again."
+    default_code = "status_conflict"
+
+
+def feedback_excerpt(feedback: str) -> str:
+    max_length = Candidate._meta.get_field("last_feedback_excerpt").max_length
+    return Truncator(feedback or "").chars(max_length)
+
+
+def last_status_change(changed_at, feedback: str, admin_email: str) -> dict:
+    """Values of the denormalized last status change fields, except history_count."""
+    return {
+        "status_changed_at": changed_at,
+        "last_feedback_excerpt": feedback_excerpt(feedback),
+        "last_admin_email": admin_email or "",
+    }
+
+
+def get_actor(name: str, email: str | None) -> Actor:
+    """The actor status changes by `name` <`email`> are recorded against, created on first use."""
+    actor, _ = Actor.objects.get_or_create(name=name, email=email or "")
+    return actor
+
+
+def publish_status_change(history: StatusHistory) -> None:
+    """Push a committed status change to the status event streams."""
+    event = {
+        "history_id": str(history.id),
+        "candidate_id": str(history.candidate_id),
+        "previous_status": history.previous_status,
+        "new_status": history.new_status,
+        "changed_at": history.created_at.isoformat(),
+    }
+    try:
+        get_broker().publish(event)
+    except Exception as e:
+        # Streams are a convenience on top of the API; the change itself is already committed.
+        logger.error(f"Error publishing status change {history.id}: {str(e)}")
+
+
+def _transition_sql() -> str:
+    quote = connection.ops.quote_name
+    return f"""
+        WITH moved AS (
+            UPDATE {quote(Candidate._meta.db_table)}
+            SET current_status = %(new_status)s, updated_at = %(now)s, status_changed_at = %(now)s,
+                last_feedback_excerpt = %(excerpt)s, last_admin_email = %(last_admin_email)s,
+                history_count = history_count + 1
+            WHERE id = %(candidate_id)s AND current_status = %(expected_status)s
+            RETURNING id
+        )
+        INSERT INTO {quote(StatusHistory._meta.db_table)}
+            (id, candidate_id, previous_status, new_status, feedback, actor_id, created_at)
+        SELECT %(history_id)s, id, %(expected_status)s, %(new_status)s, %(feedback)s, %(actor_id)s, %(now)s
+        FROM moved
+        RETURNING id
+    """
+
+
+def transition_status(
+    candidate: Candidate, expected_status: str, new_status: str, feedback: str, actor: Actor
+) -> StatusHistory:
+    """
+    Move a candidate from `expected_status` to `new_status` and record the history entry.
+
+    The update only applies while the row still has `expected_status`, so of two concurrent
+    changes validated against the same status only the first one wins. On PostgreSQL the
+    conditional UPDATE and the history INSERT are a single statement (a data-modifying CTE), so
+    the transition takes one round trip and no explicit lock; other databases use a conditional
+    UPDATE followed by the INSERT in one transaction.
+
+    Raises:
+        TransitionConflict: If the candidate no longer has `expected_status`
+    """
+    now = timezone.now()
+    change = last_status_change(now, feedback, actor.email)
+
+    if is_postgresql():
+        history_id = uuid.uuid4()
+        # Raw SQL bypasses the field, so statuses are passed as their stored codes.
+        status_code = Candidate._meta.get_field("current_status").get_prep_value
+        with connection.cursor() as cursor:
+            cursor.execute(
+                _transition_sql(),
+                {
+                    "candidate_id": candidate.pk,
+                    "expected_status": status_code(expected_status),
+                    "new_status": status_code(new_status),
+                    "history_id": history_id,
+                    "feedback": feedback,
+                    "actor_id": actor.pk,
+                    "now": now,
+                    "excerpt": change["last_feedback_excerpt"],
+                    "last_admin_email": change["last_admin_email"],
+                },
+            )
+            if cursor.fetchone() is None:
+                raise TransitionConflict()
+        history = StatusHistory(
+            id=history_id,
+            candidate=candidate,
+            previous_status=expected_status,
+            new_status=new_status,
+            feedback=feedback,
+            actor=actor,
+            created_at=now,
+        )
+    else:
+        with transaction.atomic():
+            moved = Candidate.objects.filter(pk=candidate.pk, current_status=expected_status).update(
+                current_status=new_status, updated_at=now, history_count=F("history_count") + 1, **change
+            )
+            if not moved:
+                raise TransitionConflict()
+            history = StatusHistory.objects.create(
+                candidate=candidate,
+                previous_status=expected_status,
+                new_status=new_status,
+                feedback=feedback,
+                actor=actor,
+            )
+
+    transaction.on_commit(lambda: publish_status_change(history))
+
+    candidate.current_status = new_status
+    candidate.updated_at = now
+    for field, value in change.items():
+        setattr(candidate, field, value)
+    # Incremented in the database; reading it back would cost a query for a value callers rarely need.
+    candidate.history_count += 1
+    return history
+
+
+def apply_auto_transition(rule: AutoTransitionRule, now=None, batch_size: int = None) -> int:
+    """
+    Move every candidate matched by `rule` to its target status.
+
+    Candidates are selected with one set-based query on (current_status, created_at) and moved in
+    batches of `batch_size` (AUTO_TRANSITION_BATCH_SIZE by default). Each batch is one transaction:
+    a single UPDATE, one bulk insert of status history attributed to SYSTEM_ADMIN_NAME, and one
+    bulk insert of the candidates' notifications on the bulk email queue; the changes are published to the status
+    event streams once the batch commits. Rows locked by a concurrent admin update are skipped and
+    picked up by the next run.
+
+    Returns:
+        int: Number of candidates moved
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.AUTO_TRANSITION_BATCH_SIZE
+    # The workflow predicate keeps a rule saved before a workflow change from making a disallowed move.
+    candidates = Candidate.objects.filter(
+        APPLICATION_WORKFLOW.transition_q(rule.to_status),
+        current_status=rule.from_status,
+        created_at__lte=now - timedelta(days=rule.after_days),
+    )
+    if rule.department:
+        candidates = candidates.filter(department=rule.department)
+    feedback = rule.feedback or f"Application automatically updated after {rule.after_days} days"
+    actor = get_actor(SYSTEM_ADMIN_NAME, SYSTEM_ADMIN_EMAIL)
+    update_data = {"feedback": feedback, "admin_name": SYSTEM_ADMIN_NAME}
+
+    moved = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                candidates.select_for_update(skip_locked=True)
+                .only("id", "full_name", "email")
+                .order_by("created_at")[:batch_size]
+            )
+            if not batch:
+                break
+
+            # `now` only selects the candidates. The changes feed may already be past the start of a
+            # long run, so each batch is stamped with its own time, like the history rows it inserts.
+            changed_at = timezone.now()
+            change = last_status_change(changed_at, feedback, actor.email)
+            Candidate.objects.filter(pk__in=[candidate.pk for candidate in batch]).update(
+                current_status=rule.to_status, updated_at=changed_at, history_count=F("history_count") + 1, **change
+            )
+            history = StatusHistory.objects.bulk_create(
+                [
+                    StatusHistory(
+                        candidate=candidate,
+                        previous_status=rule.from_status,
+                        new_status=rule.to_status,
+                        feedback=feedback,
+                        actor=actor,
+                    )
+                    for candidate in batch
+                ]
+            )
+            queue_status_update_emails(batch, rule.to_status, rule.from_status, update_data, bulk=True)
+            for entry in history:
+                transaction.on_commit(partial(publish_status_change, entry))
+
+        moved += len(batch)
+        logger.info(f"Auto-transition '{rule.name}' moved {len(batch)} candidates ({moved} so far)")
+
+    return moved
@@ -1,11 +1,24 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
-from candidate.views import CandidateViewSet, StatusHistoryViewSet
+from candidate.views import (
+    CandidateViewSet,
+    StatusHistoryViewSet,
+    WorkflowViewSet,
+    candidate_status_events,
+    status_events,
+)
 
 router = DefaultRouter()
 router.register(r"candidates", CandidateViewSet, basename="candidate")
 router.register(r"status-history", StatusHistoryViewSet, basename="status-history")
+router.register(r"workflow", WorkflowViewSet, basename="workflow")
 
 app_name = "candidate"
 
-urlpatterns = router.urls
+urlpatterns = [
+    # Server-Sent Events; only served by the ASGI app, the WSGI app answers 501
+    path("candidates/status/events/", candidate_status_events, name="candidate-status-events"),
+    path("status-history/events/", status_events, name="status-events"),
+    *router.urls,
+]
@@ -1,61 +1,272 @@
 import logging
+from datetime import timedelta
+from typing import Any
 
+from django.conf import settings
+from django.contrib.postgres.search import SearchVector
+from django.db.models import Count, F, Max
 from django.utils import timezone
 
-from core.tasks import send_email_task
+from candidate.models import ApplicationStatus, Candidate, Department, ResumeText, StatusHistory
+from core.db import is_postgresql
+from core.documents import inspect_document
+from core.models import EmailOutbox
 
 logger = logging.getLogger(__name__)
 
 
 def send_registration_email(candidate):
-    """Send registration confirmation email asynchronously."""
-    try:
-        context = {
-            "recipient_name": candidate.full_name,
-            "recipient_email": candidate.email,
-            "department": candidate.department,
-            "registration_date": timezone.now().strftime("%B %d, %Y"),
-            "application_id": str(candidate.id),
-        }
-        subject = "Application Received - HR System"
-
-        send_email_task.delay(
-            template_name="registration_confirmation",
-            context=context,
-            subject=subject,
-            recipient_email=candidate.email,
-            recipient_name=candidate.full_name,
-        )
-        logger.info(f"Registration email queued for {candidate.email}")
+    """
+    Queue registration confirmation email in the outbox.
 
-    except Exception as e:
-        logger.error(f"Error queuing registration email for {candidate.email}: {str(e)}")
+    Must run inside the transaction that creates the candidate: the email is only dispatched if
+    that transaction commits, and a failed outbox write rolls the registration back.
+    """
+    context = {
+        "recipient_name": candidate.full_name,
+        "recipient_email": candidate.email,
+        "department": candidate.department,
+        "registration_date": timezone.now().strftime("%B %d, %Y"),
+        "application_id": str(candidate.id),
+    }
+    subject = "Application Received - HR System"
 
+    EmailOutbox.objects.create(
+        template_name="registration_confirmation",
+        context=context,
+        subject=subject,
+        recipient_email=candidate.email,
+        recipient_name=candidate.full_name,
+        queue=EmailOutbox.Queue.TRANSACTIONAL,
+        priority=EmailOutbox.HIGH_PRIORITY,
+    )
+    logger.info(f"Registration email queued for {candidate.email}")
 
-def send_status_update_email(candidate, new_status, previous_status, update_data):
-    """Send status update email asynchronously."""
-    try:
-        context = {
+
+def send_status_update_email(candidate, new_status, previous_status, update_data, bulk=False):
+    """
+    Queue status update email in the outbox, inside the transaction that records the status change.
+
+    Status changes made in bulk (`bulk=True`) go to the low priority bulk queue so they never
+    hold up registration confirmations or individual updates.
+
+    The email is held back for EMAIL_STATUS_COALESCE_WINDOW seconds. Further changes made in that
+    window are merged into it, so the candidate receives one email with the latest status and the
+    feedback of the intermediate changes.
+    """
+    queue_status_update_emails([candidate], new_status, previous_status, update_data, bulk=bulk)
+
+
+def queue_status_update_emails(candidates, new_status, previous_status, update_data, bulk=False) -> None:
+    """
+    Queue the status update emails of candidates moved together, like `send_status_update_email`.
+
+    Pending emails are looked up and locked with one query, then merged with one bulk update and
+    the rest inserted with one bulk insert, whatever the number of candidates.
+    """
+    window = settings.EMAIL_STATUS_COALESCE_WINDOW
+    subject = f"Application Status Updated - {new_status.replace('_', ' ').title()}"
+    update_date = timezone.now().strftime("%B %d, %Y at %I:%M %p")
+    contexts = {
+        candidate.id: {
             "recipient_name": candidate.full_name,
             "recipient_email": candidate.email,
             "previous_status": previous_status,
             "new_status": new_status,
             "feedback": update_data.get("feedback", ""),
             "admin_name": update_data.get("admin_name", "HR Team"),
-            "update_date": timezone.now().strftime("%B %d, %Y at %I:%M %p"),
+            "update_date": update_date,
             "application_id": str(candidate.id),
         }
-        subject = f"Application Status Updated - {new_status.replace('_', ' ').title()}"
-
-        send_email_task.delay(
-            template_name="status_update",
-            context=context,
-            subject=subject,
-            recipient_email=candidate.email,
-            recipient_name=candidate.full_name,
+        for candidate in candidates
+    }
+
+    coalesced = {}
+    if window:
+        pending_rows = (
+            EmailOutbox.objects.select_for_update()
+            .filter(coalesce_key__in=[f"status_update:{pk}" for pk in contexts], dispatched_at__isnull=True)
+            .order_by("id")
         )
+        for pending in pending_rows:
+            coalesced.setdefault(pending.coalesce_key, pending)
 
+    new_rows = []
+    for candidate in candidates:
+        coalesce_key = f"status_update:{candidate.id}" if window else ""
+        pending = coalesced.get(coalesce_key)
+        if pending is not None:
+            pending.context = merge_status_update_context(pending.context, contexts[candidate.id])
+            pending.subject = subject
+            logger.info(f"Status update email for {candidate.email} coalesced: -> {new_status}")
+            continue
+        new_rows.append(
+            EmailOutbox(
+                template_name="status_update",
+                context=contexts[candidate.id],
+                subject=subject,
+                recipient_email=candidate.email,
+                recipient_name=candidate.full_name,
+                queue=EmailOutbox.Queue.BULK if bulk else EmailOutbox.Queue.TRANSACTIONAL,
+                priority=EmailOutbox.LOW_PRIORITY if bulk else EmailOutbox.NORMAL_PRIORITY,
+                coalesce_key=coalesce_key,
+                available_at=timezone.now() + timedelta(seconds=window),
+            )
+        )
         logger.info(f"Status update email queued for {candidate.email}: {previous_status} -> {new_status}")
 
+    if coalesced:
+        EmailOutbox.objects.bulk_update(list(coalesced.values()), ["context", "subject"])
+    if new_rows:
+        EmailOutbox.objects.bulk_create(new_rows)
+
+
+def merge_status_update_context(pending: dict[str, Any], latest: dict[str, Any]) -> dict[str, Any]:
+    """
+    Merge a newer status update into a pending status update email context.
+
+    The result describes the latest status, keeps the status the candidate was last told about
+    as previous status, and lists the superseded changes under `intermediate_updates`.
+    """
+    superseded = {key: pending[key] for key in ("new_status", "feedback", "admin_name", "update_date")}
+    return {
+        **latest,
+        "previous_status": pending["previous_status"],
+        "intermediate_updates": [*pending.get("intermediate_updates", []), superseded],
+    }
+
+
+def build_admin_digests(since, until) -> list[dict[str, Any]]:
+    """
+    Build the activity digest of every admin for the period [since, until).
+
+    Uses three aggregate queries regardless of the number of candidates or admins: registrations
+    per department, transitions per admin and status, and the admins active over the last
+    ADMIN_DIGEST_RECIPIENT_DAYS, who receive the digest. Changes made by the system actor count
+    towards the totals, but it has no mailbox to send a digest to.
+
+    Returns:
+        list[dict]: One send_email_task message per admin; empty if nothing happened in the period
+    """
+    from candidate.transitions import SYSTEM_ADMIN_EMAIL
+
+    registrations = {
+        row["department"]: row["count"]
+        for row in Candidate.objects.filter(created_at__gte=since, created_at__lt=until)
+        .values("department")
+        .annotate(count=Count("id"))
+        .order_by()
+    }
+
+    # Registration entries have no previous status; only admin transitions are reported.
+    history = StatusHistory.objects.filter(previous_status__isnull=False)
+    transitions = (
+        history.filter(created_at__gte=since, created_at__lt=until)
+        .values("actor__email", "new_status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    if not registrations and not transitions:
+        return []
+
+    totals, per_admin = {}, {}
+    for row in transitions:
+        totals[row["new_status"]] = totals.get(row["new_status"], 0) + row["count"]
+        per_admin.setdefault(row["actor__email"], {})[row["new_status"]] = row["count"]
+
+    admins = (
+        history.filter(created_at__gte=until - timedelta(days=settings.ADMIN_DIGEST_RECIPIENT_DAYS))
+        .exclude(actor__email="")
+        .exclude(actor__email=SYSTEM_ADMIN_EMAIL)
+        .values(admin_email=F("actor__email"))
+        .annotate(admin_name=Max("actor__name"))
+        .order_by("admin_email")
+    )
+
+    def status_counts(counts):
+        return [
+            {"status": label, "count": counts[value]} for value, label in ApplicationStatus.choices if value in counts
+        ]
+
+    shared_context = {
+        "period_start": since.strftime("%B %d, %Y %H:%M"),
+        "period_end": until.strftime("%B %d, %Y %H:%M"),
+        "registrations": [
+            {"department": label, "count": registrations[value]}
+            for value, label in Department.choices
+            if value in registrations
+        ],
+        "registrations_total": sum(registrations.values()),
+        "transitions": status_counts(totals),
+        "transitions_total": sum(totals.values()),
+    }
+    subject = f"HR System Digest - {until.strftime('%B %d, %Y')}"
+
+    messages = []
+    for admin in admins:
+        own = per_admin.get(admin["admin_email"], {})
+        messages.append(
+            {
+                "template_name": "admin_digest",
+                "context": {
+                    **shared_context,
+                    "own_transitions": status_counts(own),
+                    "own_transitions_total": sum(own.values()),
+                },
+                "subject": subject,
+                "recipient_email": admin["admin_email"],
+                "recipient_name": admin["admin_name"],
+            }
+        )
+    return messages
+
+
+def queue_resume_text_extraction(candidate):
+    """Queue extraction of the candidate resume text for full-text search."""
+    # Imported lazily: candidate.tasks depends on this module.
+    from candidate.tasks import extract_resume_text_task
+
+    try:
+        extract_resume_text_task.delay(str(candidate.id))
+        logger.info(f"Resume text extraction queued for candidate {candidate.id}")
+
     except Exception as e:
-        logger.error(f"Error queuing status update email for {candidate.email}: {str(e)}")
+        logger.error(f"Error queuing resume text extraction for candidate {candidate.id}: {str(e)}")
+
+
+def save_resume_text(candidate_id, content: str) -> ResumeText:
+    """Store extracted resume text and refresh its search vector."""
+    resume_text, _ = ResumeText.objects.update_or_create(candidate_id=candidate_id, defaults={"content": content})
+
+    if is_postgresql():
+        ResumeText.objects.filter(pk=candidate_id).update(
+            search_vector=SearchVector("content", config=settings.RESUME_TEXT_SEARCH_CONFIG)
+        )
+
+    return resume_text
+
+
+def get_resume_metadata(resume_file) -> dict[str, Any]:
+    """
+    Inspect an uploaded or stored resume and return the matching Candidate metadata fields.
+
+    Runs within the upload request, so only the facts read straight from the bytes are computed:
+    size, hash and detected type. The page count needs the document parsed and is filled in by
+    extract_resume_text_task, where the parsing time limit is enforced. A file that cannot be
+    inspected gets empty metadata rather than failing the registration.
+    """
+    resume_file.seek(0)
+    data = resume_file.read()
+    resume_file.seek(0)
+
+    try:
+        metadata = inspect_document(data, with_page_count=False)
+    except Exception as e:
+        logger.error(f"Resume metadata inspection failed: {str(e)}")
+        return {"resume_size": None, "resume_sha256": "", "resume_content_type": ""}
+
+    return {
+        "resume_size": metadata.size,
+        "resume_sha256": metadata.sha256,
+        "resume_content_type": metadata.content_type or "",
+    }
@@ -1,26 +1,47 @@
+import json
 import logging
+from datetime import datetime, time
+from functools import wraps
 
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.dateparse import parse_date, parse_datetime
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import MethodNotAllowed, PermissionDenied
+from rest_framework.exceptions import MethodNotAllowed, PermissionDenied, ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from candidate.filters import CandidateFilter, StatusHistoryFilter
-from candidate.models import Candidate, StatusHistory
-from candidate.permissions import AdminOnlyPermission, CandidatePermission
+from candidate.changes import InvalidCursor, changes_since, current_cursor
+from candidate.events import admin_activity, pipeline_as_of
+from candidate.filters import CandidateFilter, CodedChoiceOrderingFilter, StatusHistoryFilter
+from candidate.models import Candidate, Department, StatusHistory
+from candidate.permissions import AdminOnlyPermission, CandidatePermission, is_admin
 from candidate.serializers import (
     CandidateDetailSerializer,
     CandidateListSerializer,
     CandidateRegistrationSerializer,
     CandidateStatusSerializer,
     ResumeDownloadSerializer,
+    StatusHistoryChangeSerializer,
     StatusHistorySerializer,
     StatusUpdateSerializer,
 )
-from candidate.utils import send_registration_email, send_status_update_email
+from candidate.utils import (
+    queue_resume_text_extraction,
+    send_registration_email,
+    send_status_update_email,
+)
+from candidate.workflow import APPLICATION_WORKFLOW
+from core.broadcast import get_broker
+from core.idempotency import IDEMPOTENCY_KEY_HEADER, idempotent_response, request_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -35,9 +56,11 @@ class CandidateViewSet(viewsets.ModelViewSet):
     parser_classes = [MultiPartParser, FormParser, JSONParser]
     filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
     filterset_class = CandidateFilter
-    ordering_fields = ["created_at", "full_name", "years_of_experience"]
+    ordering_fields = ["created_at", "full_name", "years_of_experience", "status_changed_at", "history_count"]
     ordering = ["-created_at"]
     http_method_names = ["get", "post", "patch", "head", "options"]
+    changes_limit = 100
+    changes_max_limit = 500
 
     def get_serializer_class(self):
         """
@@ -57,14 +80,28 @@ class CandidateViewSet(viewsets.ModelViewSet):
         return serializer_class
 
     def create(self, request, *args, **kwargs):
-        """Handle candidate registration."""
+        """Handle candidate registration, replaying the stored response for retried Idempotency-Keys."""
+        if idempotency_key := request.headers.get(IDEMPOTENCY_KEY_HEADER):
+            return idempotent_response(
+                "candidate-registration",
+                idempotency_key,
+                lambda: self._register(request),
+                request_hash=request_fingerprint(request.data),
+            )
+        return self._register(request)
+
+    def _register(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        candidate = serializer.save()
+
+        with transaction.atomic():
+            candidate = serializer.save()
+            # Trigger registration confirmation email
+            send_registration_email(candidate)
+            # Index the resume content for recruiter search once the row is visible to workers
+            transaction.on_commit(lambda: queue_resume_text_extraction(candidate))
 
         logger.info(f"New candidate registered: {candidate.full_name} ({candidate.email})")
-        # Trigger registration confirmation email
-        send_registration_email(candidate)
 
         return Response(data=serializer.data, status=status.HTTP_201_CREATED)
 
@@ -87,6 +124,65 @@ class CandidateViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(instance=candidate, context={"request": request})
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"], url_path="changes", url_name="changes")
+    def changes(self, request, *args, **kwargs):
+        """
+        Candidates and status history changed after `cursor`, for clients syncing a local copy.
+
+        Without a cursor only the current cursor is returned. Pass the returned cursor to the next
+        call, immediately again while `has_more` is set.
+        """
+        if not (cursor := request.query_params.get("cursor")):
+            return Response({"candidates": [], "history": [], "cursor": current_cursor(), "has_more": False})
+
+        try:
+            limit = min(max(int(request.query_params.get("limit", self.changes_limit)), 1), self.changes_max_limit)
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        try:
+            changes = changes_since(cursor, limit)
+        except InvalidCursor as e:
+            raise ValidationError({"cursor": [str(e)]})
+
+        context = {"request": request}
+        return Response(
+            {
+                "candidates": CandidateListSerializer(changes["candidates"], many=True, context=context).data,
+                "history": StatusHistoryChangeSerializer(changes["history"], many=True, context=context).data,
+                "cursor": changes["cursor"],
+                "has_more": changes["has_more"],
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="pipeline", url_name="pipeline")
+    def pipeline(self, request, *args, **kwargs):
+        """
+        Number of candidates per status at `as_of` (now by default), optionally for one `department`.
+
+        `as_of` is an ISO datetime, or a date for the state at the end of that day.
+        """
+        as_of = self._parse_as_of(request.query_params.get("as_of"))
+        department = request.query_params.get("department") or None
+        if department and department not in Department.values:
+            raise ValidationError({"department": [f'"{department}" is not a valid choice.']})
+        return Response(
+            {"as_of": as_of, "department": department, "statuses": pipeline_as_of(as_of, department=department)}
+        )
+
+    @staticmethod
+    def _parse_as_of(value):
+        if not value:
+            return timezone.now()
+        # Well formed but impossible values such as hour 25 raise ValueError instead of returning None.
+        try:
+            if parsed := parse_datetime(value):
+                return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+            if parsed := parse_date(value):
+                return timezone.make_aware(datetime.combine(parsed, time.max))
+        except ValueError:
+            pass
+        raise ValidationError({"as_of": ["Enter a valid ISO date or datetime."]})
+
     def partial_update(self, request, *args, **kwargs):
         """Update candidate status (admin only)."""
         candidate = self.get_object()
@@ -99,17 +195,18 @@ class CandidateViewSet(viewsets.ModelViewSet):
         new_status = serializer.validated_data["new_status"]
         previous_status = candidate.current_status
 
-        updated_candidate = serializer.update(candidate, serializer.validated_data)
+        with transaction.atomic():
+            updated_candidate = serializer.update(candidate, serializer.validated_data)
 
-        logger.info(f"Status updated for candidate {candidate.full_name}: {previous_status} -> {new_status}")
+            # Trigger status update email
+            send_status_update_email(
+                candidate=updated_candidate,
+                new_status=new_status,
+                previous_status=previous_status,
+                update_data=serializer.validated_data,
+            )
 
-        # Trigger status update email
-        send_status_update_email(
-            candidate=updated_candidate,
-            new_status=new_status,
-            previous_status=previous_status,
-            update_data=serializer.validated_data,
-        )
+        logger.info(f"Status updated for candidate {candidate.full_name}: {previous_status} -> {new_status}")
 
         response_serializer = CandidateDetailSerializer(updated_candidate, context={"request": request})
 
@@ -119,7 +216,7 @@ class CandidateViewSet(viewsets.ModelViewSet):
         """Return appropriate permissions based on the action."""
         if self.action in ["create", "status"]:
             return [CandidatePermission()]
-        elif self.action in ["list", "retrieve", "partial_update", "download_resume"]:
+        elif self.action in ["list", "retrieve", "partial_update", "download_resume", "pipeline", "changes"]:
             return [AdminOnlyPermission()]
         else:
             raise PermissionDenied()
@@ -132,8 +229,103 @@ class StatusHistoryViewSet(viewsets.ReadOnlyModelViewSet):
 
     queryset = StatusHistory.objects.select_related("candidate")
     serializer_class = StatusHistorySerializer
-    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, CodedChoiceOrderingFilter]
     filterset_class = StatusHistoryFilter
     ordering_fields = ["created_at", "candidate__full_name", "new_status"]
     ordering = ["-created_at"]
     permission_classes = [AdminOnlyPermission]
+
+    @action(detail=False, methods=["get"], url_path="activity", url_name="activity")
+    def activity(self, request, *args, **kwargs):
+        """
+        Status changes per admin, narrowed by the same filters as the list.
+
+        e.g. `?admin_email=...&created_after=...` for what one admin changed over a period.
+        """
+        return Response({"results": admin_activity(self.filter_queryset(self.get_queryset()))})
+
+
+class WorkflowViewSet(viewsets.ViewSet):
+    """
+    Public, cacheable description of the application status workflow for clients.
+    """
+
+    permission_classes = [AllowAny]
+    # Changes only with a deploy; the ETag lets clients revalidate for free after that.
+    cache_max_age = 60 * 60
+
+    @action(detail=False, methods=["get"], url_path="transitions", url_name="transitions")
+    def transitions(self, request, *args, **kwargs):
+        """Statuses and the transitions allowed from each, versioned by an ETag."""
+        etag = f'"{APPLICATION_WORKFLOW.version}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({"version": APPLICATION_WORKFLOW.version, **APPLICATION_WORKFLOW.metadata()})
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=self.cache_max_age)
+        return response
+
+
+async def _status_event_stream(candidate_id=None):
+    """Server-Sent Events of status changes, with a comment line as heartbeat while idle."""
+    async with get_broker().subscribe(candidate_id) as subscription:
+        yield "retry: 5000\n\n"
+        while not subscription.overflowed:
+            event = await subscription.get(timeout=settings.SSE_HEARTBEAT_INTERVAL)
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"id: {event['history_id']}\nevent: status_change\ndata: {json.dumps(event)}\n\n"
+
+
+def _event_stream_response(stream) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+def _asgi_only(view):
+    """Refuse the stream outside the ASGI app: an endless response would hold a WSGI worker for good."""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "Event streams are served by the ASGI events service."},
+                status=status.HTTP_501_NOT_IMPLEMENTED,
+            )
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@_asgi_only
+async def candidate_status_events(request):
+    """Public stream of the status changes of the candidate with the given `email`."""
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    if not (email := request.GET.get("email")):
+        return JsonResponse({"email": ["This field is required."]}, status=status.HTTP_400_BAD_REQUEST)
+
+    candidate_id = await Candidate.objects.filter(email=email).values_list("id", flat=True).afirst()
+    if candidate_id is None:
+        return JsonResponse(
+            {"email": ["Candidate with this email does not exist."]}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return _event_stream_response(_status_event_stream(candidate_id))
+
+
+@_asgi_only
+async def status_events(request):
+    """Admin stream of every status change."""
+    if request.method != "GET":
+        return JsonResponse({"detail": "Method not allowed."}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    if not is_admin(request):
+        return JsonResponse(
+            {"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN
+        )
+    return _event_stream_response(_status_event_stream())
@@ -0,0 +1,107 @@
+"""
+The application status workflow.
+
+Statuses and their allowed transitions are defined once, in APPLICATION_WORKFLOW, and compiled
+into lookup tables: every status gets a bit index, and each status maps to a bitmask of the
+statuses it may move to. Checking a transition is then a dict lookup and a bit test, a batch of
+transitions is checked in a single pass over the tables, and the set of statuses that may move to
+a target becomes a SQL predicate for set-based updates. The same definition is served to the
+frontend by the workflow transitions endpoint.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+
+from django.db.models import Q, TextChoices
+
+from candidate.models import ApplicationStatus
+
+
+class Workflow:
+    """A compiled status workflow (statuses and the transitions allowed between them)."""
+
+    def __init__(self, statuses: type[TextChoices], transitions: dict[str, Iterable[str]]):
+        self.statuses = tuple(statuses.values)
+        self.labels = dict(statuses.choices)
+        self.index = {value: bit for bit, value in enumerate(self.statuses)}
+
+        unknown = {source for source in transitions if source not in self.index}
+        unknown |= {target for targets in transitions.values() for target in targets if target not in self.index}
+        if unknown:
+            raise ValueError(f"Unknown statuses in workflow: {', '.join(sorted(unknown))}")
+
+        self._targets = {value: tuple(str(target) for target in transitions.get(value, ())) for value in self.statuses}
+        self._masks = {
+            value: sum(1 << self.index[target] for target in targets) for value, targets in self._targets.items()
+        }
+        self._sources = {
+            value: tuple(source for source in self.statuses if self._masks[source] >> self.index[value] & 1)
+            for value in self.statuses
+        }
+        self.final_statuses = tuple(value for value in self.statuses if not self._masks[value])
+        self.version = hashlib.sha256(json.dumps(self.metadata(), sort_keys=True).encode()).hexdigest()[:16]
+
+    def can_transition(self, current: str, target: str) -> bool:
+        """Whether a candidate in `current` may move to `target`."""
+        bit = self.index.get(target)
+        return bit is not None and bool(self._masks.get(current, 0) >> bit & 1)
+
+    def targets(self, current: str) -> tuple[str, ...]:
+        """Statuses a candidate in `current` may move to, in definition order."""
+        return self._targets.get(current, ())
+
+    def sources(self, target: str) -> tuple[str, ...]:
+        """Statuses from which a candidate may move to `target`."""
+        return self._sources.get(target, ())
+
+    def is_final(self, status: str) -> bool:
+        return status in self.index and not self._masks[status]
+
+    def validate_batch(self, pairs: Iterable[tuple[str, str]]) -> list[bool]:
+        """Check many `(current, target)` transitions at once; one result per pair, in order."""
+        masks, index = self._masks, self.index
+        return [bool(masks.get(current, 0) >> index.get(target, len(index)) & 1) for current, target in pairs]
+
+    def transition_q(self, target: str, field: str = "current_status") -> Q:
+        """
+        Q object matching the rows that may move to `target`, for set-based transitions.
+
+        Filtering an UPDATE with it applies the workflow in the database, e.g.
+        ``Candidate.objects.filter(pk__in=ids).filter(APPLICATION_WORKFLOW.transition_q(target))``.
+        Matches nothing when no status leads to `target`.
+        """
+        return Q(**{f"{field}__in": self.sources(target)})
+
+    def error_message(self, current: str, target: str) -> str:
+        valid_transitions = self.targets(current)
+        return (
+            f"Cannot transition from {current} to {target}. "
+            f"Valid transitions: {', '.join(valid_transitions) if valid_transitions else 'No valid transitions'}"
+        )
+
+    def metadata(self) -> dict:
+        """The workflow as served to clients."""
+        return {
+            "statuses": [
+                {"value": value, "label": self.labels[value], "final": not self._masks[value]}
+                for value in self.statuses
+            ],
+            "transitions": {value: list(targets) for value, targets in self._targets.items()},
+        }
+
+
+APPLICATION_WORKFLOW = Workflow(
+    ApplicationStatus,
+    {
+        ApplicationStatus.SUBMITTED: [ApplicationStatus.UNDER_REVIEW, ApplicationStatus.REJECTED],
+        ApplicationStatus.UNDER_REVIEW: [ApplicationStatus.INTERVIEW_SCHEDULED, ApplicationStatus.REJECTED],
+        ApplicationStatus.INTERVIEW_SCHEDULED: [
+            ApplicationStatus.ACCEPTED,
+            ApplicationStatus.REJECTED,
+            ApplicationStatus.UNDER_REVIEW,  # Allow going back for re-evaluation
+        ],
+        ApplicationStatus.REJECTED: [],  # Final state
+        ApplicationStatus.ACCEPTED: [],  # Final state
+    },
+)
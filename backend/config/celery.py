@@ -1,6 +1,7 @@
 import os
 
 from celery import Celery
+from kombu import Queue
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
@@ -30,18 +31,58 @@ app.conf.update(
     # Task execution settings
     task_always_eager=os.environ.get("CELERY_TASK_ALWAYS_EAGER", "False").lower() == "true",
     task_eager_propagates=True,
+    # Queues: transactional email (registrations, individual status updates) is isolated from
+    # bulk email so a large batch never delays it; each queue has its own worker pool (see
+    # compose/docker-compose.yml). Queue names match core.models.EmailOutbox.Queue.
+    task_queues=(
+        Queue("celery"),
+        Queue("email.transactional", queue_arguments={"x-max-priority": 10}),
+        Queue("email.bulk", queue_arguments={"x-max-priority": 10}),
+        Queue("documents"),
+    ),
+    task_default_queue="celery",
+    task_routes={
+        "core.tasks.send_email_task": {"queue": "email.transactional"},
+        "core.tasks.send_email_batch_task": {"queue": "email.bulk"},
+        "candidate.tasks.extract_resume_text_task": {"queue": "documents"},
+    },
+    task_queue_max_priority=10,
+    task_default_priority=5,
     # Worker settings
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
-    # Task settings
-    task_annotations={
-        "core.tasks.send_email_task": {
-            "rate_limit": "10/m",
-        },
-    },
+    # Email throughput is limited globally per recipient domain and provider by
+    # core.rate_limit (EMAIL_*_RATE_LIMIT settings) rather than per worker here.
     # Error handling
     task_acks_late=True,
     worker_disable_rate_limits=False,
+    # Periodic tasks (run `celery -A config beat`)
+    beat_schedule={
+        "dispatch-email-outbox": {
+            "task": "core.tasks.dispatch_email_outbox_task",
+            "schedule": float(os.environ.get("EMAIL_OUTBOX_DISPATCH_INTERVAL", "2")),
+        },
+        "purge-email-outbox": {
+            "task": "core.tasks.purge_email_outbox_task",
+            "schedule": 24 * 60 * 60,
+        },
+        "send-admin-digest": {
+            "task": "candidate.tasks.send_admin_digest_task",
+            "schedule": float(os.environ.get("ADMIN_DIGEST_INTERVAL", str(24 * 60 * 60))),
+        },
+        "apply-auto-transitions": {
+            "task": "candidate.tasks.apply_auto_transitions_task",
+            "schedule": float(os.environ.get("AUTO_TRANSITION_INTERVAL", str(60 * 60))),
+        },
+        "take-status-snapshot": {
+            "task": "candidate.tasks.take_status_snapshot_task",
+            "schedule": float(os.environ.get("STATUS_SNAPSHOT_INTERVAL", str(24 * 60 * 60))),
+        },
+        "purge-idempotency-keys": {
+            "task": "core.tasks.purge_idempotency_keys_task",
+            "schedule": 60 * 60,
+        },
+    },
 )
 
 
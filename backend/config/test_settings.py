@@ -48,7 +48,7 @@ ROOT_URLCONF = "config.urls"
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -137,6 +137,13 @@ CORS_ALLOW_CREDENTIALS = True
 FILE_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # 5MB
 
+# Idempotency-Key replay window for candidate registration
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60  # seconds
+
+# Resume text extraction
+RESUME_TEXT_EXTRACTION_TIMEOUT = 5  # seconds per file
+RESUME_TEXT_SEARCH_CONFIG = "english"
+
 # Logging for tests
 LOGGING = {
     "version": 1,
@@ -171,3 +178,53 @@ CACHES = {
 
 # Email backend for tests
 EMAIL_BACKEND = "django.core.mail.backends.dummy.EmailBackend"
+
+# Outgoing email rate limits (disabled unless a test enables them)
+EMAIL_PROVIDER_RATE_LIMIT = ""
+EMAIL_DOMAIN_RATE_LIMIT = ""
+EMAIL_DOMAIN_RATE_LIMITS = {}
+
+# Email outbox
+EMAIL_OUTBOX_BATCH_SIZE = 100
+# Bulk emails sent over one SMTP connection by each send_email_batch_task
+EMAIL_BULK_BATCH_SIZE = 50
+EMAIL_OUTBOX_RETENTION_DAYS = 7
+
+# Outbox dispatcher
+EMAIL_DISPATCHER = "celery"
+EMAIL_ASYNC_CONCURRENCY = 200
+EMAIL_ASYNC_PER_DOMAIN = 20
+
+# Status update coalescing (disabled unless a test enables it)
+EMAIL_STATUS_COALESCE_WINDOW = 0
+
+# Admins active in the last N days receive the activity digest
+ADMIN_DIGEST_RECIPIENT_DAYS = 30
+
+# Candidates moved per transaction by the auto-transition rules
+AUTO_TRANSITION_BATCH_SIZE = 500
+
+# Status snapshots: taken this many seconds in the past, kept this many days
+STATUS_SNAPSHOT_LAG = 300
+STATUS_SNAPSHOT_RETENTION_DAYS = 365
+
+# Changes feed: only rows older than this are returned, so late commits are not skipped
+CHANGES_FEED_SETTLE_SECONDS = 0
+
+# Email retries
+EMAIL_MAX_RETRIES = 5
+EMAIL_RETRY_BACKOFF = 30
+EMAIL_RETRY_BACKOFF_MAX = 3600
+
+# Metrics: processes sharing METRICS_DIR (API and Celery workers) are exported together at /metrics/
+METRICS_DIR = ""
+METRICS_FLUSH_INTERVAL = 5
+# Seconds without a rewrite before the snapshot of a process is dropped as left by a dead process
+METRICS_STALE_AFTER = 60
+# Clients allowed to scrape /metrics/ (REMOTE_ADDR, so scrape the backend directly rather than via nginx)
+METRICS_ALLOWED_IPS = ["127.0.0.1"]
+
+# Server-Sent Events of status changes
+STATUS_EVENTS_BROKER = "core.broadcast.InMemoryBroker"
+SSE_HEARTBEAT_INTERVAL = 15
+SSE_QUEUE_SIZE = 100
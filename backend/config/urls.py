@@ -5,9 +5,12 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/", include("candidate.urls")),
+    path("metrics/", metrics, name="metrics"),
 ]
 
 # Serve media files in development
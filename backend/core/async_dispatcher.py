@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import random
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+
+import aiosmtplib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailOutbox
+from .notification_service import NotificationService
+from .rate_limit import email_rate_limit_delay
+from .tasks import dead_letter_email, retry_backoff
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Deferred:
+    """Delivery result of a message put back on the outbox because of a rate limit."""
+
+    delay: float
+
+
+class SMTPConnectionPool:
+    """Idle SMTP connections reused across deliveries; the dispatcher bounds how many are open."""
+
+    def __init__(self):
+        self._idle: list[aiosmtplib.SMTP] = []
+
+    async def acquire(self) -> aiosmtplib.SMTP:
+        while self._idle:
+            client = self._idle.pop()
+            if client.is_connected:
+                return client
+
+        client = aiosmtplib.SMTP(
+            hostname=settings.EMAIL_HOST,
+            port=settings.EMAIL_PORT,
+            username=settings.EMAIL_HOST_USER or None,
+            password=settings.EMAIL_HOST_PASSWORD or None,
+            use_tls=getattr(settings, "EMAIL_USE_SSL", False),
+            start_tls=settings.EMAIL_USE_TLS or None,
+            timeout=getattr(settings, "EMAIL_TIMEOUT", None) or 60,
+        )
+        await client.connect()
+        return client
+
+    def release(self, client: aiosmtplib.SMTP) -> None:
+        if client.is_connected:
+            self._idle.append(client)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for client in idle:
+            try:
+                await client.quit()
+            except aiosmtplib.SMTPException:
+                client.close()
+
+
+class AsyncEmailDispatcher:
+    """
+    Drain the email outbox with asyncio and an async SMTP client.
+
+    An alternative to the Celery dispatcher (EMAIL_DISPATCHER = "asyncio"): a single process keeps
+    up to `concurrency` deliveries in flight, at most `per_domain` of them to the same recipient
+    domain, while still honouring the shared rate limits of core.rate_limit. Claimed rows are leased
+    rather than marked dispatched, so rows of a crashed dispatcher are picked up again. Each row is
+    completed as soon as its delivery ends and its place refilled from the outbox, so a slow or
+    throttled domain does not hold up the others.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        per_domain: int = None,
+        batch_size: int = None,
+        lease: int = 300,
+        max_wait: float = None,
+    ):
+        self.concurrency = concurrency or settings.EMAIL_ASYNC_CONCURRENCY
+        self.per_domain = per_domain or settings.EMAIL_ASYNC_PER_DOMAIN
+        self.batch_size = batch_size or self.concurrency * 2
+        self.lease = lease
+        # Rate limit waits longer than this put the row back on the outbox, well before its lease expires.
+        self.max_wait = lease / 10 if max_wait is None else max_wait
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._domains = defaultdict(lambda: asyncio.Semaphore(self.per_domain))
+        self._pool = SMTPConnectionPool()
+
+    async def run(self, poll_interval: float = 1.0, once: bool = False) -> int:
+        """
+        Deliver outbox emails until cancelled, or until the outbox is empty when `once` is set.
+
+        Returns:
+            int: Number of emails delivered
+        """
+        delivered = 0
+        in_flight = set()
+        try:
+            while True:
+                batch = []
+                if len(in_flight) < self.batch_size:
+                    batch = await sync_to_async(self._claim)(self.batch_size - len(in_flight))
+                in_flight |= {asyncio.ensure_future(self._deliver_row(row)) for row in batch}
+                if not in_flight:
+                    if once:
+                        break
+                    await asyncio.sleep(poll_interval)
+                    continue
+
+                done, in_flight = await asyncio.wait(
+                    in_flight, timeout=poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                if done:
+                    rows, results = zip(*(task.result() for task in done))
+                    await sync_to_async(self._complete)(list(rows), list(results))
+                    delivered += results.count(None)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            await self._pool.close()
+
+        logger.info(f"Async email dispatcher delivered {delivered} emails")
+        return delivered
+
+    async def _deliver_row(self, row: EmailOutbox) -> tuple[EmailOutbox, str | Deferred | None]:
+        return row, await self.deliver(row.task_kwargs())
+
+    async def deliver_all(self, messages: list[dict]) -> list[str | Deferred | None]:
+        """Deliver messages concurrently; returns None per delivered message, the error or deferral otherwise."""
+        return await asyncio.gather(*(self.deliver(message) for message in messages))
+
+    async def deliver(self, message: dict) -> str | Deferred | None:
+        """Render and send one message (send_email_task keyword arguments)."""
+        recipient_email = message["recipient_email"]
+        domain = recipient_email.rsplit("@", 1)[-1].lower()
+
+        async with self._domains[domain]:
+            # Waiting for a token only holds a slot of the throttled domain, not a global one, and only
+            # up to max_wait; longer waits free the slot and defer the row like the Celery dispatcher.
+            # A failed bucket lookup is this message's error, retried like a failed send, so it cannot
+            # escape run() and strand the rest of the claimed batch.
+            waited = 0.0
+            try:
+                while delay := await sync_to_async(email_rate_limit_delay)(recipient_email):
+                    if waited + delay > self.max_wait:
+                        return Deferred(delay)
+                    await asyncio.sleep(delay)
+                    waited += delay
+            except Exception as e:
+                logger.error(f"Error checking the email rate limit for {recipient_email}: {str(e)}")
+                return str(e) or e.__class__.__name__
+
+            async with self._slots:
+                try:
+                    email = self._build(message)
+                    client = await self._pool.acquire()
+                    try:
+                        await client.send_message(email.message(), sender=email.from_email, recipients=email.to)
+                    except BaseException:
+                        client.close()
+                        raise
+                    self._pool.release(client)
+                    return None
+
+                except Exception as e:
+                    logger.error(f"Error sending email to {recipient_email}: {str(e)}")
+                    return str(e) or e.__class__.__name__
+
+    @staticmethod
+    def _build(message: dict) -> EmailMultiAlternatives:
+        context = dict(message["context"])
+        if recipient_name := message.get("recipient_name"):
+            context["recipient_name"] = recipient_name
+
+        html_message, plain_message = NotificationService.render_email(message["template_name"], context)
+        email = EmailMultiAlternatives(
+            subject=message["subject"],
+            body=plain_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[message["recipient_email"]],
+        )
+        email.attach_alternative(html_message, "text/html")
+        return email
+
+    def _claim(self, limit: int) -> list[EmailOutbox]:
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True, available_at__lte=now)
+                .order_by("-priority", "id")[:limit]
+            )
+            # Clearing the coalesce key stops new status changes from merging into an email in flight.
+            EmailOutbox.objects.filter(pk__in=[row.pk for row in batch]).update(
+                available_at=now + timedelta(seconds=self.lease), coalesce_key=""
+            )
+        return batch
+
+    def _complete(self, batch: list[EmailOutbox], errors: list[str | Deferred | None]) -> None:
+        now = timezone.now()
+        delivered = [row.pk for row, error in zip(batch, errors) if error is None]
+        EmailOutbox.objects.filter(pk__in=delivered).update(dispatched_at=now)
+
+        for row, error in zip(batch, errors):
+            if error is None:
+                continue
+            if isinstance(error, Deferred):
+                # Not an attempt: the row only replaces its lease with the rate limit delay, plus jitter.
+                countdown = error.delay * (1 + random.random())
+                logger.info(f"Email rate limit reached for {row.recipient_email}, deferring by {countdown:.1f}s")
+                EmailOutbox.objects.filter(pk=row.pk).update(available_at=now + timedelta(seconds=countdown))
+            elif row.attempts >= settings.EMAIL_MAX_RETRIES:
+                dead_letter_email(row.task_kwargs(), error=error, attempts=row.attempts + 1)
+                EmailOutbox.objects.filter(pk=row.pk).update(dispatched_at=now)
+            else:
+                EmailOutbox.objects.filter(pk=row.pk).update(
+                    attempts=F("attempts") + 1, available_at=now + timedelta(seconds=retry_backoff(row.attempts))
+                )
@@ -0,0 +1,156 @@
+"""
+Fan-out of status change events to Server-Sent Events streams.
+
+Subscribers are asyncio queues owned by the event loop serving their stream, keyed by the
+candidate they follow (or ALL for admin streams), so publishing an event only touches the
+streams interested in it. Idle streams cost a coroutine and an empty queue, which lets one ASGI
+process hold thousands of them.
+
+InMemoryBroker only reaches streams of the publishing process and is meant for tests and single
+process setups. PostgresBroker publishes with NOTIFY (delivered when the publishing transaction
+commits) and runs one LISTEN connection per process that feeds the local subscribers.
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+ALL = "*"
+
+
+class Subscription:
+    """Events delivered to one stream."""
+
+    def __init__(self, key: str, maxsize: int):
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.overflowed = False
+
+    def deliver(self, event: dict) -> None:
+        # Runs on the subscriber's event loop.
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind reconnects and catches up through the changes feed.
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> dict | None:
+        """The next event, or None if none arrived within `timeout` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class InMemoryBroker:
+    """Deliver events to the subscribers of this process."""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, event: dict) -> None:
+        """Send `event` (a dict with a candidate_id) to every stream following it; callable from any thread."""
+        self.dispatch(event)
+
+    def dispatch(self, event: dict) -> None:
+        with self._lock:
+            subscribers = [*self._subscribers.get(str(event["candidate_id"]), ()), *self._subscribers.get(ALL, ())]
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:
+                # The subscriber's loop is closed; its stream is going away.
+                continue
+
+    @asynccontextmanager
+    async def subscribe(self, candidate_id=None):
+        """Subscribe to the events of one candidate, or of every candidate without one."""
+        subscription = Subscription(str(candidate_id) if candidate_id else ALL, settings.SSE_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[subscription.key].add(subscription)
+        try:
+            yield subscription
+        finally:
+            with self._lock:
+                self._subscribers[subscription.key].discard(subscription)
+                if not self._subscribers[subscription.key]:
+                    del self._subscribers[subscription.key]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+
+class PostgresBroker(InMemoryBroker):
+    """Deliver events to the subscribers of every process through PostgreSQL LISTEN/NOTIFY."""
+
+    channel = "status_changes"
+
+    def __init__(self):
+        super().__init__()
+        self._listener = None
+
+    def publish(self, event: dict) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.channel, json.dumps(event)])
+
+    @asynccontextmanager
+    async def subscribe(self, candidate_id=None):
+        self._start_listener()
+        async with super().subscribe(candidate_id) as subscription:
+            yield subscription
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="status-events-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self) -> None:
+        import psycopg2
+
+        while True:
+            try:
+                listener = psycopg2.connect(**connection.get_connection_params())
+                listener.autocommit = True
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                logger.info(f"Listening for status events on {self.channel}")
+
+                while True:
+                    if select.select([listener], [], [], 30) == ([], [], []):
+                        continue
+                    listener.poll()
+                    while listener.notifies:
+                        notify = listener.notifies.pop(0)
+                        self.dispatch(json.loads(notify.payload))
+
+            except Exception as e:
+                logger.error(f"Status events listener failed, reconnecting: {str(e)}")
+                time.sleep(1)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker() -> InMemoryBroker:
+    """The process-wide broker configured by STATUS_EVENTS_BROKER."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.STATUS_EVENTS_BROKER)()
+        return _broker
@@ -0,0 +1,23 @@
+from django.db import connections, migrations
+
+
+def is_postgresql(using: str = "default") -> bool:
+    """Return True when the given database alias is backed by PostgreSQL."""
+    return connections[using].vendor == "postgresql"
+
+
+class RunPostgreSQL(migrations.RunSQL):
+    """
+    RunSQL operation that only executes on PostgreSQL.
+
+    Used for indexes and extensions (GIN, pg_trgm, ...) that have no equivalent on the
+    SQLite database the test suite runs against.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
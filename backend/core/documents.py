@@ -0,0 +1,179 @@
+import hashlib
+import io
+import re
+import signal
+import threading
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from xml.etree import ElementTree
+
+PDF_CONTENT_TYPE = "application/pdf"
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_EXTENDED_PROPERTIES_NAMESPACE = "{http://schemas.openxmlformats.org/officeDocument/2006/extended-properties}"
+_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+
+
+class DocumentExtractionError(Exception):
+    """Raised when text cannot be extracted from a document."""
+
+
+class DocumentExtractionTimeout(DocumentExtractionError):
+    """Raised when text extraction exceeds its time budget."""
+
+
+@dataclass(frozen=True)
+class DocumentMetadata:
+    """Storage-independent facts about a document, computed once at upload time."""
+
+    size: int
+    sha256: str
+    content_type: str | None
+    page_count: int | None
+
+
+def detect_content_type(data: bytes) -> str | None:
+    """Detect the document type from its leading bytes rather than the client supplied header."""
+    if data.startswith(b"%PDF-"):
+        return PDF_CONTENT_TYPE
+    if data.startswith(b"PK\x03\x04"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                if "word/document.xml" in archive.namelist():
+                    return DOCX_CONTENT_TYPE
+        except zipfile.BadZipFile:
+            return None
+    return None
+
+
+def inspect_document(data: bytes, with_page_count: bool = True) -> DocumentMetadata:
+    """
+    Compute size, content hash, detected type and page count of a document.
+
+    The page count is best effort: it is None when the document does not record it or cannot be parsed,
+    and when `with_page_count` is False. Everything else only reads the bytes, without parsing them.
+    """
+    return DocumentMetadata(
+        size=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        content_type=detect_content_type(data),
+        page_count=count_pages(data) if with_page_count else None,
+    )
+
+
+def count_pages(data: bytes, timeout: float | None = None) -> int | None:
+    """
+    Best effort page count of a PDF or DOCX document, None when it is not recorded or cannot be parsed.
+
+    Raises:
+        DocumentExtractionTimeout: If parsing takes longer than `timeout` seconds
+    """
+    content_type = detect_content_type(data)
+    with time_limit(timeout):
+        if content_type == PDF_CONTENT_TYPE:
+            return _count_pdf_pages(data)
+        if content_type == DOCX_CONTENT_TYPE:
+            return _count_docx_pages(data)
+    return None
+
+
+@contextmanager
+def time_limit(seconds: float | None):
+    """
+    Abort the wrapped block with DocumentExtractionTimeout after `seconds`.
+
+    Relies on SIGALRM, so the limit is only enforced in the main thread of a process, which is
+    where both Celery prefork children and ProcessPoolExecutor workers run their jobs.
+    """
+    if not seconds or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _raise_timeout(signum, frame):
+        raise DocumentExtractionTimeout(f"Text extraction exceeded {seconds} seconds")
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def extract_text(data: bytes, timeout: float | None = None) -> str:
+    """
+    Extract plain text from a PDF or DOCX document.
+
+    Args:
+        data: Raw file content
+        timeout: Maximum number of seconds to spend on the document (optional)
+
+    Returns:
+        str: Normalized document text
+
+    Raises:
+        DocumentExtractionError: If the document type is unsupported or the document is corrupt
+    """
+    content_type = detect_content_type(data)
+    with time_limit(timeout):
+        if content_type == PDF_CONTENT_TYPE:
+            text = _extract_pdf_text(data)
+        elif content_type == DOCX_CONTENT_TYPE:
+            text = _extract_docx_text(data)
+        else:
+            raise DocumentExtractionError("Only PDF and DOCX files are supported")
+    return _normalize(text)
+
+
+def _extract_pdf_text(data: bytes) -> str:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    except PdfReadError as e:
+        raise DocumentExtractionError(f"Unreadable PDF: {str(e)}") from e
+
+
+def _count_pdf_pages(data: bytes) -> int | None:
+    from pypdf import PdfReader
+    from pypdf.errors import PdfReadError
+
+    try:
+        return len(PdfReader(io.BytesIO(data)).pages)
+    except (PdfReadError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _count_docx_pages(data: bytes) -> int | None:
+    # Word stores the page count of the last save in docProps/app.xml; it is absent for generated files.
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("docProps/app.xml"))
+        pages = root.find(f"{_EXTENDED_PROPERTIES_NAMESPACE}Pages")
+        return int(pages.text) if pages is not None and pages.text else None
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, ValueError):
+        return None
+
+
+def _extract_docx_text(data: bytes) -> str:
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            root = ElementTree.fromstring(archive.read("word/document.xml"))
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        raise DocumentExtractionError(f"Unreadable DOCX: {str(e)}") from e
+
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NAMESPACE}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NAMESPACE}t")))
+    return "\n".join(paragraphs)
+
+
+def _normalize(text: str) -> str:
+    lines = (_WHITESPACE_RE.sub(" ", line).strip() for line in text.replace("\x00", "").splitlines())
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
@@ -0,0 +1,52 @@
+from django.core import exceptions
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class CodedChoiceField(models.PositiveSmallIntegerField):
+    """
+    Store the values of a TextChoices enum as smallint codes.
+
+    Model instances, forms, serializers, filters and `get_FOO_display` keep working with the
+    enum's string values; only the column (and every index on it) holds a 2-byte code instead of
+    a varchar. Codes follow the member order of the enum starting at 1, so new members must be
+    appended to the enum, never inserted or reordered.
+    """
+
+    def __init__(self, *args, enum, **kwargs):
+        self.enum = enum
+        self.codes = {value: code for code, value in enumerate(enum.values, start=1)}
+        self.values = {code: value for value, code in self.codes.items()}
+        kwargs.setdefault("choices", enum.choices)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["enum"] = self.enum
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # The range validators of integer fields would compare the string values with numbers.
+        return [*self.default_validators, *self._validators]
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+        if isinstance(value, int) and value in self.values:
+            return self.values[value]
+        raise exceptions.ValidationError(
+            self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value}
+        )
+
+    def get_prep_value(self, value):
+        value = models.Field.get_prep_value(self, value)
+        if value is None:
+            return None
+        try:
+            return self.codes[value]
+        except KeyError:
+            raise ValueError(f"Field '{self.name}' expected one of {', '.join(self.codes)} but got {value!r}.")
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else self.values[value]
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import logging
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(data) -> str:
+    """
+    SHA-256 of parsed request data, uploaded files included.
+
+    Hashing the parsed fields rather than the raw body keeps a retry matching when the client
+    picks a new multipart boundary or reorders the fields.
+    """
+    digest = hashlib.sha256()
+    if hasattr(data, "lists"):
+        fields = dict(data.lists())
+    elif isinstance(data, dict):
+        fields = {name: [value] for name, value in data.items()}
+    else:
+        fields = {"": [data]}
+
+    for name in sorted(fields):
+        digest.update(f"{name}\0".encode())
+        for value in fields[name]:
+            if hasattr(value, "chunks"):
+                for chunk in value.chunks():
+                    digest.update(chunk)
+                value.seek(0)
+            else:
+                digest.update(json.dumps(value, sort_keys=True, default=str).encode())
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def idempotent_response(scope: str, key: str, handler: Callable[[], Response], request_hash: str = "") -> Response:
+    """
+    Run `handler` at most once per (scope, key) and replay its response for retries.
+
+    The key is reserved by inserting its row in the same transaction as the work done by the
+    handler. On PostgreSQL a concurrent request with the same key blocks on the unique index
+    until the first transaction finishes: it then replays the committed response, or takes over
+    if the first request rolled back. Only successful responses are stored, so a failed request
+    can be retried with the same key.
+
+    The key is bound to `request_hash` (see `request_fingerprint`): reusing it for a different
+    request is rejected with 422 instead of replaying the response of another request.
+    """
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError({IDEMPOTENCY_KEY_HEADER: [f"Must be between 1 and {MAX_KEY_LENGTH} characters."]})
+
+    with transaction.atomic():
+        if (replay := _reserve(scope, key, request_hash)) is not None:
+            return replay
+
+        response = handler()
+
+        if status.is_success(response.status_code):
+            IdempotencyKey.objects.filter(scope=scope, key=key).update(
+                response_status=response.status_code, response_body=response.data
+            )
+        else:
+            IdempotencyKey.objects.filter(scope=scope, key=key).delete()
+
+    return response
+
+
+def _reserve(scope: str, key: str, request_hash: str) -> Response | None:
+    """Insert the key row, or return the stored response when the key was already used."""
+    now = timezone.now()
+    # Expired keys can be reused by a new request.
+    IdempotencyKey.objects.filter(scope=scope, key=key, expires_at__lte=now).delete()
+
+    try:
+        with transaction.atomic():
+            IdempotencyKey.objects.create(
+                scope=scope,
+                key=key,
+                request_hash=request_hash,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+        return None
+    except IntegrityError:
+        existing = IdempotencyKey.objects.get(scope=scope, key=key)
+
+    # Keys stored before requests were hashed have no hash and expire within IDEMPOTENCY_KEY_TTL.
+    if existing.request_hash and existing.request_hash != request_hash:
+        logger.warning(f"{scope} idempotency key {key} reused with a different request")
+        return Response(
+            {"detail": "This Idempotency-Key was already used with a different request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+
+    if existing.response_status is None:
+        # Only reachable on backends where the insert does not wait for the first request.
+        return Response(
+            {"detail": "A request with this Idempotency-Key is still being processed."},
+            status=status.HTTP_409_CONFLICT,
+        )
+
+    logger.info(f"Replaying stored response for {scope} idempotency key {key}")
+    return Response(existing.response_body, status=existing.response_status, headers={REPLAYED_HEADER: "true"})
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from core.metrics import export_metrics
+
+
+class Command(BaseCommand):
+    help = "Print the metrics of every process sharing METRICS_DIR in Prometheus text format."
+
+    def handle(self, *args, **options):
+        self.stdout.write(export_metrics(), ending="")
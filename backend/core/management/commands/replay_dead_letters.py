@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import EmailDeadLetter, EmailOutbox
+
+
+class Command(BaseCommand):
+    help = "Move dead-lettered emails back into the outbox in throttled batches once the provider has recovered."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100, help="Emails replayed per batch")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds to wait between batches")
+        parser.add_argument("--limit", type=int, default=None, help="Maximum number of emails to replay")
+        parser.add_argument("--recipient-domain", default=None, help="Only replay emails to this domain")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        limit = options["limit"]
+        queryset = EmailDeadLetter.objects.filter(replayed_at__isnull=True)
+        if domain := options["recipient_domain"]:
+            queryset = queryset.filter(recipient_email__iendswith=f"@{domain}")
+
+        replayed = 0
+        while limit is None or replayed < limit:
+            size = batch_size if limit is None else min(batch_size, limit - replayed)
+            # Replayed emails go through the outbox, so the bulk queue and the rate limits apply to them.
+            with transaction.atomic():
+                batch = list(queryset.select_for_update(skip_locked=True).order_by("id")[:size])
+                if not batch:
+                    break
+                EmailOutbox.objects.bulk_create([dead_letter.to_outbox() for dead_letter in batch])
+                EmailDeadLetter.objects.filter(pk__in=[dead_letter.pk for dead_letter in batch]).update(
+                    replayed_at=timezone.now()
+                )
+
+            replayed += len(batch)
+            self.stdout.write(f"Replayed {replayed} emails...")
+            if len(batch) < size or replayed == limit:
+                break
+            time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Dead letter replay complete: {replayed} emails queued"))
@@ -0,0 +1,28 @@
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+
+from core.async_dispatcher import AsyncEmailDispatcher
+
+
+class Command(BaseCommand):
+    help = "Deliver outbox emails with the asyncio dispatcher (use with EMAIL_DISPATCHER=asyncio)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=None, help="Deliveries in flight")
+        parser.add_argument("--per-domain", type=int, default=None, help="Deliveries in flight per recipient domain")
+        parser.add_argument("--batch-size", type=int, default=None, help="Outbox rows claimed at a time")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the outbox is empty")
+        parser.add_argument("--once", action="store_true", help="Exit once the outbox is empty")
+
+    def handle(self, *args, **options):
+        dispatcher = AsyncEmailDispatcher(
+            concurrency=options["concurrency"],
+            per_domain=options["per_domain"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            f"Async email dispatcher started: {dispatcher.concurrency} in flight, {dispatcher.per_domain} per domain"
+        )
+        # async_to_sync keeps the ORM calls of the dispatcher on this thread and its connection.
+        delivered = async_to_sync(dispatcher.run)(poll_interval=options["poll_interval"], once=options["once"])
+        self.stdout.write(self.style.SUCCESS(f"Async email dispatcher stopped: {delivered} emails delivered"))
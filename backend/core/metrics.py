@@ -0,0 +1,244 @@
+"""
+Minimal Prometheus-style metrics shared by the API and the Celery workers.
+
+Each process records into its own in-memory registry. When METRICS_DIR is set, processes also
+write their snapshot to that directory (one file per host and pid, every METRICS_FLUSH_INTERVAL
+seconds), and export_metrics() merges every snapshot found there, so one scrape of the API covers
+all worker processes. A process removes its file when it shuts down; files not rewritten for
+METRICS_STALE_AFTER seconds are left by processes that died and are dropped. This is the same
+model as the prometheus_client multiprocess mode, without the extra dependency.
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 3600)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _export(self, value):
+        return value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            series = [[list(key), self._export(value)] for key, value in self._series.items()]
+        return {"kind": self.kind, "help": self.documentation, "labelnames": list(self.labelnames), "series": series}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0.0) + amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._series.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            # Prometheus buckets are inclusive upper bounds; the extra last slot is +Inf.
+            counts[bisect_left(self.buckets, value)] += 1
+            self._series[key] = (counts, total + value)
+
+    def _export(self, value):
+        counts, total = value
+        return [list(counts), total]
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the wrapped block in seconds."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> dict:
+        return {**super().snapshot(), "buckets": list(self.buckets)}
+
+
+class MetricsRegistry:
+    """The metrics of one process."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+        self._keep_alive_pid = None
+        self._discarded = threading.Event()
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), **kwargs) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, **kwargs))
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    def flush(self, directory: str = None, force: bool = True) -> None:
+        """Write this process' snapshot to `directory` (METRICS_DIR by default), at most every flush interval."""
+        directory = directory or settings.METRICS_DIR
+        now = time.monotonic()
+        if not directory or self._discarded.is_set():
+            return
+        if not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL:
+            return
+        self._last_flush = now
+        self._keep_alive(directory)
+
+        path = self._path(directory)
+        temporary = path.with_suffix(".tmp")
+        with self._flush_lock:
+            temporary.write_text(json.dumps(self.snapshot()))
+            os.replace(temporary, path)
+
+    def discard(self, directory: str = None) -> None:
+        """Remove this process' snapshot when it shuts down, so its metrics stop being exported."""
+        directory = directory or settings.METRICS_DIR
+        self._discarded.set()
+        if directory:
+            with self._flush_lock:
+                self._path(directory).unlink(missing_ok=True)
+
+    @staticmethod
+    def _path(directory: str) -> Path:
+        # Containers sharing the directory each have their own PID namespace, so the pid alone can collide.
+        return Path(directory) / f"metrics-{socket.gethostname()}-{os.getpid()}.json"
+
+    def _keep_alive(self, directory: str) -> None:
+        """Rewrite the snapshot every flush interval, idle or not, so collect() can tell dead processes apart."""
+        # Threads do not survive a fork, so a forked worker starts its own.
+        if self._keep_alive_pid == os.getpid():
+            return
+        self._keep_alive_pid = os.getpid()
+
+        def rewrite():
+            while not self._discarded.wait(settings.METRICS_FLUSH_INTERVAL):
+                try:
+                    self.flush(directory, force=False)
+                except OSError:
+                    continue
+
+        threading.Thread(target=rewrite, name="metrics-keep-alive", daemon=True).start()
+
+    def collect(self, directory: str = None) -> list[dict]:
+        """Snapshots of every process: the files in `directory`, or only this process without one."""
+        directory = directory or settings.METRICS_DIR
+        if not directory:
+            return [self.snapshot()]
+
+        self.flush(directory)
+        stale_before = time.time() - settings.METRICS_STALE_AFTER
+        snapshots = []
+        for path in sorted(Path(directory).glob("metrics-*.json")):
+            try:
+                if path.stat().st_mtime < stale_before:
+                    # Left by a process that died without removing it; its metrics went with it.
+                    path.unlink(missing_ok=True)
+                    continue
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # Removed or half written by a process that is shutting down; it is picked up next time.
+                continue
+        return snapshots
+
+
+def merge_snapshots(snapshots: list[dict]) -> dict:
+    """Sum the series of the same metric across process snapshots."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            target = merged.setdefault(name, {**metric, "series": {}})
+            for labels, value in metric["series"]:
+                key = tuple(labels)
+                if metric["kind"] == "histogram":
+                    counts, total = target["series"].get(key) or ([0] * len(value[0]), 0.0)
+                    target["series"][key] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+                else:
+                    target["series"][key] = target["series"].get(key, 0.0) + value
+    return merged
+
+
+def _format_labels(labelnames, values, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_text(merged: dict) -> str:
+    """Render merged snapshots in the Prometheus text exposition format."""
+    lines = []
+    for name, metric in sorted(merged.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['kind']}")
+        labelnames = metric["labelnames"]
+        for key, value in sorted(metric["series"].items()):
+            if metric["kind"] == "histogram":
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip([*metric["buckets"], "+Inf"], counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, key)} {total}")
+                lines.append(f"{name}_count{_format_labels(labelnames, key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_format_labels(labelnames, key)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+TASK_QUEUE_LATENCY = registry.histogram(
+    "celery_task_queue_latency_seconds", "Time from publishing a task (or its ETA) to a worker starting it.", ("task",)
+)
+TASK_RUNTIME = registry.histogram("celery_task_runtime_seconds", "Task run time.", ("task", "state"))
+TASK_RETRIES = registry.histogram(
+    "celery_task_retries", "Retries a task needed before it finished.", ("task",), buckets=(0, 1, 2, 3, 5, 10)
+)
+TASK_RETRIED = registry.counter("celery_task_retried_total", "Task retries scheduled.", ("task",))
+TASK_FAILURES = registry.counter("celery_task_failures_total", "Tasks that raised an exception.", ("task",))
+EMAIL_RENDER_TIME = registry.histogram("email_render_seconds", "Time spent rendering an email.", ("template",))
+EMAIL_SEND_TIME = registry.histogram("email_send_seconds", "Time spent handing an email to the email backend.")
+
+
+def export_metrics() -> str:
+    """Metrics of every process sharing METRICS_DIR (or of this process only) in Prometheus text format."""
+    return render_text(merge_snapshots(registry.collect()))
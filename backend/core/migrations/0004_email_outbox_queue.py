@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_rate_limit_bucket'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='emailoutbox',
+            name='email_outbox_pending_idx',
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=5),
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='queue',
+            field=models.CharField(choices=[('email.transactional', 'Transactional'), ('email.bulk', 'Bulk')], default='email.transactional', max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(condition=models.Q(('dispatched_at__isnull', True)), fields=['-priority', 'id'], name='email_outbox_pending_idx'),
+        ),
+    ]
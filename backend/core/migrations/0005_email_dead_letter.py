@@ -0,0 +1,33 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_email_outbox_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailDeadLetter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('template_name', models.CharField(max_length=100)),
+                ('subject', models.CharField(max_length=255)),
+                ('recipient_email', models.EmailField(max_length=254)),
+                ('recipient_name', models.CharField(blank=True, max_length=255)),
+                ('context', models.JSONField(default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('attempts', models.PositiveSmallIntegerField(default=1)),
+                ('failed_at', models.DateTimeField(auto_now_add=True)),
+                ('replayed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'email_dead_letters',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('replayed_at__isnull', True)), fields=['id'], name='email_dead_letters_pending_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-19 10:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_email_dead_letter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='available_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='coalesce_key',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='emailoutbox',
+            index=models.Index(condition=models.Q(('dispatched_at__isnull', True), models.Q(('coalesce_key', ''), _negated=True)), fields=['coalesce_key'], name='email_outbox_coalesce_idx'),
+        ),
+    ]
@@ -0,0 +1,158 @@
+from django.db import models
+from django.utils import timezone
+
+
+class EmailOutbox(models.Model):
+    """
+    Notification emails waiting to be handed to Celery.
+
+    Rows are written in the same transaction as the data they describe, so an email is only
+    ever queued for committed changes and the request never waits on the broker.
+    """
+
+    class Queue(models.TextChoices):
+        # Names of the Celery queues declared in config/celery.py.
+        TRANSACTIONAL = "email.transactional", "Transactional"
+        BULK = "email.bulk", "Bulk"
+
+    # Broker priorities (RabbitMQ delivers higher values first, up to task_queue_max_priority).
+    HIGH_PRIORITY = 9
+    NORMAL_PRIORITY = 5
+    LOW_PRIORITY = 0
+
+    template_name = models.CharField(max_length=100)
+    subject = models.CharField(max_length=255)
+    recipient_email = models.EmailField()
+    recipient_name = models.CharField(max_length=255, blank=True)
+    context = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    queue = models.CharField(max_length=50, choices=Queue.choices, default=Queue.TRANSACTIONAL)
+    priority = models.PositiveSmallIntegerField(default=NORMAL_PRIORITY)
+    # Pending emails sharing a coalesce key are merged into one; the row is held back until available_at.
+    coalesce_key = models.CharField(max_length=100, blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    # Failed delivery attempts, counted by the asyncio dispatcher (Celery tracks its own retries).
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        db_table = "email_outbox"
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["-priority", "id"],
+                condition=models.Q(dispatched_at__isnull=True),
+                name="email_outbox_pending_idx",
+            ),
+            models.Index(
+                fields=["coalesce_key"],
+                condition=models.Q(dispatched_at__isnull=True) & ~models.Q(coalesce_key=""),
+                name="email_outbox_coalesce_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.template_name} -> {self.recipient_email}"
+
+    def task_kwargs(self) -> dict:
+        """Keyword arguments for send_email_task."""
+        return {
+            "template_name": self.template_name,
+            "context": self.context,
+            "subject": self.subject,
+            "recipient_email": self.recipient_email,
+            "recipient_name": self.recipient_name or None,
+        }
+
+
+class EmailDeadLetter(models.Model):
+    """
+    Email that still failed after its last retry, kept with the error for a later replay.
+
+    Replaying (see the replay_dead_letters command) copies the message back into the outbox.
+    """
+
+    template_name = models.CharField(max_length=100)
+    subject = models.CharField(max_length=255)
+    recipient_email = models.EmailField()
+    recipient_name = models.CharField(max_length=255, blank=True)
+    context = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveSmallIntegerField(default=1)
+    failed_at = models.DateTimeField(auto_now_add=True)
+    replayed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_dead_letters"
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"], condition=models.Q(replayed_at__isnull=True), name="email_dead_letters_pending_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.template_name} -> {self.recipient_email}"
+
+    def to_outbox(self) -> EmailOutbox:
+        """Unsaved outbox row resending this email on the bulk queue."""
+        return EmailOutbox(
+            template_name=self.template_name,
+            subject=self.subject,
+            recipient_email=self.recipient_email,
+            recipient_name=self.recipient_name,
+            context=self.context,
+            queue=EmailOutbox.Queue.BULK,
+            priority=EmailOutbox.LOW_PRIORITY,
+        )
+
+
+class IdempotencyKey(models.Model):
+    """Response stored for a client supplied Idempotency-Key so retries can be replayed."""
+
+    scope = models.CharField(max_length=100)
+    key = models.CharField(max_length=255)
+    # SHA-256 of the request the key was first used with; a replay must match it.
+    request_hash = models.CharField(max_length=64, blank=True, default="")
+    # Both stay NULL while the first request is still being processed.
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        db_table = "idempotency_keys"
+        constraints = [
+            models.UniqueConstraint(fields=["scope", "key"], name="idempotency_keys_scope_key_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.scope}: {self.key}"
+
+
+class RateLimitBucket(models.Model):
+    """Token bucket state shared by every worker, updated with single conditional UPDATE statements."""
+
+    key = models.CharField(max_length=255, primary_key=True)
+    tokens = models.FloatField()
+    # Unix timestamp of the last refill, kept as a float so the refill is plain arithmetic in SQL.
+    updated_at = models.FloatField()
+
+    class Meta:
+        db_table = "rate_limit_buckets"
+
+    def __str__(self):
+        return f"{self.key}: {self.tokens:.2f}"
+
+
+class TaskWatermark(models.Model):
+    """High-water mark of a periodic task, so each run only processes what changed since the last one."""
+
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.DateTimeField()
+
+    class Meta:
+        db_table = "task_watermarks"
+
+    def __str__(self):
+        return f"{self.name}: {self.value.isoformat()}"
@@ -1,19 +1,98 @@
 import logging
+import smtplib
+import threading
 from typing import Any
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection, send_mail
+from django.template.loader import get_template, render_to_string
+
+from .metrics import EMAIL_RENDER_TIME, EMAIL_SEND_TIME
 
 logger = logging.getLogger(__name__)
 
+# Templates compiled into the cached loader when a worker process starts.
+EMAIL_TEMPLATES = ("registration_confirmation", "status_update", "admin_digest")
+EMAIL_TEMPLATE_EXTENSIONS = ("html", "txt")
+
+# Errors after which a cached SMTP connection is considered dead and reopened once.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError)
+
+
+class EmailDeliveryError(Exception):
+    """Raised when the email backend did not accept the message."""
+
 
 class NotificationService:
     """Simple notification service for sending emails."""
 
+    # One warm email connection per worker process (and thread), reused across messages so
+    # every email does not pay for a new TCP connection, TLS handshake and login.
+    _local = threading.local()
+
+    @classmethod
+    def get_connection(cls):
+        """Return the warm email connection of the current worker, opening it if needed."""
+        connection = getattr(cls._local, "connection", None)
+        if connection is None:
+            connection = get_connection(fail_silently=False)
+            cls._local.connection = connection
+        # Opening explicitly keeps the backend from closing the connection after each send.
+        connection.open()
+        return connection
+
+    @classmethod
+    def close_connection(cls) -> None:
+        """Close the warm email connection of the current worker, if any."""
+        connection = getattr(cls._local, "connection", None)
+        cls._local.connection = None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing email connection: {str(e)}")
+
+    @classmethod
+    def _with_connection(cls, send):
+        """Call `send(connection)`, reconnecting once if the cached connection went stale."""
+        with EMAIL_SEND_TIME.time():
+            try:
+                return send(cls.get_connection())
+            except CONNECTION_ERRORS as e:
+                logger.warning(f"Email connection lost, reconnecting: {str(e)}")
+                cls.close_connection()
+                return send(cls.get_connection())
+
     @staticmethod
+    def warm_templates() -> None:
+        """
+        Load and compile every email template ahead of the first message.
+
+        Django's cached template loader keeps the compiled templates for the life of the process,
+        so warming them at worker start moves parsing off the send path entirely.
+        """
+        for template_name in EMAIL_TEMPLATES:
+            for extension in EMAIL_TEMPLATE_EXTENSIONS:
+                get_template(f"emails/{template_name}.{extension}")
+        logger.info(f"Warmed {len(EMAIL_TEMPLATES) * len(EMAIL_TEMPLATE_EXTENSIONS)} email templates")
+
+    @staticmethod
+    def render_email(template_name: str, context: dict[str, Any]) -> tuple[str, str]:
+        """Render the HTML and plain text bodies of an email template."""
+        with EMAIL_RENDER_TIME.time(template=template_name):
+            html_message = render_to_string(f"emails/{template_name}.html", context)
+            plain_message = render_to_string(f"emails/{template_name}.txt", context)
+        return html_message, plain_message
+
+    @classmethod
     def send_email(
-        template_name: str, context: dict[str, Any], subject: str, recipient_email: str, recipient_name: str = None
+        cls,
+        template_name: str,
+        context: dict[str, Any],
+        subject: str,
+        recipient_email: str,
+        recipient_name: str = None,
+        fail_silently: bool = True,
     ) -> bool:
         """
         Send email using template and context.
@@ -24,6 +103,7 @@ class NotificationService:
             subject: Email subject
             recipient_email: Recipient email address
             recipient_name: Recipient name (optional)
+            fail_silently: Return False instead of raising on errors (default True)
 
         Returns:
             bool: True if email sent successfully, False otherwise
@@ -34,26 +114,69 @@ class NotificationService:
                 context["recipient_name"] = recipient_name
 
             # Render templates
-            html_message = render_to_string(f"emails/{template_name}.html", context)
-            plain_message = render_to_string(f"emails/{template_name}.txt", context)
+            html_message, plain_message = cls.render_email(template_name, context)
 
-            # Send email
-            success = send_mail(
-                subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[recipient_email],
-                html_message=html_message,
-                fail_silently=False,
+            # Send email over the worker's warm connection
+            success = cls._with_connection(
+                lambda connection: send_mail(
+                    subject=subject,
+                    message=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    recipient_list=[recipient_email],
+                    html_message=html_message,
+                    fail_silently=False,
+                    connection=connection,
+                )
             )
 
             if success:
                 logger.info(f"Email sent successfully to {recipient_email}: {subject}")
                 return True
             else:
-                logger.error(f"Failed to send email to {recipient_email}: {subject}")
-                return False
+                raise EmailDeliveryError(f"Email backend accepted no message for {recipient_email}")
 
         except Exception as e:
             logger.error(f"Error sending email to {recipient_email}: {str(e)}")
+            if not fail_silently:
+                raise
             return False
+
+    @classmethod
+    def send_email_batch(cls, messages: list[dict[str, Any]]) -> list[str | None]:
+        """
+        Send many emails over a single connection.
+
+        Args:
+            messages: Dicts with the keyword arguments of send_email (template_name, context,
+                subject, recipient_email and optionally recipient_name)
+
+        Returns:
+            list[str | None]: Per-message result in the order of `messages`: None if delivered,
+                the error otherwise
+        """
+        results = []
+        for message in messages:
+            recipient_email = message["recipient_email"]
+            try:
+                context = dict(message["context"])
+                if recipient_name := message.get("recipient_name"):
+                    context["recipient_name"] = recipient_name
+
+                html_message, plain_message = cls.render_email(message["template_name"], context)
+                email = EmailMultiAlternatives(
+                    subject=message["subject"],
+                    body=plain_message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[recipient_email],
+                )
+                email.attach_alternative(html_message, "text/html")
+
+                sent = cls._with_connection(lambda connection: connection.send_messages([email]))
+                results.append(None if sent else "The email backend did not send the message")
+
+            except Exception as e:
+                logger.error(f"Error sending email to {recipient_email}: {str(e)}")
+                results.append(str(e) or e.__class__.__name__)
+
+        logger.info(f"Email batch sent: {results.count(None)}/{len(messages)} delivered")
+        return results
@@ -0,0 +1,123 @@
+import re
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Func, Value
+from django.db.models.functions import Least
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .models import RateLimitBucket
+
+_RATE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*/\s*([smh])\s*$")
+_PERIODS = {"s": 1, "m": 60, "h": 60 * 60}
+
+
+@dataclass(frozen=True)
+class Rate:
+    """Bucket capacity and refill speed."""
+
+    capacity: float
+    per_second: float
+
+
+def parse_rate(value: str) -> Rate:
+    """Parse a Celery style rate such as "100/m" into a bucket allowing that burst and average."""
+    if not (match := _RATE_RE.match(value)):
+        raise ValueError(f"Invalid rate {value!r}, expected '<number>/<s|m|h>'")
+    amount = float(match.group(1))
+    if not amount:
+        raise ValueError(f"Invalid rate {value!r}, the amount must be greater than zero")
+    return Rate(capacity=amount, per_second=amount / _PERIODS[match.group(2)])
+
+
+class DatabaseTime(Func):
+    """Current Unix time on the database server, so every worker refills the buckets by the same clock."""
+
+    template = "EXTRACT(EPOCH FROM clock_timestamp())"
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="((julianday('now') - 2440587.5) * 86400.0)")
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template="UNIX_TIMESTAMP(NOW(6))")
+
+
+class TokenBucket:
+    """
+    Token bucket stored in the database so every worker draws from the same budget.
+
+    Refilling and taking a token happen in one conditional UPDATE, so concurrent workers never
+    oversubscribe the bucket and no row locks are held between statements. Elapsed time is measured
+    by the database clock, so clock skew between workers cannot inflate or drain the bucket.
+    """
+
+    def __init__(self, key: str, rate: Rate):
+        self.key = key
+        self.rate = rate
+
+    def _refilled(self):
+        elapsed = DatabaseTime() - F("updated_at")
+        return Least(
+            Value(self.rate.capacity, output_field=FloatField()),
+            F("tokens") + elapsed * Value(self.rate.per_second, output_field=FloatField()),
+        )
+
+    def acquire(self) -> float:
+        """
+        Take one token.
+
+        Returns:
+            float: 0 if a token was taken, otherwise the number of seconds until one is available
+        """
+        refilled = self._refilled()
+        if RateLimitBucket.objects.filter(GreaterThanOrEqual(refilled, 1), key=self.key).update(
+            tokens=refilled - 1, updated_at=DatabaseTime()
+        ):
+            return 0.0
+
+        bucket = RateLimitBucket.objects.filter(key=self.key).annotate(available=refilled)
+        available = bucket.values_list("available", flat=True).first()
+        if available is None:
+            try:
+                with transaction.atomic():
+                    RateLimitBucket.objects.create(
+                        key=self.key, tokens=self.rate.capacity - 1, updated_at=DatabaseTime()
+                    )
+                return 0.0
+            except IntegrityError:
+                # Another worker created the bucket first; compete for its tokens instead.
+                return self.acquire()
+
+        return max((1 - available) / self.rate.per_second, 0.001)
+
+    def release(self) -> None:
+        """Give back a token taken by acquire() that ended up unused."""
+        RateLimitBucket.objects.filter(key=self.key).update(
+            tokens=Least(Value(self.rate.capacity, output_field=FloatField()), F("tokens") + 1)
+        )
+
+
+def email_rate_limit_delay(recipient_email: str) -> float:
+    """
+    Take a token from the recipient domain bucket and the provider-wide bucket.
+
+    Returns:
+        float: 0 if the email may be sent now, otherwise the seconds to defer it by
+    """
+    domain = recipient_email.rsplit("@", 1)[-1].lower()
+    buckets = []
+    if domain_rate := settings.EMAIL_DOMAIN_RATE_LIMITS.get(domain, settings.EMAIL_DOMAIN_RATE_LIMIT):
+        buckets.append(TokenBucket(f"email:domain:{domain}", parse_rate(domain_rate)))
+    if settings.EMAIL_PROVIDER_RATE_LIMIT:
+        buckets.append(TokenBucket("email:provider", parse_rate(settings.EMAIL_PROVIDER_RATE_LIMIT)))
+
+    acquired = []
+    for bucket in buckets:
+        if delay := bucket.acquire():
+            for taken in acquired:
+                taken.release()
+            return delay
+        acquired.append(bucket)
+    return 0.0
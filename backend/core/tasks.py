@@ -1,13 +1,57 @@
 import logging
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 from celery import shared_task
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    task_retry,
+    worker_process_init,
+    worker_process_shutdown,
+)
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
 
-from .notification_service import NotificationService
+from .metrics import TASK_FAILURES, TASK_QUEUE_LATENCY, TASK_RETRIED, TASK_RETRIES, TASK_RUNTIME, registry
+from .models import EmailDeadLetter, EmailOutbox, IdempotencyKey
+from .notification_service import EmailDeliveryError, NotificationService
+from .rate_limit import email_rate_limit_delay
 
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def retry_backoff(retries: int) -> int:
+    """Seconds before the next attempt: exponential in `retries`, capped, with full jitter."""
+    return get_exponential_backoff_interval(
+        factor=settings.EMAIL_RETRY_BACKOFF,
+        retries=retries,
+        maximum=settings.EMAIL_RETRY_BACKOFF_MAX,
+        full_jitter=True,
+    )
+
+
+def dead_letter_email(message: dict, error: str, attempts: int) -> EmailDeadLetter:
+    """Persist an email that exhausted its retries so it can be replayed later."""
+    logger.error(f"Email to {message['recipient_email']} failed after {attempts} attempts, dead-lettered: {error}")
+    return EmailDeadLetter.objects.create(
+        template_name=message["template_name"],
+        subject=message["subject"],
+        recipient_email=message["recipient_email"],
+        recipient_name=message.get("recipient_name") or "",
+        context=message["context"],
+        error=error,
+        attempts=attempts,
+    )
+
+
+@shared_task(bind=True, max_retries=settings.EMAIL_MAX_RETRIES)
 def send_email_task(
     self, template_name: str, context: dict, subject: str, recipient_email: str, recipient_name: str = None
 ) -> bool:
@@ -21,9 +65,28 @@ def send_email_task(
         recipient_email: Recipient email
         recipient_name: Recipient name (optional)
 
+    Failures are retried with exponential backoff and jitter; once the retries are exhausted the
+    email is stored as a dead letter (see the replay_dead_letters command).
+
     Returns:
         bool: True if email sent successfully
     """
+    if delay := email_rate_limit_delay(recipient_email):
+        # Requeue instead of sleeping so the worker slot is free for mail to other domains.
+        countdown = delay * (1 + random.random())
+        logger.info(f"Email rate limit reached for {recipient_email}, deferring by {countdown:.1f}s")
+        # signature_from_request keeps the queue and priority the email was published with.
+        self.signature_from_request(
+            kwargs={
+                "template_name": template_name,
+                "context": context,
+                "subject": subject,
+                "recipient_email": recipient_email,
+                "recipient_name": recipient_name,
+            }
+        ).apply_async(countdown=countdown)
+        return False
+
     try:
         success = NotificationService.send_email(
             template_name=template_name,
@@ -31,17 +94,218 @@ def send_email_task(
             subject=subject,
             recipient_email=recipient_email,
             recipient_name=recipient_name,
+            fail_silently=False,
         )
+        if not success:
+            raise EmailDeliveryError(f"Email backend accepted no message for {recipient_email}")
 
-        if success:
-            logger.info(f"Email task completed successfully for {recipient_email}")
-            return True
-        else:
-            logger.error(f"Email task failed for {recipient_email}")
-            return False
+        logger.info(f"Email task completed successfully for {recipient_email}")
+        return True
 
     except Exception as exc:
         logger.error(f"Email task error for {recipient_email}: {str(exc)}")
         if self.request.retries < self.max_retries:
-            raise self.retry(exc=exc)
+            raise self.retry(exc=exc, countdown=retry_backoff(self.request.retries))
+
+        dead_letter_email(
+            {
+                "template_name": template_name,
+                "context": context,
+                "subject": subject,
+                "recipient_email": recipient_email,
+                "recipient_name": recipient_name,
+            },
+            error=str(exc),
+            attempts=self.request.retries + 1,
+        )
         return False
+
+
+@shared_task(bind=True, max_retries=settings.EMAIL_MAX_RETRIES)
+def send_email_batch_task(self, messages: list[dict]) -> int:
+    """
+    Celery task to send many emails over one SMTP connection.
+
+    Args:
+        messages: Dicts with the keyword arguments of send_email_task
+
+    Returns:
+        int: Number of emails sent successfully
+    """
+    allowed, deferred, max_delay = [], [], 0.0
+    for message in messages:
+        if delay := email_rate_limit_delay(message["recipient_email"]):
+            deferred.append(message)
+            max_delay = max(max_delay, delay)
+        else:
+            allowed.append(message)
+
+    if deferred:
+        countdown = max_delay * (1 + random.random())
+        logger.info(f"Email rate limit reached for {len(deferred)} emails, deferring them by {countdown:.1f}s")
+        self.signature_from_request(kwargs={"messages": deferred}).apply_async(countdown=countdown)
+
+    errors = NotificationService.send_email_batch(allowed) if allowed else []
+    failed = [(message, error) for message, error in zip(allowed, errors) if error is not None]
+
+    if failed and self.request.retries < self.max_retries:
+        logger.error(f"Email batch task failed for {len(failed)} of {len(allowed)} emails, retrying them")
+        raise self.retry(
+            kwargs={"messages": [message for message, _ in failed]}, countdown=retry_backoff(self.request.retries)
+        )
+
+    for message, error in failed:
+        dead_letter_email(message, error=error, attempts=self.request.retries + 1)
+
+    return len(allowed) - len(failed)
+
+
+@worker_process_init.connect
+def warm_email_templates(**kwargs):
+    """Compile the email templates in each worker process before it takes its first task."""
+    try:
+        NotificationService.warm_templates()
+    except Exception as e:
+        logger.error(f"Error warming email templates: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs):
+    """Close the warm SMTP connection when a worker process exits."""
+    NotificationService.close_connection()
+
+
+@worker_process_shutdown.connect
+def discard_task_metrics(**kwargs):
+    """Stop exporting the metrics of a worker process that exits; its replacement starts from zero."""
+    registry.discard()
+
+
+@before_task_publish.connect
+def stamp_enqueue_time(headers=None, **kwargs):
+    """Record when a task was published; custom headers show up on the worker's task.request."""
+    if headers is not None:
+        headers["enqueued_at"] = time.time()
+
+
+@task_prerun.connect
+def record_task_start(task=None, **kwargs):
+    """Observe how long the task waited in the broker and start its run time clock."""
+    task.request.started_at = time.perf_counter()
+    enqueued_at = getattr(task.request, "enqueued_at", None)
+    if enqueued_at is None:
+        return
+    # A countdown or retry delay is intended waiting, so latency is measured from the ETA.
+    if eta := task.request.eta:
+        enqueued_at = max(enqueued_at, datetime.fromisoformat(eta).timestamp())
+    TASK_QUEUE_LATENCY.observe(max(time.time() - enqueued_at, 0.0), task=task.name)
+
+
+@task_postrun.connect
+def record_task_end(task=None, state=None, **kwargs):
+    """Observe task run time and, once the task is done, how many retries it took."""
+    if (started_at := getattr(task.request, "started_at", None)) is not None:
+        TASK_RUNTIME.observe(time.perf_counter() - started_at, task=task.name, state=state)
+    if state != "RETRY":
+        TASK_RETRIES.observe(task.request.retries or 0, task=task.name)
+    registry.flush(force=False)
+
+
+@task_retry.connect
+def record_task_retry(sender=None, **kwargs):
+    """Count scheduled retries."""
+    TASK_RETRIED.inc(task=sender.name)
+
+
+@task_failure.connect
+def record_task_failure(sender=None, **kwargs):
+    """Count tasks that raised."""
+    TASK_FAILURES.inc(task=sender.name)
+
+
+@shared_task
+def dispatch_email_outbox_task(batch_size: int = None) -> int:
+    """
+    Drain committed outbox rows into Celery in batches.
+
+    Transactional emails are published one send_email_task each; bulk emails are grouped by
+    priority into send_email_batch_task calls of up to EMAIL_BULK_BATCH_SIZE emails, each sent over
+    one SMTP connection. Transactional rows are claimed ahead of bulk ones so a large bulk backlog
+    never delays them. Rows are claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED so several dispatchers can run side by side, and each batch
+    is published over a single broker connection. Only messages that were actually published are
+    marked as dispatched; the rest are picked up by the next run.
+
+    Returns:
+        int: Number of emails handed to Celery
+    """
+    if settings.EMAIL_DISPATCHER == "asyncio":
+        # The outbox is drained by the run_email_dispatcher command instead.
+        return 0
+
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    dispatched = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                EmailOutbox.objects.select_for_update(skip_locked=True)
+                .filter(dispatched_at__isnull=True, available_at__lte=timezone.now())
+                .order_by("-priority", "id")[:batch_size]
+            )
+            if not batch:
+                break
+
+            published = []
+            bulk = defaultdict(list)
+            try:
+                with send_email_task.app.producer_or_acquire() as producer:
+                    for message in batch:
+                        if message.queue == EmailOutbox.Queue.BULK:
+                            bulk[message.priority].append(message)
+                            continue
+                        send_email_task.apply_async(
+                            kwargs=message.task_kwargs(),
+                            queue=message.queue,
+                            priority=message.priority,
+                            producer=producer,
+                        )
+                        published.append(message.pk)
+
+                    for priority, messages in bulk.items():
+                        for start in range(0, len(messages), settings.EMAIL_BULK_BATCH_SIZE):
+                            group = messages[start : start + settings.EMAIL_BULK_BATCH_SIZE]
+                            send_email_batch_task.apply_async(
+                                kwargs={"messages": [message.task_kwargs() for message in group]},
+                                queue=EmailOutbox.Queue.BULK,
+                                priority=priority,
+                                producer=producer,
+                            )
+                            published.extend(message.pk for message in group)
+            except Exception as e:
+                logger.error(f"Email outbox dispatch interrupted after {len(published)} messages: {str(e)}")
+
+            EmailOutbox.objects.filter(pk__in=published).update(dispatched_at=timezone.now())
+
+        dispatched += len(published)
+        if len(published) < batch_size:
+            break
+
+    if dispatched:
+        logger.info(f"Dispatched {dispatched} emails from the outbox")
+    return dispatched
+
+
+@shared_task
+def purge_email_outbox_task() -> int:
+    """Delete dispatched outbox rows older than the retention period."""
+    cutoff = timezone.now() - timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS)
+    deleted, _ = EmailOutbox.objects.filter(dispatched_at__lt=cutoff).delete()
+    return deleted
+
+
+@shared_task
+def purge_idempotency_keys_task() -> int:
+    """Delete idempotency keys whose replay window has passed."""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
@@ -0,0 +1,21 @@
+from functools import lru_cache
+
+from django import template
+from django.template.loader import get_template
+from django.utils.safestring import SafeString, mark_safe
+
+register = template.Library()
+
+
+@lru_cache(maxsize=128)
+def render_status_message(new_status: str, extension: str) -> SafeString:
+    """Render the status-dependent explanation once per (status, format) and reuse it for every recipient."""
+    # strip() returns a plain str, which the calling template would escape again.
+    message = get_template(f"emails/status_update_message.{extension}").render({"new_status": new_status})
+    return mark_safe(message.strip())
+
+
+@register.simple_tag
+def status_message(new_status, extension="html"):
+    """Insert the memoized "what this means" block of the status update email."""
+    return render_status_message(str(new_status), extension)
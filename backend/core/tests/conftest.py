@@ -0,0 +1,16 @@
+import pytest
+
+
+def pytest_configure(config):
+    # pytest.ini is read under a [tool:pytest] header, so its marker list is not registered.
+    config.addinivalue_line("markers", "performance: benchmarks, run with -m performance or --benchmark-enable")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip the benchmarks in regular test runs unless `-m performance` or `--benchmark-enable` is given."""
+    if "performance" in (config.getoption("markexpr") or "") or config.getoption("benchmark_enable", False):
+        return
+    skip = pytest.mark.skip(reason="benchmark; run with -m performance or --benchmark-enable")
+    for item in items:
+        if item.get_closest_marker("performance"):
+            item.add_marker(skip)
@@ -0,0 +1,48 @@
+import asyncio
+import socket
+
+from aiosmtpd.controller import Controller
+
+
+class SMTPSink:
+    """Local SMTP server that accepts and counts messages, for benchmarks."""
+
+    def __init__(self, latency: float = 0):
+        # Seconds each DATA command takes, standing in for the network and provider round trip.
+        self.latency = latency
+        self.messages = 0
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.controller = None
+
+    @property
+    def port(self) -> int:
+        return self.controller.port
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        self.messages += 1
+        return "250 Message accepted for delivery"
+
+    def __enter__(self):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            port = probe.getsockname()[1]
+        self.controller = Controller(self, hostname="127.0.0.1", port=port)
+        self.controller.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.controller.stop()
@@ -0,0 +1,160 @@
+import socket
+from io import StringIO
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.async_dispatcher import AsyncEmailDispatcher
+from core.models import EmailDeadLetter, EmailOutbox
+from core.rate_limit import email_rate_limit_delay
+from core.tests.smtp_sink import SMTPSink
+
+
+def unused_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+class TestAsyncEmailDispatcher(TestCase):
+    """Tests for the asyncio outbox dispatcher against a local SMTP server."""
+
+    def setUp(self):
+        self.sink = SMTPSink().__enter__()
+        self.addCleanup(self.sink.__exit__, None, None, None)
+        smtp_settings = override_settings(
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=self.sink.port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER="",
+            EMAIL_HOST_PASSWORD="",
+        )
+        smtp_settings.enable()
+        self.addCleanup(smtp_settings.disable)
+
+    def create_outbox_email(self, recipient_email="jane@example.com", **kwargs):
+        return EmailOutbox.objects.create(
+            template_name="registration_confirmation",
+            context={"department": "it", "application_id": "123"},
+            subject="Application Received",
+            recipient_email=recipient_email,
+            recipient_name="Jane Doe",
+            **kwargs,
+        )
+
+    def test_command_drains_outbox(self):
+        """Test every pending email is delivered and marked dispatched."""
+        emails = [self.create_outbox_email(f"user{i}@example.com") for i in range(5)]
+
+        out = StringIO()
+        call_command("run_email_dispatcher", once=True, concurrency=3, stdout=out)
+
+        self.assertEqual(self.sink.messages, 5)
+        self.assertIn("5 emails delivered", out.getvalue())
+        for email in emails:
+            email.refresh_from_db()
+            self.assertIsNotNone(email.dispatched_at)
+
+    def test_connections_are_reused(self):
+        """Test deliveries share pooled SMTP connections instead of one per message."""
+        for i in range(20):
+            self.create_outbox_email(f"user{i}@example.com")
+
+        async_to_sync(AsyncEmailDispatcher(concurrency=4).run)(once=True)
+
+        self.assertEqual(self.sink.messages, 20)
+        self.assertLessEqual(self.sink.connections, 4)
+
+    def test_per_domain_limit(self):
+        """Test deliveries to one domain never exceed the per-domain limit."""
+        self.sink.latency = 0.05
+        messages = [
+            {
+                "template_name": "registration_confirmation",
+                "context": {},
+                "subject": "Application Received",
+                "recipient_email": f"user{i}@example.com",
+            }
+            for i in range(8)
+        ]
+
+        errors = async_to_sync(AsyncEmailDispatcher(concurrency=8, per_domain=2).deliver_all)(messages)
+
+        self.assertEqual(errors, [None] * 8)
+        self.assertEqual(self.sink.max_in_flight, 2)
+
+    def test_failed_delivery_is_retried_later(self):
+        """Test an undeliverable email stays pending with a backoff and an attempt counted."""
+        email = self.create_outbox_email()
+
+        # Full jitter can pick no delay at all, which would retry the email within the same run.
+        with override_settings(EMAIL_PORT=unused_port()), patch("core.async_dispatcher.retry_backoff", return_value=30):
+            self.assertEqual(async_to_sync(AsyncEmailDispatcher().run)(once=True), 0)
+
+        email.refresh_from_db()
+        self.assertIsNone(email.dispatched_at)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.available_at, timezone.now())
+
+    def test_rate_limit_error_fails_only_its_email(self):
+        """Test a failing rate limit lookup is retried like a failed send and the rest of the batch is delivered."""
+        failing, other = self.create_outbox_email("a@example.com"), self.create_outbox_email("b@example.org")
+
+        def rate_limit_delay(recipient_email):
+            if recipient_email == failing.recipient_email:
+                raise RuntimeError("database unavailable")
+            return email_rate_limit_delay(recipient_email)
+
+        with patch("core.async_dispatcher.email_rate_limit_delay", side_effect=rate_limit_delay), patch(
+            "core.async_dispatcher.retry_backoff", return_value=30
+        ):
+            self.assertEqual(async_to_sync(AsyncEmailDispatcher().run)(once=True), 1)
+
+        failing.refresh_from_db()
+        other.refresh_from_db()
+        self.assertIsNotNone(other.dispatched_at)
+        self.assertIsNone(failing.dispatched_at)
+        self.assertEqual(failing.attempts, 1)
+
+    @override_settings(EMAIL_DOMAIN_RATE_LIMIT="1/m")
+    def test_throttled_domain_is_deferred(self):
+        """Test a rate-limited email goes back to the outbox without blocking other domains or counting an attempt."""
+        first, throttled = self.create_outbox_email("a@example.com"), self.create_outbox_email("b@example.com")
+        other = self.create_outbox_email("c@example.org")
+
+        self.assertEqual(async_to_sync(AsyncEmailDispatcher().run)(once=True), 2)
+
+        for email in (first, throttled, other):
+            email.refresh_from_db()
+        self.assertIsNotNone(first.dispatched_at)
+        self.assertIsNotNone(other.dispatched_at)
+        self.assertIsNone(throttled.dispatched_at)
+        self.assertEqual(throttled.attempts, 0)
+        self.assertGreater(throttled.available_at, timezone.now())
+
+    @override_settings(EMAIL_MAX_RETRIES=2)
+    def test_exhausted_delivery_is_dead_lettered(self):
+        """Test an email failing its last attempt is moved to the dead letters."""
+        email = self.create_outbox_email(attempts=2)
+
+        with override_settings(EMAIL_PORT=unused_port()):
+            async_to_sync(AsyncEmailDispatcher().run)(once=True)
+
+        email.refresh_from_db()
+        self.assertIsNotNone(email.dispatched_at)
+        dead_letter = EmailDeadLetter.objects.get()
+        self.assertEqual(dead_letter.recipient_email, "jane@example.com")
+        self.assertEqual(dead_letter.attempts, 3)
+
+    @override_settings(EMAIL_DISPATCHER="asyncio")
+    def test_celery_dispatcher_steps_aside(self):
+        """Test the beat dispatcher leaves the outbox alone when the asyncio dispatcher is used."""
+        from core.tasks import dispatch_email_outbox_task
+
+        self.create_outbox_email()
+
+        self.assertEqual(dispatch_email_outbox_task(), 0)
+        self.assertTrue(EmailOutbox.objects.filter(dispatched_at__isnull=True).exists())
@@ -0,0 +1,285 @@
+"""
+Throughput benchmarks for the email path against a local SMTP sink.
+
+Run with `pytest core/tests/test_benchmarks.py -m performance`; they are skipped when
+aiosmtpd or pytest-benchmark are not installed. Save a baseline with `--benchmark-autosave`
+and compare a branch against it with `--benchmark-compare --benchmark-compare-fail=mean:20%`.
+"""
+
+import multiprocessing
+import statistics
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings as django_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail import send_mail
+from django.utils import timezone
+
+pytest.importorskip("aiosmtpd")
+pytest.importorskip("pytest_benchmark")
+
+from core.async_dispatcher import AsyncEmailDispatcher  # noqa: E402
+from core.notification_service import NotificationService  # noqa: E402
+from core.tests.smtp_sink import SMTPSink  # noqa: E402
+
+MESSAGE_COUNT = 200
+# Provider round trip simulated by the sink in the dispatcher comparison, and the prefork pool it is compared to.
+SMTP_LATENCY = 0.02
+PREFORK_CONCURRENCY = 4
+ROUNDS = 3
+
+
+@pytest.fixture
+def smtp_sink(settings):
+    with SMTPSink() as sink:
+        settings.EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+        settings.EMAIL_HOST = "127.0.0.1"
+        settings.EMAIL_PORT = sink.port
+        settings.EMAIL_USE_TLS = False
+        settings.EMAIL_HOST_USER = ""
+        settings.EMAIL_HOST_PASSWORD = ""
+        NotificationService.close_connection()
+        yield sink
+        NotificationService.close_connection()
+
+
+@pytest.fixture
+def static_render():
+    with patch.object(NotificationService, "render_email", return_value=("<p>Hello</p>", "Hello")):
+        yield
+
+
+def rounds_run(benchmark) -> int:
+    # Under --benchmark-disable pedantic() calls the function once and collects no stats.
+    return 1 if benchmark.disabled else ROUNDS
+
+
+def report_throughput(benchmark, messages: int) -> None:
+    if not benchmark.disabled:
+        benchmark.extra_info["messages_per_second"] = messages / benchmark.stats["mean"]
+
+
+def build_messages(count: int) -> list[dict]:
+    return [
+        {
+            "template_name": "status_update",
+            "context": {"new_status": "under_review"},
+            "subject": "Application Status Updated",
+            "recipient_email": f"candidate{i}@example.com",
+            "recipient_name": f"Candidate {i}",
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.performance
+def test_benchmark_connection_per_message(benchmark, smtp_sink, static_render):
+    """Baseline: one SMTP connection per email, as send_mail does without a connection."""
+
+    def send_all():
+        for message in build_messages(MESSAGE_COUNT):
+            send_mail(
+                subject=message["subject"],
+                message="Hello",
+                from_email=django_settings.DEFAULT_FROM_EMAIL,
+                recipient_list=[message["recipient_email"]],
+                html_message="<p>Hello</p>",
+            )
+
+    benchmark.pedantic(send_all, rounds=ROUNDS, iterations=1)
+
+    assert smtp_sink.messages == rounds_run(benchmark) * MESSAGE_COUNT
+    assert smtp_sink.connections == rounds_run(benchmark) * MESSAGE_COUNT
+    report_throughput(benchmark, MESSAGE_COUNT)
+
+
+@pytest.mark.performance
+def test_benchmark_batch_over_warm_connection(benchmark, smtp_sink, static_render):
+    """NotificationService.send_email_batch reusing a single warm connection."""
+    results = benchmark.pedantic(
+        NotificationService.send_email_batch, args=(build_messages(MESSAGE_COUNT),), rounds=ROUNDS, iterations=1
+    )
+
+    assert results == [None] * MESSAGE_COUNT
+    assert smtp_sink.messages == rounds_run(benchmark) * MESSAGE_COUNT
+    assert smtp_sink.connections == 1
+    report_throughput(benchmark, MESSAGE_COUNT)
+
+
+def _send_chunk(messages: list[dict]) -> int:
+    # Runs in a forked child, like a prefork worker sending one email at a time over its warm connection.
+    NotificationService.close_connection()
+    return NotificationService.send_email_batch(messages).count(None)
+
+
+@pytest.mark.performance
+def test_benchmark_prefork_workers_with_smtp_latency(benchmark, smtp_sink, static_render):
+    """Prefork baseline: PREFORK_CONCURRENCY processes, one email in flight each."""
+    smtp_sink.latency = SMTP_LATENCY
+    messages = build_messages(MESSAGE_COUNT)
+    chunks = [messages[i::PREFORK_CONCURRENCY] for i in range(PREFORK_CONCURRENCY)]
+
+    with multiprocessing.get_context("fork").Pool(PREFORK_CONCURRENCY) as pool:
+        sent = benchmark.pedantic(lambda: sum(pool.map(_send_chunk, chunks)), rounds=ROUNDS, iterations=1)
+
+    assert sent == MESSAGE_COUNT
+    assert smtp_sink.max_in_flight <= PREFORK_CONCURRENCY
+    report_throughput(benchmark, MESSAGE_COUNT)
+
+
+@pytest.mark.performance
+def test_benchmark_async_dispatcher_with_smtp_latency(benchmark, smtp_sink, static_render):
+    """AsyncEmailDispatcher: one process keeping up to 100 deliveries in flight."""
+    smtp_sink.latency = SMTP_LATENCY
+    messages = build_messages(MESSAGE_COUNT)
+
+    def deliver():
+        dispatcher = AsyncEmailDispatcher(concurrency=100, per_domain=100)
+        return async_to_sync(dispatcher.deliver_all)(messages)
+
+    errors = benchmark.pedantic(deliver, rounds=ROUNDS, iterations=1)
+
+    assert errors == [None] * MESSAGE_COUNT
+    assert smtp_sink.max_in_flight > PREFORK_CONCURRENCY
+    report_throughput(benchmark, MESSAGE_COUNT)
+
+
+PIPELINE_REGISTRATIONS = 100
+
+
+class PipelineProbe:
+    """Timings collected along registration -> outbox -> send_email_task -> NotificationService -> SMTP."""
+
+    def __init__(self):
+        self.render = []
+        self.smtp = []
+        self.queue_latency = []
+        self.enqueued_at = {}
+        self.delivery_started_at = None
+
+    def __enter__(self):
+        render_email = NotificationService.render_email
+        with_connection = NotificationService._with_connection
+        send_email = NotificationService.send_email
+
+        def timed_render_email(template_name, context):
+            started = time.perf_counter()
+            try:
+                return render_email(template_name, context)
+            finally:
+                self.render.append(time.perf_counter() - started)
+
+        def timed_with_connection(send):
+            started = time.perf_counter()
+            try:
+                return with_connection(send)
+            finally:
+                self.smtp.append(time.perf_counter() - started)
+
+        def timed_send_email(**kwargs):
+            # Rows written while the registrations were still running wait for the whole registration
+            # phase, which the benchmark runs first; only the time since delivery started counts.
+            enqueued_at = max(self.enqueued_at[kwargs["recipient_email"]], self.delivery_started_at)
+            self.queue_latency.append((timezone.now() - enqueued_at).total_seconds())
+            return send_email(**kwargs)
+
+        self._patches = ExitStack()
+        self._patches.enter_context(patch.object(NotificationService, "render_email", timed_render_email))
+        self._patches.enter_context(patch.object(NotificationService, "_with_connection", timed_with_connection))
+        self._patches.enter_context(patch.object(NotificationService, "send_email", timed_send_email))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._patches.close()
+
+    def report(self, elapsed: float) -> dict:
+        def percentiles(samples):
+            samples = sorted(samples)
+            return {
+                "p50_ms": round(statistics.median(samples) * 1000, 3),
+                "p95_ms": round(samples[int(len(samples) * 0.95) - 1] * 1000, 3),
+            }
+
+        return {
+            "messages": len(self.smtp),
+            "messages_per_second": round(len(self.smtp) / elapsed, 1),
+            "render": percentiles(self.render),
+            "smtp": percentiles(self.smtp),
+            "queue_latency": percentiles(self.queue_latency),
+        }
+
+
+@pytest.fixture
+def eager_celery():
+    from config.celery import app
+
+    always_eager = app.conf.task_always_eager
+    app.conf.task_always_eager = True
+    yield
+    app.conf.task_always_eager = always_eager
+
+
+@pytest.mark.performance
+@pytest.mark.django_db
+def test_benchmark_registration_email_pipeline(benchmark, smtp_sink, eager_celery):
+    """
+    End to end: N registrations through the API, then the outbox drained through eager Celery.
+
+    Reports messages per second and p50/p95 render time, SMTP time and queue latency (outbox
+    write, or the start of delivery for rows written before it, to task start) in the benchmark
+    extra_info.
+    """
+    from rest_framework.test import APIClient
+
+    from candidate.models import Department
+    from core.models import EmailOutbox
+    from core.tasks import dispatch_email_outbox_task
+
+    client = APIClient()
+    rounds = []
+
+    def register():
+        offset = len(rounds) * PIPELINE_REGISTRATIONS
+        started = time.perf_counter()
+        for i in range(offset, offset + PIPELINE_REGISTRATIONS):
+            response = client.post(
+                "/api/v1/candidates/",
+                {
+                    "full_name": f"Candidate {i}",
+                    "email": f"candidate{i}@example.com",
+                    "phone": f"+1555{i:07d}",
+                    "date_of_birth": "1990-01-01",
+                    "years_of_experience": 5,
+                    "department": Department.IT,
+                    "resume": SimpleUploadedFile("resume.pdf", b"%PDF-1.4 test", content_type="application/pdf"),
+                },
+                format="multipart",
+            )
+            assert response.status_code == 201
+        probe = PipelineProbe()
+        probe.enqueued_at = dict(
+            EmailOutbox.objects.filter(dispatched_at__isnull=True).values_list("recipient_email", "created_at")
+        )
+        rounds.append({"probe": probe, "registration_seconds": time.perf_counter() - started})
+        return (probe,), {}
+
+    def deliver(probe):
+        with probe:
+            probe.delivery_started_at = timezone.now()
+            started = time.perf_counter()
+            dispatched = dispatch_email_outbox_task()
+            rounds[-1]["delivery_seconds"] = time.perf_counter() - started
+        return dispatched
+
+    dispatched = benchmark.pedantic(deliver, setup=register, rounds=ROUNDS, iterations=1)
+
+    assert dispatched == PIPELINE_REGISTRATIONS
+    assert smtp_sink.messages == rounds_run(benchmark) * PIPELINE_REGISTRATIONS
+    last = rounds[-1]
+    report = last["probe"].report(last["delivery_seconds"])
+    report["registrations_per_second"] = round(PIPELINE_REGISTRATIONS / last["registration_seconds"], 1)
+    benchmark.extra_info.update(report)
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from core.broadcast import InMemoryBroker
+
+
+def status_event(candidate_id: str, history_id: str = "1") -> dict:
+    return {
+        "history_id": history_id,
+        "candidate_id": candidate_id,
+        "previous_status": "SUBMITTED",
+        "new_status": "UNDER_REVIEW",
+    }
+
+
+class TestInMemoryBroker(SimpleTestCase):
+    """Tests for the in-process status event fan-out."""
+
+    def setUp(self):
+        self.broker = InMemoryBroker()
+
+    def test_events_reach_the_candidate_and_admin_streams(self):
+        async def run():
+            async with self.broker.subscribe("a") as candidate_a, self.broker.subscribe("b") as candidate_b:
+                async with self.broker.subscribe() as admin:
+                    self.broker.publish(status_event("a"))
+                    return (
+                        await candidate_a.get(timeout=1),
+                        await candidate_b.get(timeout=0.05),
+                        await admin.get(timeout=1),
+                    )
+
+        received_a, received_b, received_admin = async_to_sync(run)()
+        self.assertEqual(received_a["candidate_id"], "a")
+        self.assertIsNone(received_b)
+        self.assertEqual(received_admin["candidate_id"], "a")
+
+    def test_publish_from_another_thread(self):
+        async def run():
+            async with self.broker.subscribe("a") as subscription:
+                publisher = threading.Thread(target=self.broker.publish, args=(status_event("a"),))
+                publisher.start()
+                event = await subscription.get(timeout=1)
+                await asyncio.to_thread(publisher.join)
+                return event
+
+        self.assertEqual(async_to_sync(run)()["candidate_id"], "a")
+
+    def test_get_times_out_without_events(self):
+        async def run():
+            async with self.broker.subscribe() as subscription:
+                return await subscription.get(timeout=0.01)
+
+        self.assertIsNone(async_to_sync(run)())
+
+    @override_settings(SSE_QUEUE_SIZE=2)
+    def test_slow_subscriber_is_marked_overflowed(self):
+        async def run():
+            async with self.broker.subscribe("a") as subscription:
+                for history_id in range(3):
+                    self.broker.publish(status_event("a", str(history_id)))
+                await asyncio.sleep(0)
+                return subscription.overflowed
+
+        self.assertTrue(async_to_sync(run)())
+
+    def test_subscriptions_are_removed_on_exit(self):
+        async def run():
+            async with self.broker.subscribe("a"), self.broker.subscribe():
+                during = self.broker.subscriber_count()
+            return during, self.broker.subscriber_count()
+
+        self.assertEqual(async_to_sync(run)(), (2, 0))
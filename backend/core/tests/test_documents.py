@@ -0,0 +1,96 @@
+import hashlib
+import io
+import zipfile
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from core.documents import (
+    DOCX_CONTENT_TYPE,
+    PDF_CONTENT_TYPE,
+    DocumentExtractionError,
+    DocumentExtractionTimeout,
+    detect_content_type,
+    extract_text,
+    inspect_document,
+    time_limit,
+)
+
+
+def build_docx(*paragraphs: str) -> bytes:
+    """Build a minimal DOCX document containing the given paragraphs."""
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}</w:body></w:document>"
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def busy_loop(*args):
+    while True:
+        pass
+
+
+class TestDocuments(TestCase):
+    """Unit tests for document type detection and text extraction."""
+
+    def test_detect_content_type(self):
+        """Test type detection from file signatures."""
+        self.assertEqual(detect_content_type(b"%PDF-1.7 ..."), PDF_CONTENT_TYPE)
+        self.assertEqual(detect_content_type(build_docx("Hello")), DOCX_CONTENT_TYPE)
+        self.assertIsNone(detect_content_type(b"plain text"))
+        self.assertIsNone(detect_content_type(b"PK\x03\x04 not really a zip"))
+
+    def test_inspect_document(self):
+        """Test metadata is computed from the document bytes."""
+        data = build_docx("Hello")
+        metadata = inspect_document(data)
+
+        self.assertEqual(metadata.size, len(data))
+        self.assertEqual(metadata.sha256, hashlib.sha256(data).hexdigest())
+        self.assertEqual(metadata.content_type, DOCX_CONTENT_TYPE)
+        self.assertIsNone(metadata.page_count)
+
+    def test_inspect_unknown_document(self):
+        """Test unknown documents still report size and hash."""
+        metadata = inspect_document(b"Fake resume content")
+
+        self.assertEqual(metadata.size, 19)
+        self.assertIsNone(metadata.content_type)
+        self.assertIsNone(metadata.page_count)
+
+    def test_extract_docx_text(self):
+        """Test paragraphs are extracted and whitespace normalized."""
+        text = extract_text(build_docx("Senior  Python   developer", "Django, Celery"))
+        self.assertEqual(text, "Senior Python developer\nDjango, Celery")
+
+    def test_extract_unsupported_type(self):
+        """Test unsupported documents raise an extraction error."""
+        with self.assertRaises(DocumentExtractionError):
+            extract_text(b"Fake resume content")
+
+    def test_extract_corrupt_pdf(self):
+        """Test corrupt PDFs raise an extraction error."""
+        with self.assertRaises(DocumentExtractionError):
+            extract_text(b"%PDF-1.4 garbage")
+
+    def test_extraction_timeout(self):
+        """Test the time limit aborts long-running extraction."""
+        with patch("core.documents._extract_docx_text", side_effect=busy_loop):
+            with self.assertRaises(DocumentExtractionTimeout):
+                extract_text(build_docx("x"), timeout=0.05)
+
+
+class TestTimeLimit(TestCase):
+    """Unit tests for the time_limit context manager."""
+
+    def test_no_limit(self):
+        """Test a falsy limit leaves the block untouched."""
+        with time_limit(None):
+            result = sum(range(10))
+        self.assertEqual(result, 45)
@@ -0,0 +1,64 @@
+from django.core.exceptions import ValidationError
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase
+
+from core.fields import CodedChoiceField
+
+
+class Color(models.TextChoices):
+    RED = "red", "Red"
+    GREEN = "green", "Green"
+
+
+class TestCodedChoiceField(SimpleTestCase):
+    """Unit tests for the smallint-coded choice field."""
+
+    def setUp(self):
+        self.field = CodedChoiceField(enum=Color)
+        self.field.set_attributes_from_name("color")
+
+    def test_values_are_stored_as_codes(self):
+        """Test values map to codes in enum order and back."""
+        self.assertEqual(self.field.get_prep_value(Color.RED), 1)
+        self.assertEqual(self.field.get_prep_value("green"), 2)
+        self.assertIsNone(self.field.get_prep_value(None))
+        self.assertEqual(self.field.from_db_value(2, None, connection), "green")
+        self.assertIsNone(self.field.from_db_value(None, None, connection))
+
+    def test_unknown_value_is_rejected(self):
+        """Test values outside the enum cannot be stored or validated."""
+        with self.assertRaises(ValueError):
+            self.field.get_prep_value("blue")
+        with self.assertRaises(ValidationError):
+            self.field.clean("blue", None)
+
+    def test_clean_keeps_string_values(self):
+        """Test validation works on the enum values and accepts codes."""
+        self.assertEqual(self.field.clean("red", None), "red")
+        self.assertEqual(self.field.to_python(2), "green")
+
+    def test_choices_and_deconstruct(self):
+        """Test the field exposes the enum choices and keeps the enum in migrations."""
+        self.assertEqual(self.field.choices, Color.choices)
+        _, path, _, kwargs = self.field.deconstruct()
+        self.assertEqual(path, "core.fields.CodedChoiceField")
+        self.assertIs(kwargs["enum"], Color)
+
+
+class TestCodedChoiceFieldQueries(TestCase):
+    """Tests for coded choice fields through the ORM."""
+
+    def test_filters_and_display(self):
+        """Test lookups, values() and get_FOO_display use the enum values."""
+        from candidate.models import ApplicationStatus, Candidate, Department
+        from candidate.tests.test_models import CandidateFactory
+
+        candidate = CandidateFactory(department=Department.HR)
+        Candidate.objects.filter(pk=candidate.pk).update(current_status=ApplicationStatus.ACCEPTED)
+
+        candidate = Candidate.objects.get(department__in=[Department.HR, Department.FINANCE])
+        self.assertEqual(candidate.department, "hr")
+        self.assertEqual(candidate.get_department_display(), "Human Resources")
+        self.assertEqual(candidate.get_current_status_display(), "Accepted")
+        self.assertEqual(list(Candidate.objects.values_list("current_status", flat=True)), ["accepted"])
+        self.assertFalse(Candidate.objects.filter(current_status=ApplicationStatus.SUBMITTED).exists())
@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from core.idempotency import REPLAYED_HEADER, idempotent_response, request_fingerprint
+from core.models import IdempotencyKey
+
+
+class TestIdempotentResponse(TestCase):
+    """Unit tests for idempotent_response."""
+
+    def setUp(self):
+        self.calls = 0
+
+    def handler(self, status_code=status.HTTP_201_CREATED):
+        def _handler():
+            self.calls += 1
+            return Response({"call": self.calls}, status=status_code)
+
+        return _handler
+
+    def test_first_request_runs_handler_and_stores_response(self):
+        """Test the first request runs the handler and stores its response."""
+        response = idempotent_response("test", "key-1", self.handler())
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        stored = IdempotencyKey.objects.get(scope="test", key="key-1")
+        self.assertEqual(stored.response_status, status.HTTP_201_CREATED)
+        self.assertEqual(stored.response_body, {"call": 1})
+
+    def test_retry_replays_stored_response(self):
+        """Test a retry replays the response without running the handler again."""
+        idempotent_response("test", "key-1", self.handler())
+        response = idempotent_response("test", "key-1", self.handler())
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(response.data, {"call": 1})
+        self.assertEqual(response[REPLAYED_HEADER], "true")
+
+    def test_keys_are_scoped(self):
+        """Test the same key in another scope is independent."""
+        idempotent_response("test", "key-1", self.handler())
+        idempotent_response("other", "key-1", self.handler())
+
+        self.assertEqual(self.calls, 2)
+
+    def test_failed_response_is_not_stored(self):
+        """Test unsuccessful responses release the key."""
+        idempotent_response("test", "key-1", self.handler(status.HTTP_400_BAD_REQUEST))
+        response = idempotent_response("test", "key-1", self.handler())
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_exception_releases_key(self):
+        """Test an exception in the handler rolls back the key reservation."""
+
+        def failing_handler():
+            raise ValidationError("invalid")
+
+        with self.assertRaises(ValidationError):
+            idempotent_response("test", "key-1", failing_handler)
+
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_expired_key_runs_handler_again(self):
+        """Test keys past their TTL are reused."""
+        idempotent_response("test", "key-1", self.handler())
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        response = idempotent_response("test", "key-1", self.handler())
+
+        self.assertEqual(self.calls, 2)
+        self.assertEqual(response.data, {"call": 2})
+
+    def test_key_reused_for_different_request_is_rejected(self):
+        """Test a key is bound to the request it was first used with."""
+        idempotent_response("test", "key-1", self.handler(), request_hash="a" * 64)
+
+        response = idempotent_response("test", "key-1", self.handler(), request_hash="b" * 64)
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(self.calls, 1)
+
+    def test_request_fingerprint(self):
+        """Test the fingerprint ignores field order but not field values or file contents."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.http import QueryDict
+
+        def multipart(content=b"resume", **fields):
+            data = QueryDict(mutable=True)
+            data.update(fields)
+            data["resume"] = SimpleUploadedFile("resume.pdf", content)
+            return data
+
+        fingerprint = request_fingerprint(multipart(name="Jane", email="jane@example.com"))
+
+        self.assertEqual(request_fingerprint(multipart(email="jane@example.com", name="Jane")), fingerprint)
+        self.assertNotEqual(request_fingerprint(multipart(name="Jane", email="john@example.com")), fingerprint)
+        self.assertNotEqual(
+            request_fingerprint(multipart(b"other", name="Jane", email="jane@example.com")), fingerprint
+        )
+        self.assertEqual(request_fingerprint({"b": 1, "a": [1, 2]}), request_fingerprint({"a": [1, 2], "b": 1}))
+
+    def test_in_progress_key_conflicts(self):
+        """Test a key reserved by an unfinished request returns 409."""
+        IdempotencyKey.objects.create(scope="test", key="key-1", expires_at=timezone.now() + timedelta(hours=1))
+
+        response = idempotent_response("test", "key-1", self.handler())
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(self.calls, 0)
+
+    def test_invalid_key(self):
+        """Test overly long keys are rejected."""
+        with self.assertRaises(ValidationError):
+            idempotent_response("test", "x" * 256, self.handler())
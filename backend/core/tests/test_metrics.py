@@ -0,0 +1,203 @@
+import os
+import socket
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from core.metrics import MetricsRegistry, merge_snapshots, render_text
+
+
+def series(registry_or_metric, *labels):
+    """Current [counts, sum] (histograms) or value (counters) of one labelled series."""
+    snapshot = registry_or_metric.snapshot()
+    return dict((tuple(key), value) for key, value in snapshot["series"]).get(tuple(labels))
+
+
+class TestMetricsRegistry(TestCase):
+    """Unit tests for the metrics registry and its text export."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.histogram = self.registry.histogram("job_seconds", "Job time.", ("job",), buckets=(0.1, 1))
+        self.counter = self.registry.counter("jobs_total", "Jobs run.", ("job",))
+
+    def test_histogram_buckets(self):
+        """Test observations land in inclusive buckets with an overflow bucket."""
+        for value in (0.05, 0.1, 0.5, 5):
+            self.histogram.observe(value, job="a")
+
+        counts, total = series(self.histogram, "a")
+        self.assertEqual(counts, [2, 1, 1])
+        self.assertAlmostEqual(total, 5.65)
+
+    def test_render_prometheus_text(self):
+        """Test histograms are exported with cumulative buckets, sum and count."""
+        self.histogram.observe(0.5, job="a")
+        self.counter.inc(job="a")
+
+        text = render_text(merge_snapshots([self.registry.snapshot()]))
+
+        self.assertIn("# TYPE job_seconds histogram", text)
+        self.assertIn('job_seconds_bucket{job="a",le="0.1"} 0', text)
+        self.assertIn('job_seconds_bucket{job="a",le="1"} 1', text)
+        self.assertIn('job_seconds_bucket{job="a",le="+Inf"} 1', text)
+        self.assertIn('job_seconds_count{job="a"} 1', text)
+        self.assertIn('jobs_total{job="a"} 1.0', text)
+
+    def test_collect_merges_processes(self):
+        """Test snapshots written by several processes to METRICS_DIR are summed."""
+        other = MetricsRegistry()
+        other.counter("jobs_total", "Jobs run.", ("job",)).inc(2, job="a")
+        self.counter.inc(job="a")
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch("core.metrics.os.getpid", return_value=1):
+                other.flush(directory)
+            with patch("core.metrics.os.getpid", return_value=2):
+                merged = merge_snapshots(self.registry.collect(directory))
+
+        self.assertEqual(merged["jobs_total"]["series"][("a",)], 3.0)
+
+    def test_same_pid_on_other_hosts_is_kept(self):
+        """Test processes with the same pid in different containers write separate snapshots."""
+        other = MetricsRegistry()
+        other.counter("jobs_total", "Jobs run.", ("job",)).inc(2, job="a")
+        self.counter.inc(job="a")
+
+        with tempfile.TemporaryDirectory() as directory, patch("core.metrics.os.getpid", return_value=1):
+            with patch("core.metrics.socket.gethostname", return_value="worker-a"):
+                other.flush(directory)
+            with patch("core.metrics.socket.gethostname", return_value="worker-b"):
+                merged = merge_snapshots(self.registry.collect(directory))
+
+        self.assertEqual(merged["jobs_total"]["series"][("a",)], 3.0)
+
+    def test_stale_and_discarded_snapshots_are_dropped(self):
+        """Test a process removes its snapshot on shutdown and snapshots left by dead processes expire."""
+        dead, exiting = MetricsRegistry(), MetricsRegistry()
+        for other in (dead, exiting):
+            other.counter("jobs_total", "Jobs run.", ("job",)).inc(2, job="a")
+        self.counter.inc(job="a")
+
+        with tempfile.TemporaryDirectory() as directory:
+            with patch("core.metrics.os.getpid", return_value=1):
+                dead.flush(directory)
+            stale = next(Path(directory).glob("metrics-*.json"))
+            os.utime(stale, (time.time() - 3600, time.time() - 3600))
+            with patch("core.metrics.os.getpid", return_value=2):
+                exiting.flush(directory)
+                exiting.discard(directory)
+                exiting.flush(directory)
+            with patch("core.metrics.os.getpid", return_value=3):
+                merged = merge_snapshots(self.registry.collect(directory))
+            remaining = [path.name for path in Path(directory).glob("metrics-*.json")]
+
+        self.assertEqual(merged["jobs_total"]["series"][("a",)], 1.0)
+        self.assertEqual(remaining, [f"metrics-{socket.gethostname()}-3.json"])
+
+    @override_settings(METRICS_FLUSH_INTERVAL=60)
+    def test_flush_is_throttled(self):
+        """Test periodic flushes write at most once per interval."""
+        with tempfile.TemporaryDirectory() as directory, patch("core.metrics.os.replace") as mock_replace:
+            self.registry.flush(directory, force=False)
+            self.registry.flush(directory, force=False)
+
+        self.assertEqual(mock_replace.call_count, 1)
+
+
+class TestTaskInstrumentation(TestCase):
+    """Tests for the Celery signal hooks."""
+
+    def test_queue_latency_from_publish_header(self):
+        """Test the enqueue timestamp stamped at publish time gives the queue latency."""
+        from core.metrics import TASK_QUEUE_LATENCY
+        from core.tasks import record_task_start, stamp_enqueue_time
+
+        headers = {}
+        with patch("core.tasks.time.time", return_value=1000.0):
+            stamp_enqueue_time(headers=headers)
+        task = SimpleNamespace(name="test.latency", request=SimpleNamespace(eta=None, **headers))
+
+        with patch("core.tasks.time.time", return_value=1002.5):
+            record_task_start(task=task)
+
+        counts, total = series(TASK_QUEUE_LATENCY, "test.latency")
+        self.assertEqual(sum(counts), 1)
+        self.assertAlmostEqual(total, 2.5)
+
+    def test_queue_latency_starts_at_eta(self):
+        """Test a countdown is not reported as queue latency."""
+        from datetime import datetime, timezone
+
+        from core.metrics import TASK_QUEUE_LATENCY
+        from core.tasks import record_task_start
+
+        eta = datetime.fromtimestamp(1060.0, tz=timezone.utc).isoformat()
+        task = SimpleNamespace(name="test.eta", request=SimpleNamespace(eta=eta, enqueued_at=1000.0))
+
+        with patch("core.tasks.time.time", return_value=1061.0):
+            record_task_start(task=task)
+
+        self.assertAlmostEqual(series(TASK_QUEUE_LATENCY, "test.eta")[1], 1.0)
+
+    @patch("core.tasks.NotificationService.send_email", return_value=True)
+    def test_task_runtime_and_retries_recorded(self, mock_send_email):
+        """Test running a task records its run time and retry count."""
+        from core.metrics import TASK_RETRIES, TASK_RUNTIME
+        from core.tasks import send_email_task
+
+        before = series(TASK_RUNTIME, send_email_task.name, "SUCCESS")
+        send_email_task.apply(
+            kwargs={
+                "template_name": "registration_confirmation",
+                "context": {},
+                "subject": "Application Received",
+                "recipient_email": "jane@example.com",
+            },
+            retries=2,
+        )
+
+        counts, _ = series(TASK_RUNTIME, send_email_task.name, "SUCCESS")
+        self.assertEqual(sum(counts), sum(before[0]) + 1 if before else 1)
+        self.assertGreaterEqual(series(TASK_RETRIES, send_email_task.name)[0][2], 1)
+
+    def test_retries_and_failures_counted(self):
+        """Test retry and failure signals increment their counters."""
+        from core.metrics import TASK_FAILURES, TASK_RETRIED
+        from core.tasks import record_task_failure, record_task_retry
+
+        sender = SimpleNamespace(name="test.counters")
+        record_task_retry(sender=sender)
+        record_task_retry(sender=sender)
+        record_task_failure(sender=sender)
+
+        self.assertEqual(series(TASK_RETRIED, "test.counters"), 2.0)
+        self.assertEqual(series(TASK_FAILURES, "test.counters"), 1.0)
+
+
+class TestMetricsEndpoint(TestCase):
+    """Tests for the /metrics/ endpoint."""
+
+    def test_metrics_endpoint_is_restricted(self):
+        """Test clients outside METRICS_ALLOWED_IPS cannot scrape the metrics."""
+        response = self.client.get("/metrics/", REMOTE_ADDR="203.0.113.7")
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_metrics_endpoint(self):
+        """Test the endpoint exports the email phase and task metrics."""
+        from core.notification_service import NotificationService
+
+        NotificationService.render_email("registration_confirmation", {})
+
+        response = self.client.get("/metrics/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn('email_render_seconds_count{template="registration_confirmation"}', body)
+        self.assertIn("# TYPE celery_task_queue_latency_seconds histogram", body)
@@ -141,6 +141,34 @@ class TestNotificationService(TestCase):
 
         self.assertFalse(result)
 
+    @patch("core.notification_service.send_mail")
+    @patch("core.notification_service.render_to_string")
+    def test_send_email_raises_when_not_silent(self, mock_render, mock_send_mail):
+        """Test delivery errors are raised when fail_silently is False."""
+        from core.notification_service import EmailDeliveryError
+
+        mock_render.side_effect = ["<html>Test</html>", "Test plain text"] * 2
+        mock_send_mail.return_value = 0
+
+        with self.assertRaises(EmailDeliveryError):
+            self.service.send_email(
+                template_name="status_update",
+                context=self.test_context,
+                subject=self.test_subject,
+                recipient_email=self.test_recipient_email,
+                fail_silently=False,
+            )
+
+        mock_send_mail.side_effect = Exception("SMTP error")
+        with self.assertRaisesMessage(Exception, "SMTP error"):
+            self.service.send_email(
+                template_name="status_update",
+                context=self.test_context,
+                subject=self.test_subject,
+                recipient_email=self.test_recipient_email,
+                fail_silently=False,
+            )
+
     def test_send_email_static_method(self):
         """Test that send_email is a static method."""
         # Should be able to call without instantiating the class
@@ -379,3 +407,136 @@ class TestNotificationServicePerformance(TestCase):
 
         self.assertTrue(result)
         mock_render.assert_any_call("emails/status_update.html", large_context)
+
+
+class TestNotificationServiceConnection(TestCase):
+    """Unit tests for warm connection reuse and batch sending."""
+
+    def setUp(self):
+        NotificationService.close_connection()
+        self.addCleanup(NotificationService.close_connection)
+        self.messages = [
+            {
+                "template_name": "status_update",
+                "context": {"new_status": "under_review"},
+                "subject": "Application Status Updated",
+                "recipient_email": f"candidate{i}@example.com",
+                "recipient_name": f"Candidate {i}",
+            }
+            for i in range(3)
+        ]
+
+    @patch("core.notification_service.send_mail", return_value=1)
+    @patch("core.notification_service.render_to_string", return_value="rendered")
+    @patch("core.notification_service.get_connection")
+    def test_send_email_reuses_connection(self, mock_get_connection, mock_render, mock_send_mail):
+        """Test consecutive emails share one connection."""
+        for message in self.messages:
+            self.assertTrue(NotificationService.send_email(**message))
+
+        mock_get_connection.assert_called_once_with(fail_silently=False)
+        connection = mock_get_connection.return_value
+        for call in mock_send_mail.call_args_list:
+            self.assertIs(call.kwargs["connection"], connection)
+
+    @patch("core.notification_service.send_mail")
+    @patch("core.notification_service.render_to_string", return_value="rendered")
+    @patch("core.notification_service.get_connection")
+    def test_send_email_reconnects_stale_connection(self, mock_get_connection, mock_render, mock_send_mail):
+        """Test a dropped connection is replaced and the send retried once."""
+        import smtplib
+
+        mock_send_mail.side_effect = [smtplib.SMTPServerDisconnected("gone"), 1]
+
+        self.assertTrue(NotificationService.send_email(**self.messages[0]))
+        self.assertEqual(mock_get_connection.call_count, 2)
+        mock_get_connection.return_value.close.assert_called_once()
+
+    @patch("core.notification_service.render_to_string", return_value="rendered")
+    @patch("core.notification_service.get_connection")
+    def test_send_email_batch(self, mock_get_connection, mock_render):
+        """Test a batch is sent over one connection with per-message results."""
+        connection = mock_get_connection.return_value
+        connection.send_messages.side_effect = [1, Exception("Mailbox unavailable"), 1]
+
+        results = NotificationService.send_email_batch(self.messages)
+
+        self.assertEqual(results, [None, "Mailbox unavailable", None])
+        mock_get_connection.assert_called_once()
+        self.assertEqual(connection.send_messages.call_count, 3)
+        email = connection.send_messages.call_args_list[0].args[0][0]
+        self.assertEqual(email.to, ["candidate0@example.com"])
+        self.assertEqual(email.alternatives[0][1], "text/html")
+        # The caller's context is not mutated
+        self.assertNotIn("recipient_name", self.messages[0]["context"])
+
+
+class TestEmailTemplateRendering(TestCase):
+    """Tests for precompiled templates and memoized status messages."""
+
+    def setUp(self):
+        from core.templatetags.email_tags import render_status_message
+
+        render_status_message.cache_clear()
+        self.context = {
+            "recipient_name": "Jane Doe",
+            "recipient_email": "jane@example.com",
+            "previous_status": "submitted",
+            "new_status": "under_review",
+            "feedback": "Looks promising",
+            "admin_name": "HR Admin",
+            "update_date": "January 01, 2026 at 10:00 AM",
+            "application_id": "123",
+        }
+
+    def test_warm_templates(self):
+        """Test all email templates compile."""
+        with patch("core.notification_service.get_template") as mock_get_template:
+            NotificationService.warm_templates()
+
+        mock_get_template.assert_any_call("emails/status_update.html")
+        mock_get_template.assert_any_call("emails/registration_confirmation.txt")
+        self.assertEqual(mock_get_template.call_count, 6)
+
+    def test_status_update_renders_status_message(self):
+        """Test the status specific explanation is rendered for raw status values."""
+        html_message, plain_message = NotificationService.render_email("status_update", self.context)
+
+        self.assertIn("currently being reviewed by our HR team", html_message)
+        self.assertIn("currently being reviewed by our HR team", plain_message)
+        self.assertIn("Jane Doe", plain_message)
+        self.assertNotIn("Please check our portal", plain_message)
+
+    def test_status_message_html_is_not_escaped(self):
+        """Test the status message markup reaches the HTML email as markup."""
+        html_message, _ = NotificationService.render_email("status_update", self.context)
+
+        self.assertIn("<p>Your application is currently being reviewed", html_message)
+        self.assertNotIn("&lt;p&gt;", html_message)
+
+    def test_status_update_renders_intermediate_updates(self):
+        """Test a coalesced status email lists the superseded changes and their feedback."""
+        context = {
+            **self.context,
+            "new_status": "interview_scheduled",
+            "intermediate_updates": [
+                {"new_status": "under_review", "feedback": "Strong profile", "update_date": "January 01, 2026"},
+            ],
+        }
+
+        html_message, plain_message = NotificationService.render_email("status_update", context)
+
+        self.assertIn("under_review (January 01, 2026): Strong profile", plain_message)
+        self.assertIn("Strong profile", html_message)
+
+    def test_status_message_is_memoized_per_status(self):
+        """Test bulk renders reuse the status message instead of rendering it per recipient."""
+        from core.templatetags.email_tags import render_status_message
+
+        for i in range(5):
+            NotificationService.render_email("status_update", {**self.context, "recipient_name": f"Candidate {i}"})
+        NotificationService.render_email("status_update", {**self.context, "new_status": "rejected"})
+
+        cache_info = render_status_message.cache_info()
+        self.assertEqual(cache_info.misses, 4)  # (under_review, rejected) x (html, txt)
+        self.assertEqual(cache_info.hits, 8)
@@ -0,0 +1,95 @@
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from core.models import RateLimitBucket
+from core.rate_limit import Rate, TokenBucket, email_rate_limit_delay, parse_rate
+
+
+class TestParseRate(TestCase):
+    """Unit tests for parse_rate."""
+
+    def test_parse_rate(self):
+        """Test Celery style rates are parsed."""
+        self.assertEqual(parse_rate("120/m"), Rate(capacity=120, per_second=2))
+        self.assertEqual(parse_rate("5/s"), Rate(capacity=5, per_second=5))
+        self.assertEqual(parse_rate("3600 / h"), Rate(capacity=3600, per_second=1))
+
+    def test_parse_invalid_rate(self):
+        """Test malformed rates and rates that never refill are rejected."""
+        for value in ["10 per minute", "0/m", "0.0/s"]:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_rate(value)
+
+
+def rewind(key: str, seconds: float) -> None:
+    """Move the last refill of a bucket back, as if `seconds` had passed on the database clock."""
+    RateLimitBucket.objects.filter(key=key).update(updated_at=F("updated_at") - seconds)
+
+
+class TestTokenBucket(TestCase):
+    """Unit tests for the database backed token bucket."""
+
+    def test_burst_then_deferral(self):
+        """Test the bucket allows its capacity and then reports the wait."""
+        bucket = TokenBucket("test", Rate(capacity=3, per_second=0.5))
+
+        self.assertEqual([bucket.acquire() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertAlmostEqual(bucket.acquire(), 2.0, delta=0.1)
+
+    def test_refill_over_time(self):
+        """Test tokens are refilled according to elapsed time, up to capacity."""
+        bucket = TokenBucket("test", Rate(capacity=2, per_second=1))
+        bucket.acquire()
+        bucket.acquire()
+
+        rewind("test", 1)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertGreater(bucket.acquire(), 0)
+
+        rewind("test", 1000)
+        bucket.acquire()
+        self.assertAlmostEqual(RateLimitBucket.objects.get(key="test").tokens, 1.0)
+
+    def test_refill_uses_database_clock(self):
+        """Test the refill is measured against the database clock, not the worker's."""
+        bucket = TokenBucket("test", Rate(capacity=1, per_second=1))
+        bucket.acquire()
+
+        # A bucket last refilled "in the future" by a skewed worker grants nothing until the database catches up.
+        rewind("test", -30)
+        self.assertGreater(bucket.acquire(), 30)
+
+    def test_buckets_are_shared_by_key(self):
+        """Test separate limiter instances draw from the same stored bucket."""
+        rate = Rate(capacity=1, per_second=0.1)
+
+        self.assertEqual(TokenBucket("shared", rate).acquire(), 0.0)
+        self.assertGreater(TokenBucket("shared", rate).acquire(), 0)
+        self.assertEqual(TokenBucket("other", rate).acquire(), 0.0)
+
+
+class TestEmailRateLimitDelay(TestCase):
+    """Unit tests for email_rate_limit_delay."""
+
+    @override_settings(EMAIL_DOMAIN_RATE_LIMIT="1/m", EMAIL_PROVIDER_RATE_LIMIT="100/m")
+    def test_domain_limit(self):
+        """Test each recipient domain has its own budget."""
+        self.assertEqual(email_rate_limit_delay("a@example.com"), 0.0)
+        self.assertGreater(email_rate_limit_delay("b@EXAMPLE.com"), 0)
+        self.assertEqual(email_rate_limit_delay("c@example.org"), 0.0)
+
+    @override_settings(EMAIL_DOMAIN_RATE_LIMIT="10/m", EMAIL_PROVIDER_RATE_LIMIT="1/m")
+    def test_provider_limit_refunds_domain_token(self):
+        """Test a provider deferral gives the domain token back."""
+        email_rate_limit_delay("a@example.com")
+
+        self.assertGreater(email_rate_limit_delay("b@example.org"), 0)
+        self.assertAlmostEqual(RateLimitBucket.objects.get(key="email:domain:example.org").tokens, 10.0)
+
+    @override_settings(EMAIL_DOMAIN_RATE_LIMITS={"example.com": "1/m"}, EMAIL_DOMAIN_RATE_LIMIT="")
+    def test_domain_override(self):
+        """Test per-domain overrides apply even when the default is disabled."""
+        email_rate_limit_delay("a@example.com")
+
+        self.assertGreater(email_rate_limit_delay("b@example.com"), 0)
+        self.assertEqual(email_rate_limit_delay("c@example.org"), 0.0)
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 from django.test import TestCase
 
@@ -38,6 +38,7 @@ class TestCeleryTasks(TestCase):
             subject="Application Received",
             recipient_email=self.candidate.email,
             recipient_name=self.candidate.full_name,
+            fail_silently=False,
         )
 
         # Verify the task returns success
@@ -45,23 +46,23 @@ class TestCeleryTasks(TestCase):
 
     @patch("core.tasks.NotificationService")
     def test_send_email_task_failure(self, mock_notification_service):
-        """Test send email task failure."""
+        """Test send email task failure is retried rather than silently dropped."""
+        from core.notification_service import EmailDeliveryError
+
         # Mock the notification service to return False
         mock_service = MagicMock()
         mock_service.send_email.return_value = False
         mock_notification_service.send_email = mock_service.send_email
 
-        # Call the task
-        result = send_email_task(
-            template_name="registration_confirmation",
-            context={"candidate": self.candidate},
-            subject="Application Received",
-            recipient_email=self.candidate.email,
-            recipient_name=self.candidate.full_name,
-        )
-
-        # Verify the task returns failure
-        self.assertFalse(result)
+        # Called directly, a retry re-raises the error
+        with self.assertRaises(EmailDeliveryError):
+            send_email_task(
+                template_name="registration_confirmation",
+                context={"candidate": self.candidate},
+                subject="Application Received",
+                recipient_email=self.candidate.email,
+                recipient_name=self.candidate.full_name,
+            )
 
     @patch("core.tasks.NotificationService")
     def test_send_email_task_exception_handling(self, mock_notification_service):
@@ -278,3 +279,280 @@ class TestCeleryTaskPerformance(TestCase):
 
         # Verify all tasks were called
         self.assertEqual(mock_service.send_email.call_count, len(self.candidates))
+
+
+class TestEmailOutboxDispatch(TestCase):
+    """Tests for draining the email outbox into Celery."""
+
+    def create_outbox_email(self, **kwargs):
+        from core.models import EmailOutbox
+
+        defaults = {
+            "template_name": "registration_confirmation",
+            "context": {"application_id": "123"},
+            "subject": "Application Received",
+            "recipient_email": "jane@example.com",
+            "recipient_name": "Jane Doe",
+        }
+        return EmailOutbox.objects.create(**{**defaults, **kwargs})
+
+    @patch("core.tasks.send_email_task.apply_async")
+    def test_dispatch_publishes_pending_emails_in_batches(self, mock_apply_async):
+        """Test pending rows are published and marked dispatched."""
+        from core.models import EmailOutbox
+        from core.tasks import dispatch_email_outbox_task
+
+        emails = [self.create_outbox_email(recipient_email=f"user{i}@example.com") for i in range(5)]
+
+        self.assertEqual(dispatch_email_outbox_task(batch_size=2), 5)
+
+        self.assertEqual(mock_apply_async.call_count, 5)
+        self.assertEqual(mock_apply_async.call_args_list[0].kwargs["kwargs"], emails[0].task_kwargs())
+        self.assertFalse(EmailOutbox.objects.filter(dispatched_at__isnull=True).exists())
+
+        # Nothing left to send
+        self.assertEqual(dispatch_email_outbox_task(batch_size=2), 0)
+        self.assertEqual(mock_apply_async.call_count, 5)
+
+    @patch("core.tasks.send_email_batch_task.apply_async")
+    @patch("core.tasks.send_email_task.apply_async")
+    def test_dispatch_routes_by_queue_and_priority(self, mock_apply_async, mock_batch_apply_async):
+        """Test transactional emails are published one by one and bulk emails in batches, each to its queue."""
+        from django.test import override_settings
+
+        from core.models import EmailOutbox
+        from core.tasks import dispatch_email_outbox_task
+
+        bulk = [
+            self.create_outbox_email(
+                recipient_email=f"user{i}@example.com", queue=EmailOutbox.Queue.BULK, priority=EmailOutbox.LOW_PRIORITY
+            )
+            for i in range(3)
+        ]
+        transactional = self.create_outbox_email(priority=EmailOutbox.HIGH_PRIORITY)
+
+        with override_settings(EMAIL_BULK_BATCH_SIZE=2):
+            self.assertEqual(dispatch_email_outbox_task(), 4)
+
+        (single,) = (call.kwargs for call in mock_apply_async.call_args_list)
+        self.assertEqual(single["kwargs"], transactional.task_kwargs())
+        self.assertEqual((single["queue"], single["priority"]), ("email.transactional", EmailOutbox.HIGH_PRIORITY))
+        first, second = (call.kwargs for call in mock_batch_apply_async.call_args_list)
+        self.assertEqual(first["kwargs"], {"messages": [email.task_kwargs() for email in bulk[:2]]})
+        self.assertEqual(second["kwargs"], {"messages": [bulk[2].task_kwargs()]})
+        self.assertEqual((first["queue"], first["priority"]), ("email.bulk", EmailOutbox.LOW_PRIORITY))
+        self.assertFalse(EmailOutbox.objects.filter(dispatched_at__isnull=True).exists())
+
+    @patch("core.tasks.send_email_task.apply_async")
+    def test_dispatch_holds_back_coalescing_emails(self, mock_apply_async):
+        """Test emails still inside their coalescing window are not dispatched yet."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from core.tasks import dispatch_email_outbox_task
+
+        held = self.create_outbox_email(available_at=timezone.now() + timedelta(minutes=1))
+        ready = self.create_outbox_email()
+
+        self.assertEqual(dispatch_email_outbox_task(), 1)
+        self.assertEqual(mock_apply_async.call_args.kwargs["kwargs"], ready.task_kwargs())
+        held.refresh_from_db()
+        self.assertIsNone(held.dispatched_at)
+
+    @patch("core.tasks.send_email_task.apply_async")
+    def test_dispatch_keeps_unpublished_emails(self, mock_apply_async):
+        """Test a broker failure only marks the messages that were published."""
+        from core.models import EmailOutbox
+        from core.tasks import dispatch_email_outbox_task
+
+        first = self.create_outbox_email()
+        second = self.create_outbox_email()
+        mock_apply_async.side_effect = [None, ConnectionError("broker down")]
+
+        self.assertEqual(dispatch_email_outbox_task(), 1)
+
+        self.assertIsNotNone(EmailOutbox.objects.get(pk=first.pk).dispatched_at)
+        self.assertIsNone(EmailOutbox.objects.get(pk=second.pk).dispatched_at)
+
+    def test_purge_removes_old_dispatched_emails(self):
+        """Test only dispatched rows past retention are purged."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from core.models import EmailOutbox
+        from core.tasks import purge_email_outbox_task
+
+        old = self.create_outbox_email(dispatched_at=timezone.now() - timedelta(days=30))
+        pending = self.create_outbox_email()
+
+        self.assertEqual(purge_email_outbox_task(), 1)
+        self.assertFalse(EmailOutbox.objects.filter(pk=old.pk).exists())
+        self.assertTrue(EmailOutbox.objects.filter(pk=pending.pk).exists())
+
+
+class TestSendEmailBatchTask(TestCase):
+    """Tests for the batch email task."""
+
+    def setUp(self):
+        self.messages = [
+            {
+                "template_name": "registration_confirmation",
+                "context": {},
+                "subject": "Application Received",
+                "recipient_email": f"user{i}@example.com",
+            }
+            for i in range(3)
+        ]
+
+    @patch("core.tasks.NotificationService.send_email_batch", return_value=[None, None, None])
+    def test_send_email_batch_task_success(self, mock_send_email_batch):
+        """Test the task reports how many emails were sent."""
+        from core.tasks import send_email_batch_task
+
+        self.assertEqual(send_email_batch_task(self.messages), 3)
+        mock_send_email_batch.assert_called_once_with(self.messages)
+
+    @patch("core.tasks.send_email_batch_task.retry", side_effect=Exception("retry"))
+    @patch("core.tasks.NotificationService.send_email_batch", return_value=[None, "Mailbox unavailable", None])
+    def test_send_email_batch_task_retries_failures_only(self, mock_send_email_batch, mock_retry):
+        """Test only the failed messages are retried."""
+        from core.tasks import send_email_batch_task
+
+        with self.assertRaises(Exception):
+            send_email_batch_task(self.messages)
+
+        mock_retry.assert_called_once_with(kwargs={"messages": [self.messages[1]]}, countdown=ANY)
+
+
+class TestEmailRateLimiting(TestCase):
+    """Tests for deferring rate limited emails."""
+
+    @patch("core.tasks.send_email_task.apply_async")
+    @patch("core.tasks.NotificationService")
+    @patch("core.tasks.email_rate_limit_delay", return_value=5.0)
+    def test_rate_limited_email_is_requeued(self, mock_delay, mock_notification_service, mock_apply_async):
+        """Test a rate limited email is requeued with a countdown instead of sent."""
+        result = send_email_task(
+            template_name="registration_confirmation",
+            context={},
+            subject="Application Received",
+            recipient_email="jane@example.com",
+        )
+
+        self.assertFalse(result)
+        mock_notification_service.send_email.assert_not_called()
+        args, kwargs = mock_apply_async.call_args
+        self.assertTrue(5.0 <= kwargs["countdown"] <= 10.0)
+        self.assertEqual(args[1]["recipient_email"], "jane@example.com")
+
+    @patch("core.tasks.send_email_batch_task.apply_async")
+    @patch("core.tasks.NotificationService.send_email_batch", return_value=[None])
+    @patch("core.tasks.email_rate_limit_delay", side_effect=[0.0, 3.0])
+    def test_rate_limited_batch_messages_are_requeued(self, mock_delay, mock_send_email_batch, mock_apply_async):
+        """Test only the deferred part of a batch is requeued."""
+        from core.tasks import send_email_batch_task
+
+        messages = [
+            {"template_name": "t", "context": {}, "subject": "s", "recipient_email": "a@example.com"},
+            {"template_name": "t", "context": {}, "subject": "s", "recipient_email": "b@example.com"},
+        ]
+
+        self.assertEqual(send_email_batch_task(messages), 1)
+        mock_send_email_batch.assert_called_once_with([messages[0]])
+        self.assertEqual(mock_apply_async.call_args.args[1], {"messages": [messages[1]]})
+
+
+class TestEmailRouting(TestCase):
+    """Tests for the Celery queue configuration."""
+
+    def test_email_tasks_are_routed_to_separate_queues(self):
+        """Test transactional and bulk email tasks never share a queue."""
+        from config.celery import app
+
+        router = app.amqp.router
+        single = router.route({}, "core.tasks.send_email_task")
+        batch = router.route({}, "core.tasks.send_email_batch_task")
+
+        self.assertEqual(single["queue"].name, "email.transactional")
+        self.assertEqual(batch["queue"].name, "email.bulk")
+        self.assertEqual(single["queue"].queue_arguments, {"x-max-priority": 10})
+
+    def test_queue_names_match_outbox_queues(self):
+        """Test every outbox queue is declared in the Celery configuration."""
+        from config.celery import app
+        from core.models import EmailOutbox
+
+        declared = {queue.name for queue in app.conf.task_queues}
+        self.assertLessEqual(set(EmailOutbox.Queue.values), declared)
+
+
+class TestEmailRetries(TestCase):
+    """Tests for retry backoff and dead-lettering."""
+
+    message = {
+        "template_name": "registration_confirmation",
+        "context": {"application_id": "123"},
+        "subject": "Application Received",
+        "recipient_email": "jane@example.com",
+        "recipient_name": "Jane Doe",
+    }
+
+    def test_retry_backoff_grows_and_is_capped(self):
+        """Test the backoff upper bound doubles per attempt up to the maximum."""
+        from core.tasks import retry_backoff
+
+        with patch("celery.utils.time.random.randrange", side_effect=lambda stop: stop - 1):
+            delays = [retry_backoff(retries) for retries in range(10)]
+
+        self.assertEqual(delays[:4], [30, 60, 120, 240])
+        self.assertEqual(delays[-1], 3600)
+
+    @patch("core.tasks.NotificationService.send_email", side_effect=ConnectionError("SMTP down"))
+    def test_exhausted_email_is_dead_lettered(self, mock_send_email):
+        """Test an email that fails its last retry is stored with its error."""
+        from core.models import EmailDeadLetter
+
+        result = send_email_task.apply(kwargs=self.message, retries=send_email_task.max_retries).get()
+
+        self.assertFalse(result)
+        dead_letter = EmailDeadLetter.objects.get()
+        self.assertEqual(dead_letter.recipient_email, "jane@example.com")
+        self.assertEqual(dead_letter.context, self.message["context"])
+        self.assertEqual(dead_letter.error, "SMTP down")
+        self.assertEqual(dead_letter.attempts, send_email_task.max_retries + 1)
+
+    @patch("core.tasks.NotificationService.send_email_batch", return_value=[None, "550 Mailbox unavailable"])
+    def test_exhausted_batch_messages_are_dead_lettered(self, mock_send_email_batch):
+        """Test only the failed messages of a batch on its last attempt are dead-lettered."""
+        from core.models import EmailDeadLetter
+        from core.tasks import send_email_batch_task
+
+        messages = [self.message, {**self.message, "recipient_email": "john@example.com"}]
+        with patch.object(send_email_batch_task, "max_retries", 0):
+            self.assertEqual(send_email_batch_task(messages), 1)
+
+        self.assertEqual(
+            list(EmailDeadLetter.objects.values_list("recipient_email", "error")),
+            [("john@example.com", "550 Mailbox unavailable")],
+        )
+
+    @patch("core.management.commands.replay_dead_letters.time.sleep")
+    def test_replay_dead_letters_in_batches(self, mock_sleep):
+        """Test dead letters are moved back to the bulk outbox queue in throttled batches."""
+        from io import StringIO
+
+        from django.core.management import call_command
+
+        from core.models import EmailDeadLetter, EmailOutbox
+
+        for i in range(5):
+            EmailDeadLetter.objects.create(**{**self.message, "recipient_email": f"user{i}@example.com"}, error="x")
+
+        call_command("replay_dead_letters", batch_size=2, interval=1.5, limit=4, stdout=StringIO())
+
+        self.assertEqual(EmailOutbox.objects.count(), 4)
+        self.assertEqual(set(EmailOutbox.objects.values_list("queue", flat=True)), {EmailOutbox.Queue.BULK})
+        self.assertEqual(EmailDeadLetter.objects.filter(replayed_at__isnull=True).count(), 1)
+        mock_sleep.assert_called_once_with(1.5)
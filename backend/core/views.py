@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET
+
+from core.metrics import export_metrics
+
+
+@require_GET
+def metrics(request):
+    """Prometheus scrape endpoint for the API process and every worker sharing METRICS_DIR, for METRICS_ALLOWED_IPS."""
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(export_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
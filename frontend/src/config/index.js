@@ -35,6 +35,11 @@ const config = {
     maxFiles: 1,
   },
 
+  // Dashboard sync: how often the changes feed is polled
+  sync: {
+    changesInterval: parseInt(import.meta.env.VITE_CHANGES_POLL_INTERVAL) || 15000,
+  },
+
   // Pagination
   pagination: {
     defaultPageSize: 10,
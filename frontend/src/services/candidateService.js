@@ -121,4 +121,15 @@ export const candidateService = {
     const response = await api.patch(`/candidates/${id}/`, statusData, { headers: adminHeaders });
     return response.data;
   },
+
+  /**
+   * Get candidates and status history changed since a cursor (admin only)
+   * @param {string|null} cursor - Cursor returned by the previous call; null for the current position
+   * @returns {Promise<Object>} - { candidates, history, cursor, has_more }
+   */
+  getChanges: async (cursor = null) => {
+    const params = cursor ? { cursor } : {};
+    const response = await api.get('/candidates/changes/', { params, headers: adminHeaders });
+    return response.data;
+  },
 };
\ No newline at end of file
@@ -0,0 +1,17 @@
+import api from './api';
+
+/**
+ * Workflow Service
+ * Reads the application status workflow defined by the backend
+ */
+
+export const workflowService = {
+  /**
+   * Get the statuses and the transitions allowed from each status
+   * @returns {Promise<Object>} - Workflow metadata ({ version, statuses, transitions })
+   */
+  getTransitions: async () => {
+    const response = await api.get('/workflow/transitions/');
+    return response.data;
+  },
+};
\ No newline at end of file
@@ -1,6 +1,7 @@
 import { defineStore } from 'pinia';
 import { ref, computed, readonly } from 'vue';
 import { candidateService } from '../services/candidateService';
+import config from '../config';
 
 /**
  * Candidate Store
@@ -25,6 +26,10 @@ export const useCandidateStore = defineStore('candidate', () => {
   // Filters - only used when explicitly applied
   const activeFilters = ref({});
 
+  // Changes feed position and polling timer
+  const changesCursor = ref(null);
+  let changesTimer = null;
+
   // Computed
   const hasCandidates = computed(() => candidates.value.length > 0);
   const totalCandidates = computed(() => pagination.value.count);
@@ -261,6 +266,48 @@ export const useCandidateStore = defineStore('candidate', () => {
     }
   };
 
+  const applyCandidateChanges = (changed) => {
+    const isFirstUnfilteredPage = pagination.value.page === 1 && Object.keys(activeFilters.value).length === 0;
+    changed.forEach(candidate => {
+      const index = candidates.value.findIndex(c => c.id === candidate.id);
+      if (index !== -1) {
+        candidates.value[index] = candidate;
+      } else if (isFirstUnfilteredPage && candidate.created_at >= (candidates.value[0]?.created_at || '')) {
+        // New registration: it belongs at the top of the newest-first first page
+        candidates.value.unshift(candidate);
+        candidates.value.splice(pagination.value.pageSize);
+        pagination.value.count += 1;
+      }
+    });
+  };
+
+  const syncChanges = async () => {
+    try {
+      let changes;
+      do {
+        changes = await candidateService.getChanges(changesCursor.value);
+        applyCandidateChanges(changes.candidates);
+        changesCursor.value = changes.cursor;
+      } while (changes.has_more);
+    } catch (err) {
+      // A failed poll is retried on the next tick; the list keeps its last known state.
+      console.error('Failed to sync candidate changes:', err);
+    }
+  };
+
+  const startChangesPolling = (interval = config.sync.changesInterval) => {
+    stopChangesPolling();
+    syncChanges();
+    changesTimer = setInterval(syncChanges, interval);
+  };
+
+  const stopChangesPolling = () => {
+    if (changesTimer) {
+      clearInterval(changesTimer);
+      changesTimer = null;
+    }
+  };
+
   const setActiveFilters = (filters) => {
     activeFilters.value = { ...filters };
   };
@@ -303,6 +350,9 @@ export const useCandidateStore = defineStore('candidate', () => {
     updateCandidateStatus,
     getCandidateStatus,
     downloadResume,
+    syncChanges,
+    startChangesPolling,
+    stopChangesPolling,
     setActiveFilters,
     clearActiveFilters,
     clearError,
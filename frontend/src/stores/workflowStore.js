@@ -0,0 +1,54 @@
+import { defineStore } from 'pinia';
+import { ref, computed, readonly } from 'vue';
+import { workflowService } from '../services/workflowService';
+
+/**
+ * Workflow Store
+ * Holds the status workflow served by the backend, so the UI only offers valid transitions
+ */
+
+export const useWorkflowStore = defineStore('workflow', () => {
+  // State
+  const statuses = ref([]);
+  const transitions = ref({});
+  const version = ref(null);
+  const error = ref(null);
+
+  // Computed
+  const isLoaded = computed(() => version.value !== null);
+
+  // Actions
+  const fetchWorkflow = async () => {
+    // The workflow only changes with a deploy; the browser revalidates it with its ETag.
+    if (isLoaded.value) return;
+    try {
+      error.value = null;
+      const workflow = await workflowService.getTransitions();
+      statuses.value = workflow.statuses;
+      transitions.value = workflow.transitions;
+      version.value = workflow.version;
+    } catch (err) {
+      error.value = err.message || 'Failed to fetch workflow';
+    }
+  };
+
+  const targetsFor = (status) => {
+    const targets = transitions.value[status] || [];
+    return statuses.value.filter(option => targets.includes(option.value));
+  };
+
+  return {
+    // State
+    statuses: readonly(statuses),
+    transitions: readonly(transitions),
+    version: readonly(version),
+    error: readonly(error),
+
+    // Computed
+    isLoaded,
+
+    // Actions
+    fetchWorkflow,
+    targetsFor,
+  };
+});